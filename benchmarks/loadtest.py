@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Load test Match, Summary, Player and Series against the local stand-in
+server (benchmarks/standin.py).
+
+Each workload is called ``--requests`` times at every ``--concurrency``
+level, and the throughput and p50/p95/p99 latency of the calls are
+reported along with their errors by type and the number of requests the
+server saw. Request coalescing is turned off, so every call makes its own
+requests even though the workloads repeat the same ids. The match and summary
+workloads load pages with Playwright, so WebKit must be installed.
+
+With --replay the workloads are answered in-process from an archive
+recorded with ``scripts/refresh_fixtures.py --record`` instead (see
+espncricinfo.replay): no server, browser or network is involved, so
+only the library's own overhead is measured.
+
+Usage:
+    python benchmarks/loadtest.py --workloads player series --concurrency 1 4 16
+    python benchmarks/loadtest.py --latency 0.1 --jitter 0.05 --throttle-rate 0.02 --json
+    python benchmarks/loadtest.py --replay workload.jsonl.gz --workloads match summary player series
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from espncricinfo import replay, transport  # noqa: E402
+from espncricinfo.match import Match  # noqa: E402
+from espncricinfo.player import Player  # noqa: E402
+from espncricinfo.series import Series  # noqa: E402
+from espncricinfo.summary import Summary  # noqa: E402
+from standin import StandinServer  # noqa: E402
+
+MATCH_ID = 1478914
+SERIES_ID = 1478874
+PLAYER_ID = 253802
+
+WORKLOADS = {
+    "match": lambda: Match(MATCH_ID, SERIES_ID),
+    "summary": lambda: Summary(),
+    "player": lambda: Player(PLAYER_ID, preload=("new_json",)),
+    "series": lambda: Series(SERIES_ID).events,
+}
+
+
+def percentile(sorted_values, q):
+    """Return the ``q`` (0-100) percentile of ``sorted_values`` by the nearest-rank method."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:
+        return time.perf_counter() - start, type(exc).__name__
+    return time.perf_counter() - start, None
+
+
+def run_load(fn, concurrency, requests):
+    """
+    Call ``fn`` ``requests`` times from ``concurrency`` threads.
+
+    Return:
+        dict with ``throughput`` (calls per second), ``p50``/``p95``/``p99``
+        latency in seconds and ``errors`` counted by exception type
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: _timed(fn), range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(duration for duration, _ in results)
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput": requests / elapsed if elapsed else None,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "errors": dict(Counter(error for _, error in results if error)),
+    }
+
+
+def _run_levels(workloads, levels, requests, server=None):
+    results = []
+    for name in workloads:
+        for concurrency in levels:
+            before = server.requests if server is not None else None
+            result = run_load(WORKLOADS[name], concurrency, requests)
+            result["workload"] = name
+            result["server_requests"] = server.requests - before if server is not None else None
+            results.append(result)
+    return results
+
+
+def run(workloads, levels, requests, **server_options):
+    """Start a stand-in server, point the library at it and load test each workload at each level."""
+    with StandinServer(**server_options) as server:
+        # Identical concurrent calls would otherwise share one fetch.
+        transport.configure(hosts=server.hosts(), pool_maxsize=max(levels), coalesce=False)
+        try:
+            return _run_levels(workloads, levels, requests, server)
+        finally:
+            transport.reset()
+
+
+def run_replay(archive, workloads, levels, requests):
+    """Load test each workload at each level with every request answered from ``archive``."""
+    transport.configure(coalesce=False)
+    try:
+        with replay.replay(archive):
+            return _run_levels(workloads, levels, requests)
+    finally:
+        transport.reset()
+
+
+def _format(results):
+    lines = [f"{'workload':<10}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+             f"{'server':>8}  errors"]
+    for r in results:
+        errors = ", ".join(f"{k}={v}" for k, v in sorted(r["errors"].items())) or "-"
+        server = "-" if r.get("server_requests") is None else r["server_requests"]
+        lines.append(
+            f"{r['workload']:<10}{r['concurrency']:>6}{r['throughput']:>10.1f}"
+            f"{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}{r['p99'] * 1000:>10.1f}"
+            f"{server:>8}  {errors}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=["player", "series"],
+                        help="workloads to run (default: %(default)s)")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16],
+                        help="concurrency levels (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=100, help="calls per level (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds on top of --latency")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="share of requests answered 404")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--seed", type=int, default=None, help="seed for jitter and faults")
+    parser.add_argument("--replay", metavar="ARCHIVE", help="answer requests from a recorded archive")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        results = run_replay(args.replay, args.workloads, args.concurrency, args.requests)
+    else:
+        results = run(
+            args.workloads, args.concurrency, args.requests,
+            latency=args.latency, jitter=args.jitter, not_found_rate=args.not_found_rate,
+            throttle_rate=args.throttle_rate, seed=args.seed,
+        )
+    print(json.dumps(results, indent=2) if args.json else _format(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+Offline performance benchmarks over the bundled test fixtures.
+
+Each case is timed (best mean over several repeats, timeit-style) and its
+peak traced memory measured with tracemalloc. Results are compared with
+a stored baseline; the run fails if any case is slower, or uses more
+memory, than the baseline times the threshold. The memory retained by one
+fixture Match is also checked against a fixed budget, broken down by
+component (see espncricinfo.profiling).
+
+Usage:
+    python benchmarks/run.py                     # compare with baseline.json
+    python benchmarks/run.py --save-baseline     # record a new baseline
+    python benchmarks/run.py --threshold 1.25 --only normalise match_construction
+    python benchmarks/run.py --match-memory-budget 1500000
+
+Baselines are machine specific: record one on the machine you compare on
+before upgrading, then run the suite again afterwards.
+"""
+import argparse
+import copy
+import json
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = ROOT / "tests" / "fixtures"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+sys.path.insert(0, str(ROOT))
+
+from espncricinfo import profiling  # noqa: E402
+from espncricinfo.match import Match, _extract_next_data, _normalise  # noqa: E402
+from espncricinfo.player import Player  # noqa: E402
+
+MATCH_ID = 1478914
+SERIES_ID = 1478874
+PLAYER_ID = 253802
+
+DEFAULT_THRESHOLD = 1.5
+
+# Bytes one Match built from the fixture page may keep alive (~1.7 MB, almost
+# all of it the raw _content document, when the budget was set).
+DEFAULT_MATCH_MEMORY_BUDGET = 2 * 1024 * 1024
+
+
+def _load_text(name):
+    with open(FIXTURES / name) as f:
+        return f.read()
+
+
+def _load_bytes(name):
+    return (FIXTURES / name).read_bytes()
+
+
+def _player_response(url, headers=None, **kwargs):
+    # A real Response, so r.json() decodes the fixture as it would the wire body
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = _PLAYER_NEW_JSON if "hs-consumer-api" in url else _PLAYER_JSON
+    return response
+
+
+_NEXT_DATA_TEXT = _load_text("match_1478914_next_data.json")
+_NEXT_DATA = json.loads(_NEXT_DATA_TEXT)
+_MATCH_HTML = _load_text("match_1478914.html")
+_PLAYER_JSON = _load_bytes("player_253802.json")
+_PLAYER_NEW_JSON = _load_bytes("player_253802_new.json")
+
+
+def _make_match(next_data=_NEXT_DATA):
+    with patch("espncricinfo.match._playwright_fetch", return_value=next_data):
+        return Match(MATCH_ID, SERIES_ID)
+
+
+def match_memory():
+    """Profile the memory of one Match built from a freshly decoded copy of the fixture."""
+    return profiling.profile_match(lambda: _make_match(json.loads(_NEXT_DATA_TEXT)))
+
+
+def check_match_memory(report, budget=DEFAULT_MATCH_MEMORY_BUDGET):
+    """Return a list of messages if the match retained more than ``budget`` bytes."""
+    if report.retained > budget:
+        return [f"match memory: {report.retained:,} bytes retained (budget {budget:,})"]
+    return []
+
+
+def _bench_import():
+    out = subprocess.run(
+        [sys.executable, "-c",
+         "import time; s = time.perf_counter(); "
+         "import espncricinfo.match, espncricinfo.player, espncricinfo.series, espncricinfo.summary; "
+         "print(time.perf_counter() - s)"],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    return float(out.stdout)
+
+
+def cases():
+    """Return ``{name: (setup, fn)}``; ``setup()`` builds the argument passed to ``fn``."""
+    return {
+        "normalise": (
+            lambda: copy.deepcopy(_NEXT_DATA),
+            lambda data: _normalise(data, MATCH_ID, SERIES_ID),
+        ),
+        "match_construction": (
+            lambda: None,
+            lambda _: _make_match(),
+        ),
+        "batting_scorecard": (
+            _make_match,
+            lambda m: m.batting_scorecard,
+        ),
+        "bowling_scorecard": (
+            _make_match,
+            lambda m: m.bowling_scorecard,
+        ),
+        "next_data_extraction": (
+            lambda: _MATCH_HTML,
+            _extract_next_data,
+        ),
+        "player_json": (
+            lambda: None,
+            lambda _: _player_from_json(),
+        ),
+    }
+
+
+def _player_from_json():
+    with patch("espncricinfo.transport.get", side_effect=_player_response):
+        return Player(PLAYER_ID, preload=("new_json",))
+
+
+def measure(setup, fn, repeat=5, number=None):
+    """Return ``{"time": best seconds per call, "peak_memory": bytes}``."""
+    arg = setup()
+    if number is None:
+        # Aim for ~0.2s per repeat
+        number, _ = timeit.Timer(lambda: fn(arg)).autorange()
+        number = max(1, number // 2)
+    times = timeit.repeat(lambda: fn(arg), repeat=repeat, number=number)
+    tracemalloc.start()
+    try:
+        fn(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time": min(times) / number, "peak_memory": peak}
+
+
+def run_suite(only=None, repeat=5, number=None):
+    """Run the benchmark cases (all, or the names in ``only``) and return their results."""
+    results = {}
+    for name, (setup, fn) in cases().items():
+        if only and name not in only:
+            continue
+        results[name] = measure(setup, fn, repeat=repeat, number=number)
+    if not only or "import" in only:
+        results["import"] = {"time": min(_bench_import() for _ in range(repeat)), "peak_memory": None}
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a list of regression messages for results exceeding baseline * threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ("time", "peak_memory"):
+            if result.get(metric) is None or not base.get(metric):
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > threshold:
+                regressions.append(f"{name} {metric}: {ratio:.2f}x baseline (threshold {threshold}x)")
+    return regressions
+
+
+def _format(results, baseline):
+    lines = [f"{'case':<24}{'time':>14}{'vs base':>10}{'peak memory':>16}{'vs base':>10}"]
+    for name, r in results.items():
+        base = baseline.get(name, {})
+        t_ratio = f"{r['time'] / base['time']:.2f}x" if base.get("time") else "-"
+        mem = f"{r['peak_memory'] / 1024:,.0f} KiB" if r["peak_memory"] is not None else "-"
+        m_ratio = (
+            f"{r['peak_memory'] / base['peak_memory']:.2f}x"
+            if r["peak_memory"] is not None and base.get("peak_memory") else "-"
+        )
+        lines.append(f"{name:<24}{r['time'] * 1000:>11.3f} ms{t_ratio:>10}{mem:>16}{m_ratio:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a case exceeds baseline * threshold (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="run only these cases")
+    parser.add_argument("--match-memory-budget", type=int, default=DEFAULT_MATCH_MEMORY_BUDGET,
+                        help="fail when one Match retains more bytes (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(only=args.only, repeat=args.repeat)
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    print(_format(results, baseline))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "recorded": time.strftime("%Y-%m-%d"),
+                       "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if not args.only:
+        report = match_memory()
+        print()
+        print(report.format())
+        regressions += check_match_memory(report, args.match_memory_budget)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+"""
+A local stand-in for the ESPN Cricinfo endpoints, serving the captured
+pages in tests/fixtures.
+
+Every host the library talks to is served from one port and routed by
+path:
+
+    /series/<slug>-<series>/<slug>-<match>/full-scorecard   match_<match>.html
+    /live-cricket-match-results                             built from the match fixtures
+    /v2/sports/cricket/athletes/<player>                    player_<player>.json
+    /v1/pages/player/home?playerId=<player>                 player_<player>_new.json
+    /ci/engine/player/<player>.html                         player_<player>_stats.html
+    /v2/sports/cricket/leagues/<series>/[events|seasons]    built from the match fixtures
+
+Anything else is a 404. Responses can be delayed (``latency`` seconds plus
+up to ``jitter`` either way), and a share of them replaced by 404s
+(``not_found_rate``) or 429 throttling responses (``throttle_rate``).
+
+Usage:
+    python benchmarks/standin.py --port 8765 --latency 0.05 --jitter 0.02
+
+    with StandinServer(latency=0.05) as server:
+        transport.configure(hosts=server.hosts())
+        Player(253802)
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+# Hosts served by the stand-in; see StandinServer.hosts().
+HOSTS = (
+    "www.espncricinfo.com",
+    "core.espnuk.org",
+    "hs-consumer-api.espncricinfo.com",
+    "stats.espncricinfo.com",
+)
+
+CORE = "http://core.espnuk.org/v2/sports/cricket"
+
+_NEXT_DATA_RE = re.compile(
+    r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.DOTALL
+)
+_MATCH_PAGE_RE = re.compile(r"^/series/[^/]*?-?(\d+)/[^/]*?-?(\d+)/full-scorecard/?$")
+_ATHLETE_RE = re.compile(r"^/v2/sports/cricket/athletes/(\d+)/?$")
+_STATS_RE = re.compile(r"^/ci/engine/player/(\d+)\.html$")
+_LEAGUE_RE = re.compile(r"^/v2/sports/cricket/leagues/(\d+)(?:/(events|seasons)(?:/(\d+))?)?/?$")
+
+
+class Fixtures(object):
+    """The captured pages in ``path``, indexed by match, series and player id."""
+
+    def __init__(self, path=FIXTURES):
+        self.path = Path(path)
+        self.matches = {}   # match id -> (series id, page html, __NEXT_DATA__ match dict)
+        for page in sorted(self.path.glob("match_*.html")):
+            html = page.read_text()
+            m = _NEXT_DATA_RE.search(html)
+            if not m:
+                continue
+            data = json.loads(m.group(1))["props"]["appPageProps"]["data"]
+            # Live pages hold match/content directly, some captures under a second "data"
+            match = (data.get("data") or data)["match"]
+            self.matches[str(match["objectId"])] = (str(match["series"]["objectId"]), html, match)
+
+    def read(self, name):
+        path = self.path / name
+        return path.read_bytes() if path.is_file() else None
+
+    def series(self, series_id):
+        """Return the ``__NEXT_DATA__`` match dicts of the fixtures in ``series_id``."""
+        return [match for sid, _, match in self.matches.values() if sid == series_id]
+
+
+class StandinServer(object):
+    """
+    Serve the fixtures over HTTP on ``host``:``port`` (0 picks a free port)
+    from a background thread. Use as a context manager, or call
+    :meth:`start` and :meth:`stop`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, not_found_rate=0.0,
+                 throttle_rate=0.0, page_size=25, fixtures=FIXTURES, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.not_found_rate = not_found_rate
+        self.throttle_rate = throttle_rate
+        self.page_size = page_size
+        self.fixtures = Fixtures(fixtures)
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def hosts(self):
+        """Return the ``hosts`` option for :func:`espncricinfo.transport.configure`."""
+        return {host: self.url for host in HOSTS}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _delay_and_fault(self):
+        """Sleep for the configured latency; return a status code to fail with, if any."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            roll = self._random.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.not_found_rate:
+            return 404
+        return None
+
+    def route(self, path, query):
+        """Return ``(status, content type, body)`` for a request."""
+        m = _MATCH_PAGE_RE.match(path)
+        if m:
+            match = self.fixtures.matches.get(m.group(2))
+            if match is None:
+                return 404, "text/html", b"<html><body>Not found</body></html>"
+            return 200, "text/html", match[1].encode("utf-8")
+        if path.rstrip("/") == "/live-cricket-match-results":
+            return 200, "text/html", self._results_page()
+        m = _ATHLETE_RE.match(path)
+        if m:
+            return _file(self.fixtures.read(f"player_{m.group(1)}.json"), "application/json")
+        if path.rstrip("/") == "/v1/pages/player/home":
+            player_id = query.get("playerId", [""])[0]
+            return _file(self.fixtures.read(f"player_{player_id}_new.json"), "application/json")
+        m = _STATS_RE.match(path)
+        if m:
+            return _file(self.fixtures.read(f"player_{m.group(1)}_stats.html"), "text/html")
+        m = _LEAGUE_RE.match(path)
+        if m:
+            return self._league(m.group(1), m.group(2), m.group(3), int(query.get("page", ["1"])[0]))
+        return 404, "text/plain", b"Not found"
+
+    def _results_page(self):
+        matches = [match for _, _, match in self.fixtures.matches.values()]
+        next_data = {"props": {"appPageProps": {"data": {"data": {"content": {"matches": matches}}}}}}
+        return (
+            '<html><body><script id="__NEXT_DATA__" type="application/json">'
+            + json.dumps(next_data)
+            + "</script></body></html>"
+        ).encode("utf-8")
+
+    def _league(self, series_id, listing, item_id, page):
+        matches = self.fixtures.series(series_id)
+        if not matches:
+            return 404, "application/json", b'{"error": "not found"}'
+        series = matches[0]["series"]
+        league_url = f"{CORE}/leagues/{series_id}"
+        if listing is None:
+            doc = {
+                "id": series_id,
+                "name": series.get("longName") or series.get("name"),
+                "shortName": series.get("name"),
+                "abbreviation": series.get("slug"),
+                "slug": series.get("slug"),
+                "isTournament": False,
+                "links": [{"href": f"https://www.espncricinfo.com/series/{series.get('slug')}-{series_id}"}],
+            }
+        elif item_id is not None:
+            match = next((m for m in matches if str(m["objectId"]) == item_id), None)
+            if match is None or listing != "events":
+                return 404, "application/json", b'{"error": "not found"}'
+            doc = {"id": item_id, "name": match.get("title"), "date": match.get("startTime")}
+        elif listing == "events":
+            refs = [f"{league_url}/events/{m['objectId']}" for m in matches]
+            doc = _listing(refs, page, self.page_size)
+        else:
+            # "2025/26" seasons are listed under their first year
+            seasons = sorted({str(m.get("season")).split("/")[0] for m in matches})
+            doc = _listing([f"{CORE}/leagues/{series_id}/seasons/{s}" for s in seasons], page, self.page_size)
+        return 200, "application/json", json.dumps(doc).encode("utf-8")
+
+
+def _file(body, content_type):
+    if body is None:
+        return 404, "text/plain", b"Not found"
+    return 200, content_type, body
+
+
+def _listing(refs, page, page_size):
+    count = max(1, -(-len(refs) // page_size))
+    start = (page - 1) * page_size
+    return {
+        "count": len(refs),
+        "pageIndex": page,
+        "pageSize": page_size,
+        "pageCount": count,
+        "items": [{"$ref": ref} for ref in refs[start:start + page_size]],
+    }
+
+
+def _handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without TCP_NODELAY the
+        # body waits for a delayed ACK on keep-alive connections (~40ms).
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            fault = server._delay_and_fault()
+            if fault == 429:
+                self._send(429, "text/plain", b"Too many requests", {"Retry-After": "1"})
+            elif fault == 404:
+                self._send(404, "text/plain", b"Not found")
+            else:
+                self._send(*server.route(url.path, parse_qs(url.query)))
+
+        def _send(self, status, content_type, body, headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds on top of --latency")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="share of requests answered 404")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    args = parser.parse_args(argv)
+
+    server = StandinServer(args.host, args.port, args.latency, args.jitter, args.not_found_rate,
+                           args.throttle_rate)
+    print(f"Serving {', '.join(HOSTS)} on {server.url}")
+    print(f"transport.configure(hosts={server.hosts()!r})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
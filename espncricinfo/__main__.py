@@ -0,0 +1,5 @@
+import sys
+
+from espncricinfo.cli import main
+
+sys.exit(main())
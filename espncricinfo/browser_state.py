@@ -0,0 +1,130 @@
+"""
+Browser storage state (cookies and localStorage) kept between page loads
+and between runs.
+
+Every Playwright page load starts a fresh browser context, which has to
+pass Akamai's bot-manager checks again before the page is served. Once
+:func:`configure` is given a path, the storage state of a successful load
+is written there and handed to the next contexts, in this process and in
+any other process using the same file, so they start with the cookies
+already earned.
+
+A state older than ``max_age`` seconds is treated as stale and not used:
+the next load starts clean and its state replaces the file. A fresh state
+is re-saved once it is older than ``max_age / 2``, so busy workers keep
+renewing it. A blocked (403) or throttled (429) load discards the file.
+
+Example::
+
+    from espncricinfo import browser_state
+
+    browser_state.configure(path="~/.cache/espncricinfo-state.json", max_age=3600)
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+# Akamai's session cookies last a few hours; renew well before that.
+DEFAULT_MAX_AGE = 3600
+
+# Statuses after which the saved cookies are likely the reason for a block.
+_BLOCKED_STATUSES = (403, 429)
+
+_log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_path = None
+_max_age = DEFAULT_MAX_AGE
+
+
+def configure(path=None, max_age=DEFAULT_MAX_AGE):
+    """
+    Set where browser storage state is persisted.
+
+    Arguments:
+        path {string}: JSON file holding the state (None keeps every context clean)
+        max_age {float}: Seconds after which a saved state is no longer used
+    """
+    global _path, _max_age
+    with _lock:
+        _path = os.path.expanduser(path) if path else None
+        _max_age = max_age
+
+
+def get_path():
+    """Return the configured state file, or None when state is not persisted."""
+    return _path
+
+
+def _age(path):
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def load():
+    """
+    Return the saved storage state for a new browser context, or None if
+    there is none or it is stale.
+    """
+    path = _path
+    if path is None:
+        return None
+    age = _age(path)
+    if age is None or age > _max_age:
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def needs_save():
+    """Return True if the state file is missing or due to be renewed."""
+    if _path is None:
+        return False
+    age = _age(_path)
+    return age is None or age > _max_age / 2
+
+
+def save(state):
+    """
+    Write ``state`` (a Playwright storage state dict) through a temporary
+    file, creating its directory. Failures are logged rather than raised,
+    so saving state never fails a page load.
+    """
+    path = _path
+    if path is None:
+        return
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        _log.warning("Could not save browser state to %s", path, exc_info=True)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def discard():
+    """Delete the saved state, so the next context starts clean."""
+    path = _path
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def is_blocked(status):
+    """Return True if a page load answered with ``status`` should discard the saved state."""
+    return status in _BLOCKED_STATUSES
@@ -0,0 +1,267 @@
+"""
+Expiring key/value caches used by python-espncricinfo.
+
+Each cache is identified by a namespace (for example ``"players"``) and
+holds JSON-serialisable values with a per-entry time-to-live. Caches live
+in memory unless :func:`configure` has been given a SQLite file, in which
+case every namespace is persisted as rows of that one file and survives
+restarts.
+
+Example::
+
+    from espncricinfo import cache
+
+    cache.configure(path="~/.cache/espncricinfo.sqlite")
+    players = cache.get_cache("players")   # 30 day TTL by default
+
+With ``configure(remember_not_found=True)``, URLs that answered 404 are
+remembered in the ``"not_found"`` namespace (see :func:`mark_not_found`),
+so ids known to be missing fail without being fetched again until the
+entry expires.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from espncricinfo import metrics
+
+# Biographical data rarely changes, so player profiles are kept for a month.
+PLAYER_TTL = 30 * 24 * 3600
+
+# Career statistics change after every match played.
+STATS_TTL = 24 * 3600
+
+# Missing matches, players and series can appear later (a fixture is
+# published, an id is reused), so a 404 is only trusted for a day.
+NOT_FOUND_TTL = 24 * 3600
+
+NOT_FOUND = "not_found"
+
+DEFAULT_TTLS = {
+    "players": PLAYER_TTL,
+    "stats": STATS_TTL,
+    NOT_FOUND: NOT_FOUND_TTL,
+}
+
+# Upper bound on entries for namespaces that would otherwise grow with every
+# player looked at.
+DEFAULT_MAXSIZES = {
+    "stats": 512,
+    NOT_FOUND: 100000,
+}
+
+_MISSING = object()
+
+
+class Cache(object):
+    """
+    A thread-safe cache whose entries expire ``ttl`` seconds after being
+    stored (never, if ``ttl`` is None).
+
+    With ``path`` the entries are kept in a SQLite file shared by every
+    namespace; otherwise they are held in memory. ``maxsize`` bounds the
+    number of entries, evicting the least recently stored first.
+    """
+
+    def __init__(self, path=None, namespace="default", ttl=None, maxsize=None):
+        self.path = os.path.expanduser(path) if path else None
+        self.namespace = namespace
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "namespace TEXT, key TEXT, value TEXT, expires REAL, stored REAL, "
+                    "PRIMARY KEY (namespace, key))"
+                )
+        else:
+            self._db = None
+            self._entries = OrderedDict()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.namespace!r}, path={self.path!r})"
+
+    def get(self, key, default=None):
+        """Return the value stored under ``key``, or ``default`` if absent or expired."""
+        value = self._get(key, _MISSING)
+        if value is _MISSING:
+            metrics.CACHE_MISSES.inc(namespace=self.namespace)
+            return default
+        metrics.CACHE_HITS.inc(namespace=self.namespace)
+        return value
+
+    def _get(self, key, default):
+        now = time.time()
+        with self._lock:
+            if self._db is None:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return default
+                value, expires = entry
+                if expires is not None and expires <= now:
+                    del self._entries[key]
+                    metrics.CACHE_EVICTIONS.inc(namespace=self.namespace)
+                    return default
+                return value
+            row = self._db.execute(
+                "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return default
+            if row[1] is not None and row[1] <= now:
+                with self._db:
+                    self._db.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                metrics.CACHE_EVICTIONS.inc(namespace=self.namespace)
+                return default
+            return json.loads(row[0])
+
+    def set(self, key, value, ttl=_MISSING):
+        """Store ``value`` under ``key``; ``ttl`` overrides the cache default."""
+        if ttl is _MISSING:
+            ttl = self.ttl
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            if self._db is None:
+                self._entries.pop(key, None)
+                self._entries[key] = (value, expires)
+                if self.maxsize is not None:
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        metrics.CACHE_EVICTIONS.inc(namespace=self.namespace)
+                return
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), expires, now),
+                )
+                if self.maxsize is not None:
+                    evicted = self._db.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND key NOT IN ("
+                        "SELECT key FROM entries WHERE namespace = ? "
+                        "ORDER BY stored DESC LIMIT ?)",
+                        (self.namespace, self.namespace, self.maxsize),
+                    ).rowcount
+                    if evicted > 0:
+                        metrics.CACHE_EVICTIONS.inc(evicted, namespace=self.namespace)
+
+    def delete(self, key):
+        """Remove ``key`` if present."""
+        with self._lock:
+            if self._db is None:
+                self._entries.pop(key, None)
+                return
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+
+    def clear(self):
+        """Remove every entry in this namespace."""
+        with self._lock:
+            if self._db is None:
+                self._entries.clear()
+                return
+            with self._db:
+                self._db.execute("DELETE FROM entries WHERE namespace = ?", (self.namespace,))
+
+    def __contains__(self, key):
+        return self._get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        with self._lock:
+            if self._db is None:
+                return len(self._entries)
+            return self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        """Close the underlying SQLite connection, if any."""
+        if self._db is not None:
+            self._db.close()
+
+
+_lock = threading.Lock()
+_path = None
+_ttls = dict(DEFAULT_TTLS)
+_caches = {}
+_remember_not_found = False
+
+
+def configure(path=None, ttls=None, remember_not_found=False):
+    """
+    Set where the library caches live and their default TTLs.
+
+    Arguments:
+        path {string}: SQLite file persisting every namespace (None keeps caches in memory)
+        ttls {dict}: Namespace -> TTL in seconds, overriding :data:`DEFAULT_TTLS`
+        remember_not_found {bool}: Keep the negative cache of URLs that answered 404
+
+    Caches handed out before the call are closed; fetch them again with
+    :func:`get_cache`.
+    """
+    global _path, _remember_not_found
+    with _lock:
+        _path = path
+        _remember_not_found = remember_not_found
+        _ttls.clear()
+        _ttls.update(DEFAULT_TTLS)
+        _ttls.update(ttls or {})
+        old = list(_caches.values())
+        _caches.clear()
+    for c in old:
+        c.close()
+
+
+def get_cache(namespace):
+    """Return the shared :class:`Cache` for ``namespace``, creating it on first use."""
+    with _lock:
+        c = _caches.get(namespace)
+        if c is None:
+            c = _caches[namespace] = Cache(
+                _path,
+                namespace=namespace,
+                ttl=_ttls.get(namespace),
+                maxsize=DEFAULT_MAXSIZES.get(namespace),
+            )
+        return c
+
+
+def mark_not_found(url):
+    """
+    Remember that ``url`` answered 404, for the TTL of the ``"not_found"``
+    namespace, when :func:`configure` was given ``remember_not_found=True``.
+    """
+    if not _remember_not_found:
+        return
+    c = get_cache(NOT_FOUND)
+    if c.ttl != 0:
+        c.set(url, True)
+
+
+def is_not_found(url):
+    """
+    Return True if ``url`` answered 404 within the ``"not_found"`` TTL.
+    Made before every fetch, so it costs nothing while the negative cache
+    is off and is not counted as a cache hit or miss.
+    """
+    if not _remember_not_found:
+        return False
+    return url in get_cache(NOT_FOUND)
+
+
+def forget_not_found(url):
+    """Drop ``url`` from the negative cache, so it is fetched again."""
+    get_cache(NOT_FOUND).delete(url)
@@ -0,0 +1,357 @@
+"""
+The ``espncricinfo`` command: batch fetching on top of the library's
+concurrent paths.
+
+Subcommands::
+
+    espncricinfo fetch-matches --refs refs.csv --workers 4 --out matches/
+    espncricinfo sync --from 2026-02-01 --to 2026-02-07 --out matches/ --deadline 600 --hedge
+    espncricinfo players --ids players.txt --workers 8 --out players/
+    espncricinfo daemon --socket /tmp/espncricinfo.sock --browsers 2
+
+Every item is written to its own JSON file in ``--out`` as soon as it
+arrives, through a temporary file so an interrupted run never leaves a
+partial one. A re-run skips the items whose file already exists, so a
+batch can be resumed by repeating the command. Progress and throughput go
+to stderr; items that failed are listed in ``failed.csv`` in the output
+directory and retried on the next run.
+
+``daemon`` runs a fetch daemon (see :mod:`espncricinfo.daemon`); give
+its socket to the other commands with ``--daemon`` so they load pages
+through its warm browsers instead of launching their own.
+
+The same commands are available as ``python -m espncricinfo``.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+from espncricinfo import daemon
+from espncricinfo import hedging
+from espncricinfo.match import Match
+from espncricinfo.match_ref import MatchRef
+from espncricinfo.player import Player
+
+
+class Progress(object):
+    """
+    Counts finished items and reports them, with throughput, to ``stream``
+    (if given) at most every ``interval`` seconds.
+    """
+
+    def __init__(self, total, label, stream=None, interval=1.0):
+        self.total = total
+        self.label = label
+        self.stream = stream
+        self.interval = interval
+        self.ok = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self._reported = 0.0
+
+    @property
+    def done(self):
+        return self.ok + self.failed + self.skipped
+
+    @property
+    def rate(self):
+        """Items fetched (not skipped) per second."""
+        elapsed = time.perf_counter() - self.started
+        return (self.ok + self.failed) / elapsed if elapsed else 0.0
+
+    def update(self, ok=0, failed=0, skipped=0):
+        self.ok += ok
+        self.failed += failed
+        self.skipped += skipped
+        now = time.perf_counter()
+        if now - self._reported >= self.interval or self.done == self.total:
+            self._reported = now
+            self.report()
+
+    def report(self):
+        if self.stream is None:
+            return
+        self.stream.write(
+            f"\r{self.label}: {self.done}/{self.total} "
+            f"(ok {self.ok}, failed {self.failed}, skipped {self.skipped}) {self.rate:.2f}/s"
+        )
+        self.stream.flush()
+
+    def close(self):
+        """Finish the progress line."""
+        if self.stream is not None:
+            self.report()
+            self.stream.write("\n")
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "total": self.total,
+            "ok": self.ok,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": round(elapsed, 3),
+            "per_second": round(self.rate, 3),
+        }
+
+
+def read_refs(path):
+    """Read MatchRef rows (``series_id,match_id``) from a CSV file, skipping a header and blank rows."""
+    refs = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip().isdigit():
+                continue
+            refs.append(MatchRef.from_csv_row([row[0].strip(), row[1].strip()]))
+    return list(dict.fromkeys(refs))
+
+
+def read_ids(path):
+    """Read one id per line (or the first CSV column), skipping blank lines, headers and duplicates."""
+    ids = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if row and row[0].strip().isdigit():
+                ids.append(int(row[0]))
+    return list(dict.fromkeys(ids))
+
+
+def write_json(path, data):
+    """Write ``data`` to ``path`` through a temporary file, so the file is either complete or absent."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _match_path(out, ref):
+    return os.path.join(out, f"{ref.series_id}_{ref.match_id}.json")
+
+
+def _run(items, fn, workers, progress, failures):
+    """
+    Call ``fn(item)`` for each item on ``workers`` threads, keeping at most
+    ``2 * workers`` in flight; failures are appended to ``failures`` as
+    ``(item, error)``.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        remaining = iter(items)
+        in_flight = {}
+
+        def submit():
+            for item in remaining:
+                in_flight[pool.submit(fn, item)] = item
+                return
+
+        for _ in range(2 * max(1, workers)):
+            submit()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = in_flight.pop(future)
+                submit()
+                try:
+                    future.result()
+                except Exception as exc:
+                    failures.append((item, f"{type(exc).__name__}: {exc}"))
+                    progress.update(failed=1)
+                else:
+                    progress.update(ok=1)
+
+
+def _write_failures(out, header, rows):
+    path = os.path.join(out, "failed.csv")
+    if not rows:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def fetch_matches(refs, out, workers=4, stream=None, deadline=None):
+    """
+    Fetch every ref not already in ``out`` and write its normalised JSON
+    to ``<series_id>_<match_id>.json``, reporting progress to ``stream``.
+    With ``deadline`` (seconds), matches not fetched in time fail with
+    DeadlineExceededError and are left for the next run. Returns the
+    progress summary.
+    """
+    os.makedirs(out, exist_ok=True)
+    todo = [ref for ref in refs if not os.path.exists(_match_path(out, ref))]
+    progress = Progress(len(refs), "matches", stream)
+    progress.update(skipped=len(refs) - len(todo))
+    budget = hedging.Deadline(deadline) if deadline is not None else None
+
+    def fetch(ref):
+        if budget is None:
+            m = Match(ref.match_id, ref.series_id)
+        else:
+            with budget:
+                m = Match(ref.match_id, ref.series_id)
+        write_json(_match_path(out, ref), m.json)
+
+    failures = []
+    _run(todo, fetch, workers, progress, failures)
+    progress.close()
+    _write_failures(out, ["series_id", "match_id", "error"],
+                    [ref.to_csv_row() + [error] for ref, error in failures])
+    return progress.summary()
+
+
+def sync(start, end, out, workers=4, stream=None, deadline=None):
+    """
+    List the matches on the results page for every day from ``start`` to
+    ``end`` (inclusive), add new ones to ``<out>/refs.csv`` and fetch every
+    listed match not yet in ``out`` (within ``deadline`` seconds, if given).
+    """
+    os.makedirs(out, exist_ok=True)
+    refs_path = os.path.join(out, "refs.csv")
+    refs = read_refs(refs_path) if os.path.exists(refs_path) else []
+    known = set(refs)
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    listing = Progress(len(days), "days", stream)
+    for day in days:
+        try:
+            found = Match.get_recent_matches(day.isoformat())
+        except Exception as exc:
+            if stream is not None:
+                stream.write(f"\n{day}: {type(exc).__name__}: {exc}\n")
+            listing.update(failed=1)
+            continue
+        for summary in found:
+            if summary not in known:
+                known.add(summary)
+                refs.append(summary.to_ref())
+        listing.update(ok=1)
+    with open(refs_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["series_id", "match_id"])
+        writer.writerows(ref.to_csv_row() for ref in refs)
+    listing.close()
+    return fetch_matches(refs, out, workers, stream, deadline)
+
+
+def fetch_players(ids, out, workers=8, preload=(), stream=None, batch_size=None):
+    """
+    Fetch every player id not already in ``out`` with
+    :meth:`~espncricinfo.player.Player.fetch_many`, ``batch_size`` ids at
+    a time, and write each profile to ``<player_id>.json``, reporting
+    progress to ``stream``. Returns the progress summary.
+    """
+    os.makedirs(out, exist_ok=True)
+    todo = [pid for pid in ids if not os.path.exists(os.path.join(out, f"{pid}.json"))]
+    progress = Progress(len(ids), "players", stream)
+    progress.update(skipped=len(ids) - len(todo))
+    batch_size = batch_size or 4 * max(1, workers)
+    failures = []
+    for start in range(0, len(todo), batch_size):
+        batch = todo[start:start + batch_size]
+        try:
+            players = Player.fetch_many(batch, concurrency=workers, preload=preload)
+        except Exception as exc:
+            failures.extend((pid, f"{type(exc).__name__}: {exc}") for pid in batch)
+            progress.update(failed=len(batch))
+            continue
+        for pid, player in zip(batch, players):
+            if player is None:
+                failures.append((pid, "PlayerNotFoundError"))
+                progress.update(failed=1)
+                continue
+            data = {"json": player.json}
+            if "new_json" in player.__dict__:
+                data["new_json"] = player.new_json
+            write_json(os.path.join(out, f"{pid}.json"), data)
+            progress.update(ok=1)
+    progress.close()
+    _write_failures(out, ["player_id", "error"], [[pid, error] for pid, error in failures])
+    return progress.summary()
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {value!r}")
+
+
+def _add_page_options(p):
+    p.add_argument("--deadline", type=float, default=None,
+                   help="seconds allowed for fetching the matches; the rest are left for the next run")
+    p.add_argument("--hedge", action="store_true", help="start a second page load when one is slower than usual")
+    p.add_argument("--retries", type=int, default=0, help="retries for failed page loads (default: %(default)s)")
+    p.add_argument("--daemon", metavar="ADDRESS", help="load pages through the fetch daemon at this socket or URL")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="espncricinfo", description="Batch fetch ESPN Cricinfo data.")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("fetch-matches", help="fetch the matches listed in a refs CSV")
+    p.add_argument("--refs", required=True, help="CSV of series_id,match_id rows (MatchRef.to_csv_row)")
+    p.add_argument("--workers", type=int, default=4, help="matches fetched at once (default: %(default)s)")
+    p.add_argument("--out", required=True, help="directory for <series_id>_<match_id>.json files")
+    _add_page_options(p)
+
+    p = commands.add_parser("sync", help="list and fetch the matches played between two dates")
+    p.add_argument("--from", dest="start", type=_date, required=True, help="first day, YYYY-MM-DD")
+    p.add_argument("--to", dest="end", type=_date, default=None, help="last day, YYYY-MM-DD (default: --from)")
+    p.add_argument("--workers", type=int, default=4, help="matches fetched at once (default: %(default)s)")
+    p.add_argument("--out", required=True, help="directory for refs.csv and the match files")
+    _add_page_options(p)
+
+    p = commands.add_parser("players", help="fetch player profiles")
+    p.add_argument("--ids", required=True, help="file with one player id per line")
+    p.add_argument("--workers", type=int, default=8, help="concurrent requests (default: %(default)s)")
+    p.add_argument("--out", required=True, help="directory for <player_id>.json files")
+    p.add_argument("--with-teams", action="store_true", help="also fetch the profile document listing teams")
+
+    p = commands.add_parser("daemon", help="keep warm browsers loading pages for other processes")
+    p.add_argument("--socket", help="Unix socket to listen on (default: TCP on --host/--port)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8766)
+    p.add_argument("--browsers", type=int, default=2, help="browsers kept running (default: %(default)s)")
+    p.add_argument("--contexts", type=int, default=4, help="page loads at once per browser (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    stream = None if args.quiet else sys.stderr
+
+    if args.command == "daemon":
+        server = daemon.FetchDaemon(args.socket, args.host, args.port, args.browsers, args.contexts)
+        if stream is not None:
+            stream.write(f"Serving page loads on {server.address}\n")
+        server.serve_forever()
+        return 0
+
+    with ExitStack() as stack:
+        if args.command in ("fetch-matches", "sync"):
+            hedging.configure(hedge=args.hedge, retries=args.retries)
+            if args.daemon:
+                stack.enter_context(daemon.connect(args.daemon))
+
+        if args.command == "fetch-matches":
+            summary = fetch_matches(read_refs(args.refs), args.out, args.workers, stream, args.deadline)
+        elif args.command == "sync":
+            end = args.end or args.start
+            if end < args.start:
+                parser.error("--to is before --from")
+            summary = sync(args.start, end, args.out, args.workers, stream, args.deadline)
+        else:
+            preload = ("new_json",) if args.with_teams else ()
+            summary = fetch_players(read_ids(args.ids), args.out, args.workers, preload, stream)
+    print(json.dumps(summary))
+    return 1 if summary["failed"] else 0
@@ -0,0 +1,432 @@
+"""
+A fetch daemon: one process keeping warm Playwright browsers that load
+pages for many worker processes.
+
+Loading a match page normally launches a WebKit browser in the calling
+process, so every worker pays for the launch and holds a browser's memory
+while it loads. :class:`FetchDaemon` instead owns a :class:`BrowserPool`
+of ``browsers`` long-lived browsers, each serving up to ``contexts`` page
+loads at a time in fresh contexts, and answers requests on a Unix socket
+(or a local TCP port). It returns only the page's ``__NEXT_DATA__``
+script, not the whole HTML, and only loads https URLs on the ESPN
+Cricinfo hosts in :data:`PAGE_HOSTS`, so it cannot be used to browse
+anywhere else.
+
+Workers install a :class:`DaemonClient` as their transport backend, after
+which ``Match`` and ``Summary`` load their pages through the daemon
+(plain HTTP requests, for ``Player`` and ``Series``, are still made
+directly)::
+
+    $ espncricinfo daemon --socket /tmp/espncricinfo.sock --browsers 2
+
+    from espncricinfo import daemon
+    from espncricinfo.match import Match
+
+    with daemon.connect("/tmp/espncricinfo.sock"):
+        Match(1478914, 1478874)
+
+The status the site answered with is passed back in the
+``X-Upstream-Status`` header, so a blocked (403) or throttled (429) load
+still slows the worker's adaptive concurrency limit down. Loads through
+the daemon are hedged, retried and bounded by the current deadline as
+configured in :mod:`espncricinfo.hedging`, just like loads in the
+calling process; a hedge is a second request to the daemon.
+
+The daemon also answers ``/health`` (pool usage, as JSON) and ``/metrics``
+(its :mod:`espncricinfo.metrics` in the Prometheus text format).
+"""
+import asyncio
+import concurrent.futures
+import http.client
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from espncricinfo import hedging
+from espncricinfo import metrics
+from espncricinfo import transport
+from espncricinfo.exceptions import FetchDaemonError, MatchNotFoundError
+from espncricinfo.match import _NEXT_DATA_RE, _async_new_page, _async_read_page
+from espncricinfo.ratelimit import is_timeout
+from espncricinfo.timing import FetchStats
+
+# Milliseconds a page load may take, as for loads in the calling process.
+PAGE_TIMEOUT = 60000
+
+# Hosts whose pages the daemon loads; anything else is refused.
+PAGE_HOSTS = ("www.espncricinfo.com", "espncricinfo.com")
+
+# Threads making DaemonClient requests, shared by all clients; see _client_pool.
+_client_threads = None
+_client_lock = threading.Lock()
+
+
+class BrowserPool(object):
+    """
+    ``browsers`` WebKit browsers, launched once and shared by up to
+    ``contexts`` concurrent page loads each. The browsers run on an event
+    loop in a background thread; :meth:`load` may be called from any
+    thread. A browser that has crashed is relaunched on its next use.
+    """
+
+    def __init__(self, browsers=2, contexts=4):
+        self.browsers = browsers
+        self.contexts = contexts
+        self.loads = 0
+        self._loop = None
+        self._thread = None
+        self._pw = None
+        self._browsers = []
+        self._slots = None
+        self._relaunch = None
+
+    @property
+    def in_use(self):
+        """Number of page loads running."""
+        if self._slots is None:
+            return 0
+        return self.browsers * self.contexts - self._slots.qsize()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._call(self._start())
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self._call(self._stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def _call(self, coro, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Stop the load, closing its context and freeing its slot.
+            future.cancel()
+            raise
+
+    async def _start(self):
+        # Imported here: Playwright is slow to import and only needed to fetch.
+        from playwright.async_api import async_playwright
+
+        self._pw = await async_playwright().start()
+        self._slots = asyncio.Queue()
+        self._relaunch = asyncio.Lock()
+        for n in range(self.browsers):
+            self._browsers.append(await self._pw.webkit.launch(headless=True))
+            for _ in range(self.contexts):
+                self._slots.put_nowait(n)
+
+    async def _stop(self):
+        for browser in self._browsers:
+            await browser.close()
+        self._browsers = []
+        await self._pw.stop()
+
+    def load(self, url, timeout=PAGE_TIMEOUT):
+        """Return ``(status, html)`` of ``url``; raises MatchNotFoundError on 404."""
+        # Allow for queueing behind other loads on top of the page timeout.
+        return self._call(self._load(url, timeout), timeout / 1000 * 2 + 10)
+
+    async def _load(self, url, timeout):
+        n = await self._slots.get()
+        try:
+            async with self._relaunch:
+                if not self._browsers[n].is_connected():
+                    self._browsers[n] = await self._pw.webkit.launch(headless=True)
+            context, page = await _async_new_page(self._browsers[n])
+            stats = FetchStats()
+            try:
+                content = await _async_read_page(context, page, url, stats, timeout)
+            finally:
+                await context.close()
+        finally:
+            self._slots.put_nowait(n)
+        self.loads += 1
+        return _goto_status(stats), content
+
+
+def _goto_status(stats):
+    """Return the status of the last page load recorded in ``stats``, or None."""
+    return next((s.status for s in reversed(stats.spans) if s.name == "goto"), None)
+
+
+def _allowed(url):
+    """Return True if ``url`` is an https URL on one of :data:`PAGE_HOSTS`."""
+    parts = urlsplit(url)
+    return parts.scheme == "https" and parts.hostname in PAGE_HOSTS and not parts.username
+
+
+def _next_data(content):
+    """Return the ``__NEXT_DATA__`` script of a page, or None if it has none."""
+    m = _NEXT_DATA_RE.search(content)
+    return m.group(0) if m else None
+
+
+def _remove_stale_socket(path):
+    """
+    Remove the socket left at ``path`` by a daemon that is no longer
+    running. Anything other than a socket is left alone (binding then
+    fails); raises FetchDaemonError if a daemon still listens there.
+    """
+    try:
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        os.remove(path)
+        return
+    finally:
+        sock.close()
+    raise FetchDaemonError(f"A fetch daemon is already listening on {path}")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _handler(daemon):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/page" and "url" in query:
+                try:
+                    timeout = int(query.get("timeout", [PAGE_TIMEOUT])[0])
+                except ValueError:
+                    timeout = 0
+                if timeout <= 0:
+                    self._send(400, "text/plain", "timeout must be a positive number of milliseconds")
+                else:
+                    self._page(query["url"][0], timeout)
+            elif url.path == "/health":
+                health = {"browsers": daemon.pool.browsers, "contexts": daemon.pool.contexts,
+                          "in_use": daemon.pool.in_use, "loads": daemon.pool.loads}
+                self._send(200, "application/json", json.dumps(health))
+            elif url.path == "/metrics":
+                self._send(200, "text/plain; version=0.0.4", metrics.to_prometheus())
+            else:
+                self._send(404, "text/plain", "Not found")
+
+        def _page(self, url, timeout):
+            # Checked before transport.resolve, which only applies the
+            # daemon's own ``hosts`` mapping.
+            if not _allowed(url):
+                self._send(403, "text/plain", f"Not an ESPN Cricinfo page: {url}")
+                return
+            try:
+                upstream, content = daemon.pool.load(url, timeout)
+            except MatchNotFoundError as exc:
+                self._send(404, "text/plain", str(exc), upstream=404)
+            except Exception as exc:
+                self._send(504 if is_timeout(exc) else 502, "text/plain", f"{type(exc).__name__}: {exc}")
+            else:
+                next_data = _next_data(content)
+                if next_data is None:
+                    self._send(502, "text/plain", f"No __NEXT_DATA__ in {url}", upstream)
+                else:
+                    self._send(200, "text/html", next_data, upstream)
+
+        def _send(self, status, content_type, text, upstream=None):
+            body = text.encode("utf-8")
+            self.send_response(status)
+            if upstream is not None:
+                self.send_header("X-Upstream-Status", str(upstream))
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class FetchDaemon(object):
+    """
+    Serve page loads from ``pool`` (a :class:`BrowserPool` of ``browsers``
+    x ``contexts`` by default) on the Unix socket ``socket_path``, or on
+    ``host``:``port`` when no socket is given (port 0 picks a free one).
+    Use as a context manager, call :meth:`start` and :meth:`stop`, or
+    :meth:`serve_forever`.
+    """
+
+    def __init__(self, socket_path=None, host="127.0.0.1", port=0, browsers=2, contexts=4, pool=None):
+        self.socket_path = os.path.expanduser(socket_path) if socket_path else None
+        self.pool = pool if pool is not None else BrowserPool(browsers, contexts)
+        if self.socket_path:
+            _remove_stale_socket(self.socket_path)
+            self._httpd = _UnixHTTPServer(self.socket_path, _handler(self))
+        else:
+            self._httpd = ThreadingHTTPServer((host, port), _handler(self))
+            self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        """The address to give :class:`DaemonClient`."""
+        if self.socket_path:
+            return self.socket_path
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.pool.start()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        """Start the pool and serve in this thread until interrupted."""
+        self.pool.start()
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._close()
+
+    def _close(self):
+        self._httpd.server_close()
+        self.pool.stop()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _UnixConnection(http.client.HTTPConnection):
+
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class DaemonClient(object):
+    """
+    A transport backend loading pages through the :class:`FetchDaemon` at
+    ``address``: a Unix socket path, or an ``http://host:port`` URL. HTTP
+    requests are made over the shared session as usual.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        if address.startswith("http://"):
+            parts = urlsplit(address)
+            self._host, self._port, self._socket = parts.hostname, parts.port, None
+        else:
+            self._host, self._port, self._socket = None, None, address
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.address!r})"
+
+    def _request(self, path, timeout):
+        if self._socket:
+            conn = _UnixConnection(self._socket, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+        try:
+            conn.request("GET", path)
+            r = conn.getresponse()
+            return r.status, r.headers, r.read().decode("utf-8")
+        except TimeoutError:
+            raise
+        except OSError as exc:
+            raise FetchDaemonError(f"Fetch daemon not reachable at {self.address}: {exc}") from exc
+        finally:
+            conn.close()
+
+    def health(self):
+        """Return the daemon's pool usage."""
+        status, headers, body = self._request("/health", 10)
+        return json.loads(body)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        return transport.session_get(url, headers=headers, timeout=timeout, **kwargs)
+
+    def load_page(self, url, stats, load):
+        """
+        Return the page's ``__NEXT_DATA__`` script, loaded by the daemon
+        and hedged, retried and bounded by the current deadline as browser
+        loads are (see :func:`espncricinfo.hedging.load`).
+        """
+        return asyncio.run(hedging.load(url, stats, self._load_page))
+
+    async def _load_page(self, url, stats, timeout=PAGE_TIMEOUT):
+        """One attempt: ask the daemon to load ``url``, allowing ``timeout`` milliseconds."""
+        query = urlencode({"url": url, "timeout": max(1, int(timeout))})
+        loop = asyncio.get_running_loop()
+        with stats.span("goto", url) as span:
+            # In a thread, so a hedge can be started while this waits. The
+            # daemon may queue the load behind others; allow for that.
+            status, headers, body = await loop.run_in_executor(
+                _client_pool(), self._request, f"/page?{query}", timeout / 1000 * 2 + 10)
+            upstream = headers.get("X-Upstream-Status")
+            span.status = int(upstream) if upstream else None
+        if status == 404:
+            raise metrics.record_error(MatchNotFoundError(f"Match not found at {url}"))
+        if status == 504:
+            raise TimeoutError(f"Fetch daemon timed out loading {url}: {body}")
+        if status != 200:
+            raise metrics.record_error(FetchDaemonError(f"Fetch daemon failed to load {url}: {body}"))
+        with stats.span("content", url) as span:
+            span.bytes = len(body.encode("utf-8"))
+        return body
+
+
+def _client_pool():
+    # Not the event loop's default executor: asyncio.run waits for that to
+    # finish, which would hold up a hedged load until the losing request
+    # had timed out too.
+    global _client_threads
+    with _client_lock:
+        if _client_threads is None:
+            _client_threads = concurrent.futures.ThreadPoolExecutor(
+                max_workers=32, thread_name_prefix="espncricinfo-daemon-client")
+        return _client_threads
+
+
+@contextmanager
+def connect(address):
+    """Load pages through the daemon at ``address`` in the block; yields the :class:`DaemonClient`."""
+    client = DaemonClient(address)
+    previous = transport.set_backend(client)
+    try:
+        yield client
+    finally:
+        transport.set_backend(previous)
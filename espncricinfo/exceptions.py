@@ -24,4 +24,24 @@ class NoSeriesError(TypeError):
     """
     Exception raised if a series_id is not valid or does not exist.
     """
-    pass
\ No newline at end of file
+    pass
+
+class ReplayMissError(LookupError):
+    """
+    Exception raised when a replayed request is not in the archive.
+    """
+    pass
+
+class DeadlineExceededError(TimeoutError):
+    """
+    Exception raised when a fetch is started or still running after its
+    deadline (see espncricinfo.hedging.Deadline).
+    """
+    pass
+
+class FetchDaemonError(RuntimeError):
+    """
+    Exception raised when the fetch daemon cannot be reached or fails to
+    load a page (see espncricinfo.daemon).
+    """
+    pass
@@ -0,0 +1,341 @@
+"""
+Hedged, retried and deadline-bounded Playwright page loads.
+
+A page load that hangs holds its worker until Playwright's timeout (60
+seconds) expires. With hedging enabled, a load still running after the
+``percentile`` latency of recent successful loads (``delay`` seconds until
+enough loads have been seen) starts a second attempt in a new browser;
+whichever finishes first is used and the other is cancelled. Loads that
+fail for any reason other than a 404 are retried ``retries`` times with
+exponential backoff.
+
+Hedges and retries are fetches too: each retry waits for a token from the
+transport's rate limit, and a hedge is only started when both the rate
+limit and the adaptive concurrency limit have room for it at once (see
+:func:`espncricinfo.transport.limited`).
+
+A :class:`Deadline` bounds a whole batch: inside ``with deadline:`` every
+page load and HTTP request is given at most the time left, and raises
+DeadlineExceededError once it has run out, so a batch finishes on time
+instead of waiting on its slowest fetches. Work the library hands to its
+own thread pools runs under the same deadline; use :func:`submit` to do
+the same with yours.
+
+Example::
+
+    from espncricinfo import hedging
+    from espncricinfo.match import Match
+
+    hedging.configure(hedge=True, percentile=95, retries=2)
+
+    budget = hedging.Deadline(300)
+    with budget:
+        matches = [Match(m, s) for s, m in refs]
+"""
+import threading
+import time
+from collections import deque
+
+from espncricinfo import metrics
+from espncricinfo.exceptions import DeadlineExceededError, MatchNotFoundError
+from espncricinfo.ratelimit import ERROR, OK, Slot, classify, is_timeout
+
+_DEFAULTS = {
+    "hedge": False,
+    "percentile": 95,
+    "delay": 10.0,
+    "min_delay": 1.0,
+    "min_samples": 20,
+    "retries": 0,
+    "backoff": 1.0,
+    "timeout": 60.0,
+}
+
+_lock = threading.Lock()
+_config = dict(_DEFAULTS)
+_local = threading.local()
+
+HEDGES = metrics.REGISTRY.counter(
+    "espncricinfo_hedges_total", "Second page load attempts started, by the attempt that won.", ("winner",))
+RETRIES = metrics.REGISTRY.counter(
+    "espncricinfo_retries_total", "Page loads retried after a failed attempt.", ())
+
+
+def configure(**options):
+    """
+    Change how page loads are hedged and retried.
+
+    Keyword arguments:
+        hedge {bool}: Start a second attempt when a load is slower than usual
+        percentile {float}: Latency percentile of recent loads after which to hedge
+        delay {float}: Seconds after which to hedge until ``min_samples`` loads were seen
+        min_delay {float}: Never hedge sooner than this many seconds
+        min_samples {int}: Successful loads needed before ``percentile`` is used
+        retries {int}: Further attempts after a load fails (404s are not retried)
+        backoff {float}: Seconds before the first retry, doubling for each one after
+        timeout {float}: Seconds each attempt may take
+
+    Options not passed keep their current value; recorded latencies are kept.
+    """
+    unknown = set(options) - set(_DEFAULTS)
+    if unknown:
+        raise TypeError(f"Unknown hedging option(s): {', '.join(sorted(unknown))}")
+    with _lock:
+        _config.update(options)
+
+
+def reset():
+    """Restore the default settings and forget the recorded latencies."""
+    configure(**_DEFAULTS)
+    LATENCIES.clear()
+
+
+class LatencyWindow(object):
+    """The durations of the last ``size`` successful page loads."""
+
+    def __init__(self, size=200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q):
+        """Return the ``q`` (0-100) percentile by the nearest-rank method, or None when empty."""
+        with self._lock:
+            values = sorted(self._samples)
+        if not values:
+            return None
+        return values[max(0, -(-len(values) * q // 100) - 1)]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+LATENCIES = LatencyWindow()
+
+
+def hedge_delay():
+    """Seconds a page load may run before a second attempt is started, or None when not hedging."""
+    if not _config["hedge"]:
+        return None
+    delay = _config["delay"]
+    if len(LATENCIES) >= _config["min_samples"]:
+        delay = LATENCIES.percentile(_config["percentile"])
+    return max(_config["min_delay"], delay)
+
+
+class Deadline(object):
+    """
+    A time budget of ``seconds`` for a batch of fetches. Enter it (in each
+    worker thread) to bound every fetch made there by the time left.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(remaining={self.remaining():.3f})"
+
+    def remaining(self):
+        """Seconds left, never below zero."""
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def __enter__(self):
+        stack = getattr(_local, "deadlines", None)
+        if stack is None:
+            stack = _local.deadlines = []
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _local.deadlines.pop()
+
+
+def current_deadline():
+    """Return the innermost :class:`Deadline` entered in this thread, or None."""
+    stack = getattr(_local, "deadlines", None)
+    return stack[-1] if stack else None
+
+
+def submit(pool, fn, *args, **kwargs):
+    """
+    ``pool.submit(fn, *args, **kwargs)``, running ``fn`` under the current
+    :class:`Deadline` of the calling thread (deadlines are per thread, so
+    work handed to a pool would otherwise escape it).
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return pool.submit(fn, *args, **kwargs)
+    return pool.submit(_within, deadline, fn, args, kwargs)
+
+
+def _within(deadline, fn, args, kwargs):
+    with deadline:
+        return fn(*args, **kwargs)
+
+
+def time_left(timeout, url=None):
+    """
+    Return ``timeout`` capped by the current deadline; raises
+    DeadlineExceededError if the deadline has passed.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise metrics.record_error(DeadlineExceededError(f"Deadline exceeded before fetching {url}"))
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def deadline_error(exc, url=None, capped=False, record=True):
+    """
+    Return the error to raise for a fetch of ``url`` that failed with
+    ``exc``: DeadlineExceededError when the current deadline caused it
+    (the deadline has passed, or ``exc`` is a timeout of a fetch whose
+    timeout the deadline cut short, ``capped``), else ``exc`` itself.
+    Pass ``record=False`` inside a timing span, which counts the error
+    itself (see :func:`espncricinfo.metrics.record_error`).
+    """
+    deadline = current_deadline()
+    if deadline is None or isinstance(exc, DeadlineExceededError):
+        return exc
+    if not (deadline.expired or (capped and is_timeout(exc))):
+        return exc
+    error = DeadlineExceededError(f"Deadline exceeded fetching {url}")
+    if record:
+        metrics.record_error(error)
+    error.__cause__ = exc
+    return error
+
+
+def _limits():
+    # Imported here: transport imports this module.
+    from espncricinfo import transport
+    return transport.get_limits()
+
+
+def _retry_wait():
+    """Take a rate limit token for a retry; return the seconds to wait for it."""
+    bucket, _ = _limits()
+    return 0.0 if bucket is None else bucket.reserve()
+
+
+def _admit_hedge():
+    """
+    Return a callback releasing the limits taken for a hedge (given the
+    hedge's task, or None if it never started), or None when the rate or
+    concurrency limit has no room for one right now.
+    """
+    bucket, limiter = _limits()
+    if limiter is not None and not limiter.acquire(timeout=0):
+        return None
+    if bucket is not None and bucket.acquire(timeout=0) is None:
+        if limiter is not None:
+            limiter.release(Slot(), ERROR)
+        return None
+    if limiter is None:
+        return lambda task: None
+    slot = Slot()
+
+    def release(task):
+        if task is None or task.cancelled():
+            limiter.release(slot, ERROR)
+        else:
+            exc = task.exception()
+            limiter.release(slot, OK if exc is None else classify(exc=exc))
+    return release
+
+
+async def load(url, stats, attempt):
+    """
+    Return the HTML of ``url`` loaded by ``attempt(url, stats, timeout=ms)``
+    (a coroutine function such as ``match._async_load_page``), hedging,
+    retrying and bounding it as configured.
+    """
+    # Imported here, as in match._browser_load_page: only needed to fetch.
+    import asyncio
+
+    retries = _config["retries"]
+    for n in range(retries + 1):
+        try:
+            return await _race(url, stats, attempt)
+        except (MatchNotFoundError, DeadlineExceededError):
+            raise
+        except Exception:
+            pause = _config["backoff"] * 2 ** n
+            deadline = current_deadline()
+            if n == retries or (deadline is not None and deadline.remaining() <= pause):
+                raise
+        RETRIES.inc()
+        await asyncio.sleep(max(pause, _retry_wait()))
+
+
+async def _race(url, stats, attempt):
+    import asyncio
+
+    delay = hedge_delay()
+    pending = {}
+
+    def start():
+        timeout = time_left(_config["timeout"], url)
+        started = time.monotonic()
+        task = asyncio.ensure_future(attempt(url, stats, timeout=timeout * 1000))
+        pending[task] = (started, started + timeout, timeout < _config["timeout"])
+        return task
+
+    # The caller holds the limits for the first attempt; a hedge takes its own.
+    first = start()
+    hedged = False
+    try:
+        if delay is not None and delay < _config["timeout"]:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            release = None if done else _admit_hedge()
+            if release is not None:
+                try:
+                    hedge = start()
+                except BaseException:
+                    release(None)
+                    raise
+                hedge.add_done_callback(release)
+                hedged = True
+        error = None
+        while pending:
+            # Attempts time out in Playwright; this only catches one stuck elsewhere.
+            ends = max(end for _, end, _ in pending.values())
+            done, _ = await asyncio.wait(pending, timeout=max(0.0, ends - time.monotonic()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                deadline = current_deadline()
+                if deadline is not None and deadline.expired:
+                    raise metrics.record_error(DeadlineExceededError(f"Deadline exceeded loading {url}"))
+                raise TimeoutError(f"Timed out loading {url}")
+            for task in done:
+                started, _, capped = pending.pop(task)
+                if task.exception() is None:
+                    LATENCIES.add(time.monotonic() - started)
+                    if hedged:
+                        HEDGES.inc(winner="first" if task is first else "hedge")
+                    return task.result()
+                # A timeout the deadline imposed is not the site's fault.
+                error = deadline_error(task.exception(), url, capped)
+                if isinstance(error, (MatchNotFoundError, DeadlineExceededError)):
+                    raise error
+        raise error
+    finally:
+        # Cancelling the losing attempt closes its browser.
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
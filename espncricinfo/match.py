@@ -1,47 +1,163 @@
 import json
-import asyncio
+import re
 from datetime import date as _date
-from playwright.async_api import async_playwright
+from espncricinfo import browser_state
+from espncricinfo import cache as _cache
+from espncricinfo import hedging
+from espncricinfo import metrics
+from espncricinfo import transport
 from espncricinfo.exceptions import MatchNotFoundError, NoScorecardError
-from espncricinfo.match_ref import MatchRef
+from espncricinfo.match_ref import MatchSummary
+from espncricinfo.timing import FetchStats
 
+# internationalClassId -> class card, as shown on ESPN Cricinfo
+_INTL_CLASS_MAP = {
+    1: "Test",
+    2: "ODI",
+    3: "T20I",
+    10: "WT20I",
+    11: "WODI",
+    12: "WTest",
+}
 
-async def _async_playwright_fetch(url):
+_NEXT_DATA_RE = re.compile(
+    r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.DOTALL
+)
+
+
+async def _async_playwright_fetch(url, stats=None):
     """
     Fetch a page via Playwright (WebKit) and return the parsed __NEXT_DATA__ dict.
     WebKit is used because Akamai does not block it in headless mode.
     Raises MatchNotFoundError on 404.
+
+    Each phase (browser_launch, goto, content, extract, json_decode) is
+    recorded as a span in ``stats``, a :class:`~espncricinfo.timing.FetchStats`.
     """
-    async with async_playwright() as pw:
-        browser = await pw.webkit.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/605.1.15 (KHTML, like Gecko) "
-                "Version/16.0 Safari/605.1.15"
-            ),
-        )
-        page = await context.new_page()
+    if stats is None:
+        stats = FetchStats()
+    content = await _async_load_page(url, stats)
+    return _extract_next_data(content, stats, url)
+
+
+async def _async_load_page(url, stats, timeout=60000):
+    """
+    Return the HTML of a page loaded in Playwright (WebKit), allowing
+    ``page.goto`` ``timeout`` milliseconds; raises MatchNotFoundError on 404.
 
-        response = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        if response and response.status == 404:
+    The browser context starts from the storage state persisted by
+    :mod:`espncricinfo.browser_state`, if any, and renews it after a
+    successful load.
+    """
+    # Imported here: Playwright is slow to import and only needed to fetch.
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as pw:
+        with stats.span("browser_launch", url):
+            browser = await pw.webkit.launch(headless=True)
+            context, page = await _async_new_page(browser)
+        try:
+            return await _async_read_page(context, page, url, stats, timeout)
+        finally:
             await browser.close()
-            raise MatchNotFoundError(f"Match not found at {url}")
 
+
+async def _async_new_page(browser):
+    """Open a page in a new context of ``browser``; returns ``(context, page)``."""
+    context = await browser.new_context(
+        user_agent=(
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) "
+            "Version/16.0 Safari/605.1.15"
+        ),
+        storage_state=browser_state.load(),
+    )
+    return context, await context.new_page()
+
+
+async def _async_read_page(context, page, url, stats, timeout):
+    """Load ``url`` in ``page`` and return its HTML; raises MatchNotFoundError on 404."""
+    with stats.span("goto", url) as span:
+        response = await page.goto(transport.resolve(url), wait_until="domcontentloaded", timeout=timeout)
+        if response:
+            span.status = response.status
+    if response and response.status == 404:
+        raise metrics.record_error(MatchNotFoundError(f"Match not found at {url}"))
+    if response and browser_state.is_blocked(response.status):
+        browser_state.discard()
+
+    with stats.span("content", url) as span:
         content = await page.content()
-        await browser.close()
+        span.bytes = len(content.encode("utf-8"))
+    if response and response.status < 400 and browser_state.needs_save():
+        browser_state.save(await context.storage_state())
+    return content
 
-    # Extract __NEXT_DATA__ from the HTML
-    import re
-    m = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', content, re.DOTALL)
-    if not m:
-        raise NoScorecardError("Could not find __NEXT_DATA__ in page")
-    return json.loads(m.group(1))
 
+def _extract_next_data(content, stats=None, url=None):
+    """
+    Return the parsed __NEXT_DATA__ dict embedded in a page's HTML.
+    Raises NoScorecardError if the page has none.
+    """
+    if stats is None:
+        stats = FetchStats()
+    with stats.span("extract", url) as span:
+        m = _NEXT_DATA_RE.search(content)
+        if not m:
+            raise NoScorecardError("Could not find __NEXT_DATA__ in page")
+        raw = m.group(1)
+        span.bytes = len(raw)
+    with stats.span("json_decode", url):
+        return json.loads(raw)
+
+
+def _browser_load_page(url, stats):
+    """
+    Synchronous wrapper around _async_load_page, hedged, retried and
+    bounded by the current deadline as set up in :mod:`espncricinfo.hedging`.
+    """
+    import asyncio
+    return asyncio.run(hedging.load(url, stats, _async_load_page))
 
-def _playwright_fetch(url):
-    """Synchronous wrapper around _async_playwright_fetch."""
-    return asyncio.run(_async_playwright_fetch(url))
+
+def _playwright_fetch(url, stats=None):
+    """
+    Load a page and return its parsed __NEXT_DATA__ dict (see
+    _async_playwright_fetch). When a transport backend is installed (see
+    :mod:`espncricinfo.replay`) it provides the page HTML instead of the
+    browser. A page already being loaded by another thread is not loaded
+    twice (see :func:`espncricinfo.transport.coalesce`), and a page that
+    answered 404 recently raises MatchNotFoundError without being loaded
+    (see :func:`espncricinfo.cache.mark_not_found`). Loads wait for the
+    transport's rate and concurrency limits (see
+    :func:`espncricinfo.transport.limited`) and raise DeadlineExceededError
+    once the current :class:`~espncricinfo.hedging.Deadline` has passed.
+    """
+    if stats is None:
+        stats = FetchStats()
+    if _cache.is_not_found(url):
+        raise metrics.record_error(MatchNotFoundError(f"Match not found at {url}"))
+
+    def load():
+        hedging.time_left(None, url)
+        with transport.limited(stats, url) as slot:
+            backend = transport.get_backend()
+            try:
+                if backend is not None:
+                    return backend.load_page(url, stats, _browser_load_page)
+                return _browser_load_page(url, stats)
+            finally:
+                # Also set when the load failed, so a blocked page still counts as throttled.
+                slot.status = next((s.status for s in reversed(stats.spans) if s.name == "goto"), None)
+
+    # Concurrent loads of the same page share one browser; each caller
+    # still decodes its own copy of the data.
+    try:
+        content = transport.coalesce(("page", url), load, stats, url)
+    except MatchNotFoundError:
+        _cache.mark_not_found(url)
+        raise
+    return _extract_next_data(content, stats, url)
 
 
 def _normalise(next_data, match_id, series_id):
@@ -156,16 +272,8 @@ def _normalise(next_data, match_id, series_id):
     series_data = match.get("series", {})
 
     # ---- match class ----
-    intl_class_map = {
-        1: "Test",
-        2: "ODI",
-        3: "T20I",
-        10: "WT20I",
-        11: "WODI",
-        12: "WTest",
-    }
     intl_class_id = match.get("internationalClassId")
-    intl_class_card = intl_class_map.get(intl_class_id, "") if intl_class_id else ""
+    intl_class_card = _INTL_CLASS_MAP.get(intl_class_id, "") if intl_class_id else ""
     general_class_card = match.get("format", "")
 
     # ---- innings_list for centre ----
@@ -247,6 +355,32 @@ def _normalise(next_data, match_id, series_id):
     return normalised
 
 
+def _summarise(m):
+    """
+    Build a :class:`~espncricinfo.match_ref.MatchSummary` from one entry of
+    the results page's content.matches list. Field values follow the
+    conventions of the equivalent Match attributes (lower-case status,
+    international class card falling back to the general format).
+    Raises KeyError/TypeError if the entry has no series or match id.
+    """
+    series = m["series"]
+    intl_class_id = m.get("internationalClassId")
+    match_class = _INTL_CLASS_MAP.get(intl_class_id) if intl_class_id else None
+    return MatchSummary(
+        series_id=series["objectId"],
+        match_id=m["objectId"],
+        title=m.get("title"),
+        status=(m.get("status") or "").lower() or None,
+        status_text=m.get("statusText"),
+        match_class=match_class or m.get("format"),
+        start_date=(m.get("startDate") or "")[:10] or None,
+        start_datetime=m.get("startTime") or m.get("startDate"),
+        series_name=series.get("name"),
+        ground_name=(m.get("ground") or {}).get("longName"),
+        teams=[t["team"]["name"] for t in m.get("teams") or [] if t.get("team")],
+    )
+
+
 class Match(object):
 
     def __init__(self, match_id, series_id):
@@ -341,13 +475,17 @@ class Match(object):
         """
         Fetch the match page via Playwright, extract __NEXT_DATA__, and return
         a normalised dict shaped like the old engine JSON.
+
+        The timing of each phase is kept in ``self.fetch_stats``.
         """
         url = (
             f"https://www.espncricinfo.com/series/"
             f"x-{self.series_id}/x-{self.match_id}/full-scorecard"
         )
-        next_data = _playwright_fetch(url)
-        return _normalise(next_data, self.match_id, self.series_id)
+        self.fetch_stats = FetchStats()
+        next_data = _playwright_fetch(url, stats=self.fetch_stats)
+        with self.fetch_stats.span("normalise", url):
+            return _normalise(next_data, self.match_id, self.series_id)
 
     def get_html(self):
         """Not used in the new implementation; returns None."""
@@ -788,13 +926,16 @@ class Match(object):
     # ------------------------------------------------------------------
 
     @staticmethod
-    def get_recent_matches(date=None) -> list[MatchRef]:
+    def get_recent_matches(date=None) -> list[MatchSummary]:
         """
-        Return a list of :class:`~espncricinfo.match_ref.MatchRef` objects from the results page.
+        Return a list of :class:`~espncricinfo.match_ref.MatchSummary` objects from the results page.
 
         Fetches https://www.espncricinfo.com/live-cricket-match-results
         (optionally with ?date=YYYY-MM-DD) and extracts match data from
         __NEXT_DATA__ at props.appPageProps.data.data.content.matches.
+        Each entry is a :class:`~espncricinfo.match_ref.MatchRef` subclass
+        carrying status, class, teams and start time, so results can be
+        filtered before hydrating full Match objects.
         """
         if date:
             url = f"https://www.espncricinfo.com/live-cricket-match-results?date={date}"
@@ -814,9 +955,7 @@ class Match(object):
         results = []
         for m in matches:
             try:
-                series_id = m["series"]["objectId"]
-                match_id = m["objectId"]
-                results.append(MatchRef(series_id=series_id, match_id=match_id))
-            except (KeyError, TypeError):
+                results.append(_summarise(m))
+            except (KeyError, TypeError, ValueError):
                 continue
         return results
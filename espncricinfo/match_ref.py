@@ -1,6 +1,10 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import csv
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Optional, Tuple
 
 if TYPE_CHECKING:
     from espncricinfo.match import Match
@@ -33,6 +37,15 @@ class MatchRef:
         object.__setattr__(self, "series_id", int(self.series_id))
         object.__setattr__(self, "match_id", int(self.match_id))
 
+    def __eq__(self, other):
+        """Refs are equal when their ids are, whatever subclass they are."""
+        if not isinstance(other, MatchRef):
+            return NotImplemented
+        return (self.series_id, self.match_id) == (other.series_id, other.match_id)
+
+    def __hash__(self):
+        return hash((self.series_id, self.match_id))
+
     def __iter__(self):
         """Yield series_id then match_id — enables tuple unpacking."""
         yield self.series_id
@@ -64,3 +77,322 @@ class MatchRef:
         """
         from espncricinfo.match import Match
         return Match(self.match_id, self.series_id)
+
+
+@dataclass(frozen=True, eq=False)
+class MatchSummary(MatchRef):
+    """
+    A :class:`MatchRef` carrying the lightweight metadata listed on the
+    ESPN Cricinfo results page.
+
+    Returned by :meth:`~espncricinfo.match.Match.get_recent_matches` so that
+    matches can be filtered on status, format or date before paying for a
+    full :class:`~espncricinfo.match.Match` fetch. Equality and hashing use
+    only ``series_id`` and ``match_id``, so a summary equals the plain
+    :class:`MatchRef` with the same ids.
+
+    Example::
+
+        from espncricinfo.summary import Summary
+
+        odis = [s for s in Summary().matches
+                if s.status == "result" and s.match_class == "ODI"]
+        refs = [s.to_ref() for s in odis]   # plain MatchRef objects
+    """
+
+    title: Optional[str] = None
+    status: Optional[str] = None
+    status_text: Optional[str] = None
+    match_class: Optional[str] = None
+    start_date: Optional[str] = None
+    start_datetime: Optional[str] = None
+    series_name: Optional[str] = None
+    ground_name: Optional[str] = None
+    teams: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        super().__post_init__()
+        object.__setattr__(self, "teams", tuple(self.teams or ()))
+
+    def to_ref(self) -> MatchRef:
+        """Return a plain :class:`MatchRef` with the same ids."""
+        return MatchRef(series_id=self.series_id, match_id=self.match_id)
+
+    def to_dict(self) -> dict:
+        """Return all fields as a dict; ``teams`` is a list."""
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        d["teams"] = list(self.teams)
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "MatchSummary":
+        """Construct from a mapping produced by :meth:`to_dict`; unknown keys are ignored."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in d.items() if k in names})
+
+
+# Packed MatchRef keys: series_id in the high 32 bits, match_id in the low 32.
+_ID_BITS = 32
+_MATCH_MASK = (1 << _ID_BITS) - 1
+_MAX_SERIES_ID = (1 << 31) - 1
+_EMPTY = -1
+_GOLDEN = 0x9E3779B97F4A7C15  # 2**64 / golden ratio, for Fibonacci hashing
+_MASK64 = (1 << 64) - 1
+_BINARY_MAGIC = b"MRS2"
+_BINARY_MAGIC_V1 = b"MRS1"  # keys only; still read
+
+
+def _pack(series_id: int, match_id: int) -> int:
+    series_id, match_id = int(series_id), int(match_id)
+    if not (0 <= series_id <= _MAX_SERIES_ID and 0 <= match_id <= _MATCH_MASK):
+        raise ValueError(f"ids out of range for MatchRefSet: series_id={series_id}, match_id={match_id}")
+    return (series_id << _ID_BITS) | match_id
+
+
+def _int64s(data: bytes, offset: int, count: int) -> array:
+    """Read ``count`` little-endian int64 values from ``data`` at ``offset``."""
+    values = array("q")
+    values.frombytes(data[offset:offset + 8 * count])
+    if len(values) != count:
+        raise ValueError("Truncated MatchRefSet binary file")
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class MatchRefSet(object):
+    """
+    A compact set of :class:`MatchRef` objects.
+
+    Refs are stored as packed 64-bit integers in :mod:`array` buffers (8
+    bytes per ref, plus 16 to 32 for an open-addressing hash table) rather
+    than as Python objects, so hundreds of thousands of them stay small.
+    Membership tests and adding are O(1), duplicates are dropped, iteration
+    follows insertion order (or the order set by :meth:`sort`) and yields
+    MatchRef objects. Set operations return new sets.
+
+    Files can be read and written as CSV rows compatible with
+    :meth:`MatchRef.to_csv_row` / :meth:`MatchRef.from_csv_row`, or in a
+    binary format holding the keys and the hash table, which loads as two
+    array copies with nothing to parse or rehash.
+
+    Example::
+
+        from espncricinfo.match_ref import MatchRefSet
+        from espncricinfo.summary import Summary
+
+        seen = MatchRefSet.load("seen.bin")
+        new = MatchRefSet(Summary().matches) - seen
+        seen |= new
+        seen.save("seen.bin")
+    """
+
+    def __init__(self, refs=()):
+        self._keys = array("q")
+        self._table = array("q", [_EMPTY]) * 8
+        self._bits = 3
+        self.update(refs)
+
+    # ------------------------------------------------------------------
+    # Hash table
+    # ------------------------------------------------------------------
+
+    def _slot(self, key: int) -> int:
+        """Return the table slot holding ``key``, or the empty slot where it would go."""
+        table = self._table
+        mask = len(table) - 1
+        i = ((key * _GOLDEN) & _MASK64) >> (64 - self._bits)
+        while True:
+            k = table[i]
+            if k == key or k == _EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self):
+        self._bits += 1
+        self._table = array("q", [_EMPTY]) * (1 << self._bits)
+        for key in self._keys:
+            self._table[self._slot(key)] = key
+
+    def _add_key(self, key: int) -> bool:
+        i = self._slot(key)
+        if self._table[i] == key:
+            return False
+        self._table[i] = key
+        self._keys.append(key)
+        if 2 * len(self._keys) > len(self._table):
+            self._grow()
+        return True
+
+    def _has_key(self, key: int) -> bool:
+        return self._table[self._slot(key)] == key
+
+    @classmethod
+    def _from_keys(cls, keys) -> "MatchRefSet":
+        s = cls()
+        for key in keys:
+            s._add_key(key)
+        return s
+
+    # ------------------------------------------------------------------
+    # Set interface
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(ref) -> int:
+        series_id, match_id = ref
+        return _pack(series_id, match_id)
+
+    def add(self, ref) -> bool:
+        """Add a MatchRef (or ``(series_id, match_id)`` pair); return False if it was already present."""
+        return self._add_key(self._key(ref))
+
+    def update(self, refs):
+        """Add every ref in ``refs``."""
+        if isinstance(refs, MatchRefSet):
+            for key in refs._keys:
+                self._add_key(key)
+            return
+        for ref in refs:
+            self._add_key(self._key(ref))
+
+    def __contains__(self, ref) -> bool:
+        try:
+            return self._has_key(self._key(ref))
+        except (TypeError, ValueError):
+            return False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        for key in self._keys:
+            yield MatchRef(series_id=key >> _ID_BITS, match_id=key & _MATCH_MASK)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MatchRefSet):
+            return NotImplemented
+        return len(self) == len(other) and all(other._has_key(key) for key in self._keys)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} refs)"
+
+    @property
+    def match_ids(self) -> array:
+        """The match ids, in iteration order, as an ``array('q')``."""
+        return array("q", (key & _MATCH_MASK for key in self._keys))
+
+    def sort(self, key: str = "match_id", reverse: bool = False):
+        """Reorder the refs by ``"match_id"`` or by ``"series_id"`` (then match id)."""
+        if key == "match_id":
+            keys = sorted(self._keys, key=lambda k: (k & _MATCH_MASK, k), reverse=reverse)
+        elif key == "series_id":
+            keys = sorted(self._keys, reverse=reverse)
+        else:
+            raise ValueError(f"Unknown sort key {key!r}; expected 'match_id' or 'series_id'")
+        self._keys = array("q", keys)
+
+    def _coerce(self, other) -> "MatchRefSet":
+        return other if isinstance(other, MatchRefSet) else MatchRefSet(other)
+
+    def union(self, other) -> "MatchRefSet":
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def intersection(self, other) -> "MatchRefSet":
+        other = self._coerce(other)
+        return self._from_keys(key for key in self._keys if other._has_key(key))
+
+    def difference(self, other) -> "MatchRefSet":
+        """Return the refs in this set and not in ``other``, e.g. new matches not yet seen."""
+        other = self._coerce(other)
+        return self._from_keys(key for key in self._keys if not other._has_key(key))
+
+    def symmetric_difference(self, other) -> "MatchRefSet":
+        other = self._coerce(other)
+        result = self.difference(other)
+        result.update(other.difference(self))
+        return result
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def __ior__(self, other) -> "MatchRefSet":
+        self.update(other)
+        return self
+
+    def copy(self) -> "MatchRefSet":
+        result = MatchRefSet()
+        result._keys = array("q", self._keys)
+        result._table = array("q", self._table)
+        result._bits = self._bits
+        return result
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def to_csv(self, path, header: bool = False):
+        """Write one ``series_id,match_id`` row per ref (see :meth:`MatchRef.to_csv_row`)."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            if header:
+                writer.writerow(["series_id", "match_id"])
+            writer.writerows((key >> _ID_BITS, key & _MATCH_MASK) for key in self._keys)
+
+    @classmethod
+    def from_csv(cls, path) -> "MatchRefSet":
+        """Read ``series_id,match_id`` rows, skipping a header and blank rows."""
+        s = cls()
+        with open(path, newline="") as f:
+            for row in csv.reader(f):
+                if len(row) < 2 or not row[0].strip().isdigit():
+                    continue
+                s._add_key(_pack(row[0], row[1]))
+        return s
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the binary format: ``MRS2``, the count and table size (log2)
+        as little-endian int64, then the packed keys and the hash table
+        itself, so loading copies both arrays instead of rebuilding the table.
+        """
+        keys, table = array("q", self._keys), array("q", self._table)
+        if sys.byteorder != "little":
+            keys.byteswap()
+            table.byteswap()
+        return _BINARY_MAGIC + struct.pack("<qq", len(keys), self._bits) + keys.tobytes() + table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MatchRefSet":
+        magic = data[:4]
+        if magic == _BINARY_MAGIC_V1:
+            (count,) = struct.unpack_from("<q", data, 4)
+            return cls._from_keys(_int64s(data, 12, count))
+        if magic != _BINARY_MAGIC or len(data) < 20:
+            raise ValueError("Not a MatchRefSet binary file")
+        count, bits = struct.unpack_from("<qq", data, 4)
+        if not 3 <= bits <= 62 or 2 * count > 1 << bits:
+            raise ValueError("Corrupt MatchRefSet binary file")
+        keys = _int64s(data, 20, count)
+        table = _int64s(data, 20 + 8 * count, 1 << bits)
+        # Every key must be in the table exactly once; array.count runs in C
+        if len(table) - table.count(_EMPTY) != count:
+            raise ValueError("Corrupt MatchRefSet binary file")
+        s = cls()
+        s._keys, s._table, s._bits = keys, table, bits
+        return s
+
+    def save(self, path):
+        """Write the set to ``path`` in the binary format."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> "MatchRefSet":
+        """Read a set written by :meth:`save`."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
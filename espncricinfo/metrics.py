@@ -0,0 +1,272 @@
+"""
+Process-wide metrics for python-espncricinfo.
+
+Counters and latency histograms are collected without any set-up:
+
+* ``espncricinfo_fetches_total`` / ``espncricinfo_fetch_seconds``: page
+  loads and HTTP requests per endpoint (the host fetched from)
+* ``espncricinfo_phase_seconds``: every timing span, per phase (see
+  :mod:`espncricinfo.timing`)
+* ``espncricinfo_bytes_total``: bytes downloaded per endpoint
+* ``espncricinfo_cache_hits_total``, ``..._misses_total`` and
+  ``..._evictions_total`` per cache namespace
+* ``espncricinfo_errors_total``: exceptions per type, both the library's
+  own (``DeadlineExceededError``, ``MatchNotFoundError``,
+  ``NoScorecardError``, ``NoSeriesError``, ``PlayerNotFoundError``) and
+  any other error that ended a fetch phase
+
+Example::
+
+    from espncricinfo import metrics
+
+    print(metrics.to_prometheus())        # Prometheus text exposition format
+    metrics.snapshot()["espncricinfo_errors_total"]
+"""
+import math
+import threading
+from urllib.parse import urlsplit
+
+from espncricinfo import timing
+
+# Seconds; fetches range from a few milliseconds (cached HTTP) to the
+# minute Playwright is allowed for a page load.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Spans that each stand for one request to a remote endpoint.
+_FETCH_PHASES = ("http_get", "goto")
+
+# Spans whose bytes were downloaded (``extract`` only re-measures content).
+_DOWNLOAD_PHASES = ("http_get", "content")
+
+_ERROR_TYPES = ("DeadlineExceededError", "MatchNotFoundError", "NoScorecardError", "NoSeriesError",
+                "PlayerNotFoundError")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter(object):
+    """A monotonically increasing value per combination of label values."""
+
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames) or '(none)'}")
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        """Add ``amount`` to the counter for ``labels``."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{"labels": dict(key), "value": value} for key, value in items]
+
+    def exposition(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(Counter):
+    """Observations counted into cumulative ``buckets``, with their sum and count."""
+
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        """Record one observation of ``value`` for ``labels``."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # One slot per bucket, then the sum
+                counts = self._values[key] = [0] * len(self.buckets) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += value
+
+    def inc(self, amount=1, **labels):
+        raise TypeError("histograms are updated with observe()")
+
+    def value(self, **labels):
+        counts = self._values.get(self._key(labels))
+        return {"count": counts[-2], "sum": counts[-1]} if counts else {"count": 0, "sum": 0.0}
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._values.items())
+        return [
+            {
+                "labels": dict(key),
+                "buckets": {_format_value(b): c for b, c in zip(self.buckets, counts)},
+                "count": counts[-2],
+                "sum": counts[-1],
+            }
+            for key, counts in items
+        ]
+
+    def exposition(self):
+        lines = []
+        for sample in self.samples():
+            labels = tuple(sample["labels"].items())
+            for bound, count in sample["buckets"].items():
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {sample['count']}")
+        return lines
+
+
+class Registry(object):
+    """A named collection of metrics, exportable as a dict or Prometheus text."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def snapshot(self):
+        """Return ``{metric name: [sample, ...]}`` with every current value."""
+        return {name: metric.samples() for name, metric in self._metrics.items()}
+
+    def to_prometheus(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.exposition())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Zero every metric."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+FETCHES = REGISTRY.counter(
+    "espncricinfo_fetches_total", "Page loads and HTTP requests made.", ("endpoint",))
+FETCH_SECONDS = REGISTRY.histogram(
+    "espncricinfo_fetch_seconds", "Latency of page loads and HTTP requests.", ("endpoint",))
+PHASE_SECONDS = REGISTRY.histogram(
+    "espncricinfo_phase_seconds", "Time spent in each fetch phase.", ("phase",))
+BYTES = REGISTRY.counter(
+    "espncricinfo_bytes_total", "Bytes downloaded.", ("endpoint",))
+CACHE_HITS = REGISTRY.counter(
+    "espncricinfo_cache_hits_total", "Cache lookups answered from the cache.", ("namespace",))
+CACHE_MISSES = REGISTRY.counter(
+    "espncricinfo_cache_misses_total", "Cache lookups that found nothing, or an expired entry.", ("namespace",))
+CACHE_EVICTIONS = REGISTRY.counter(
+    "espncricinfo_cache_evictions_total", "Entries dropped because they expired or the cache was full.",
+    ("namespace",))
+ERRORS = REGISTRY.counter(
+    "espncricinfo_errors_total", "Exceptions raised, by type.", ("type",))
+
+
+def _preset_errors():
+    # Export the library's own exceptions at zero so rate() works from the start.
+    for name in _ERROR_TYPES:
+        ERRORS.inc(0, type=name)
+
+
+_preset_errors()
+
+
+def endpoint(url):
+    """Return the endpoint label for ``url``: its host, or ``"unknown"``."""
+    return (urlsplit(url).hostname if url else None) or "unknown"
+
+
+def record_error(exc):
+    """
+    Count ``exc`` in ``espncricinfo_errors_total`` and return it, for
+    ``raise metrics.record_error(SomeError(...))``. Only for errors raised
+    outside a timing span; those ending a span are counted already.
+    """
+    ERRORS.inc(type=type(exc).__name__)
+    return exc
+
+
+def _observe_span(span):
+    if span.duration is not None:
+        PHASE_SECONDS.observe(span.duration, phase=span.name)
+    if span.error is not None:
+        ERRORS.inc(type=span.error)
+    if span.name in _FETCH_PHASES:
+        host = endpoint(span.url)
+        FETCHES.inc(endpoint=host)
+        if span.duration is not None:
+            FETCH_SECONDS.observe(span.duration, endpoint=host)
+    if span.name in _DOWNLOAD_PHASES and span.bytes:
+        BYTES.inc(span.bytes, endpoint=endpoint(span.url))
+
+
+timing.add_hook(_observe_span)
+
+
+def snapshot():
+    """Return the current value of every library metric; see :meth:`Registry.snapshot`."""
+    return REGISTRY.snapshot()
+
+
+def to_prometheus():
+    """Return every library metric in the Prometheus text exposition format."""
+    return REGISTRY.to_prometheus()
+
+
+def reset():
+    """Zero every library metric."""
+    REGISTRY.reset()
+    _preset_errors()
@@ -1,22 +1,57 @@
 import warnings
-import requests
-from bs4 import BeautifulSoup
-import dateparser
+from concurrent.futures import ThreadPoolExecutor
+from espncricinfo import cache as _cache
+from espncricinfo import hedging
+from espncricinfo import metrics
+from espncricinfo import stats
+from espncricinfo import transport
 from espncricinfo.exceptions import PlayerNotFoundError
-from espncricinfo.match import Match
-import csv
+from espncricinfo.timing import FetchStats
+
+# source name -> (attribute holding the data, method fetching it)
+_SOURCES = {
+    'html': ('parsed_html', 'get_html'),
+    'json': ('json', 'get_json'),
+    'new_json': ('new_json', 'get_new_json'),
+}
+
 
 class Player(object):
+    """
+    An ESPN Cricinfo player profile.
+
+    Profile data comes from three sources, each fetched only when first
+    needed: the core.espnuk.org athlete JSON (``json``, loaded on
+    construction since it backs most attributes), the hs-consumer-api JSON
+    (``new_json``, used by ``major_teams``) and the player page HTML
+    (``parsed_html``). Sources listed in ``preload`` are fetched
+    concurrently with the athlete JSON; :meth:`load` does the same later.
+
+    If a :class:`~espncricinfo.cache.Cache` is passed as ``cache``, the two
+    JSON sources are read from it when present and stored in it after
+    being fetched. Use :meth:`fetch_many` to resolve many players at once.
+
+    The timing of every request made for the player is kept in
+    ``fetch_stats`` (see :mod:`espncricinfo.timing`).
+
+    Example::
+
+        from espncricinfo.player import Player
 
-    def __init__(self, player_id):
+        p = Player(253802)                          # one request
+        p = Player(253802, preload=('new_json',))   # two, in parallel
+        p.major_teams
+    """
+
+    def __init__(self, player_id, preload=(), cache=None):
         self.player_id=player_id
+        self.cache = cache
+        self.fetch_stats = FetchStats()
         self.url = "https://www.espncricinfo.com/player/player-name-{0}".format(str(player_id))
         self.json_url = "http://core.espnuk.org/v2/sports/cricket/athletes/{0}".format(str(player_id))
         self.new_json_url = "https://hs-consumer-api.espncricinfo.com/v1/pages/player/home?playerId={0}".format(str(player_id))
         self.headers = {'user-agent': 'Mozilla/5.0'}
-        self.parsed_html = self.get_html() 
-        self.json = self.get_json()       
-        self.new_json = self.get_new_json()
+        self.load('json', *preload)
         self.cricinfo_id = str(player_id)
         self.__unicode__ = self._full_name()
         self.name = self._name()
@@ -27,28 +62,130 @@ class Player(object):
         self.playing_role = self._playing_role()
         self.batting_style = self._batting_style()
         self.bowling_style = self._bowling_style()
-        self.major_teams = self._major_teams()
+
+    # Lazy attributes are kept in the instance __dict__ rather than through
+    # functools.cached_property, whose lock (before Python 3.12) is shared
+    # by every Player and would make concurrent loads run one at a time.
+
+    @property
+    def parsed_html(self):
+        return self._lazy('parsed_html', self.get_html)
+
+    @property
+    def json(self):
+        return self._lazy('json', self.get_json)
+
+    @property
+    def new_json(self):
+        return self._lazy('new_json', self.get_new_json)
+
+    @property
+    def major_teams(self):
+        return self._lazy('major_teams', self._major_teams)
+
+    def _lazy(self, attr, load):
+        try:
+            return self.__dict__[attr]
+        except KeyError:
+            value = self.__dict__[attr] = load()
+            return value
+
+    def load(self, *sources):
+        """
+        Fetch the given data sources ('html', 'json', 'new_json') that are
+        not loaded yet, concurrently when there is more than one.
+        """
+        unknown = [s for s in sources if s not in _SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown player data source(s): {', '.join(unknown)}")
+        pending = []
+        for source in dict.fromkeys(sources):
+            attr, method = _SOURCES[source]
+            if attr not in self.__dict__:
+                pending.append((attr, method))
+        if len(pending) == 1:
+            getattr(self, pending[0][0])
+        elif pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = [(attr, hedging.submit(pool, getattr(self, method))) for attr, method in pending]
+                for attr, future in futures:
+                    self.__dict__[attr] = future.result()
 
     def get_html(self):
-        r = requests.get(self.url, headers=self.headers)
+        r = self._get(self.url)
         if r.status_code == 404:
-            raise PlayerNotFoundError
+            raise metrics.record_error(PlayerNotFoundError())
         else:
+            from bs4 import BeautifulSoup
             return BeautifulSoup(r.text, 'html.parser')
 
     def get_json(self):
-        r = requests.get(self.json_url, headers=self.headers)
-        if r.status_code == 404:
-            raise PlayerNotFoundError
-        else:
-            return r.json()
-        
+        return self._get_cached_json(self.json_url)
+
     def get_new_json(self):
-        r = requests.get(self.new_json_url, headers=self.headers)
+        return self._get_cached_json(self.new_json_url)
+
+    def _get_cached_json(self, url):
+        if self.cache is not None:
+            data = self.cache.get(url)
+            if data is not None:
+                return data
+        r = self._get(url)
         if r.status_code == 404:
-            raise PlayerNotFoundError
-        else:
-            return r.json()
+            raise metrics.record_error(PlayerNotFoundError())
+        data = r.json()
+        if self.cache is not None:
+            self.cache.set(url, data)
+        return data
+
+    def _get(self, url):
+        """
+        GET ``url``; a URL that answered 404 recently (see
+        :func:`espncricinfo.cache.mark_not_found`) raises PlayerNotFoundError
+        without a request.
+        """
+        if _cache.is_not_found(url):
+            raise metrics.record_error(PlayerNotFoundError())
+        r = transport.get(url, headers=self.headers, stats=self.fetch_stats)
+        if r.status_code == 404:
+            _cache.mark_not_found(url)
+        return r
+
+    @classmethod
+    def fetch_many(cls, player_ids, concurrency=8, preload=(), cache=None):
+        """
+        Construct many players concurrently.
+
+        Arguments:
+            player_ids {iterable}: Player ids; duplicates are fetched once
+            concurrency {int}: Maximum number of players fetched at a time
+            preload {tuple}: Data sources to fetch up front for each player (see :meth:`load`)
+            cache {Cache}: Profile cache, defaulting to the shared "players" cache
+                (persistent once :func:`espncricinfo.cache.configure` is given a path)
+
+        Return:
+            A list of Player objects in the order of ``player_ids``, with None
+            for ids that raised PlayerNotFoundError.
+
+        Requests go through the shared session in :mod:`espncricinfo.transport`;
+        raise its ``pool_maxsize`` to at least ``concurrency`` to keep every
+        connection alive.
+        """
+        player_ids = [str(pid) for pid in player_ids]
+        if cache is None:
+            cache = _cache.get_cache("players")
+
+        def fetch(pid):
+            try:
+                return cls(pid, preload=preload, cache=cache)
+            except PlayerNotFoundError:
+                return None
+
+        unique = list(dict.fromkeys(player_ids))
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique) or 1))) as pool:
+            futures = [hedging.submit(pool, fetch, pid) for pid in unique]
+            players = {pid: future.result() for pid, future in zip(unique, futures)}
+        return [players[pid] for pid in player_ids]
 
     def _name(self):
         return self.json['name']
@@ -131,6 +268,45 @@ class Player(object):
             "Use Match(match_id, series_id).bowlers(innings) directly."
         )
 
+    def get_stats(self, match_format=11, data_type='allround', view=None, table='results', file_name=None):
+
+        """Get one table of Player statistics from the stats engine
+
+        The engine page for a (match_format, data_type, view) combination is
+        downloaded and parsed once; other tables of the same page are then
+        served from the shared "stats" cache.
+
+        Arguements:
+            match_format {int}: Match format (default is 11) (1-Test), (2-Odi) (3-T20I), (11-All International), (20-Youth Tests), (21-Youth ODI)
+            data_type {string}: Data type (default is allround) (allround, batting, bowling, fielding)
+            view {string}: View type (default is None) (match, innings, cumulative, reverse_cumulative, series, tour, ground)
+            table {string}: Table to return (default is results) (averages, results)
+            file_name {string}: Optional file name to also save the table as csv
+
+        Return:
+            StatsTable of typed rows
+        """
+        self.stats_url = stats.stats_url(self.player_id, match_format, data_type, view)
+        result = stats.get_table(self.player_id, table, match_format, data_type, view)
+        if file_name is not None:
+            result.to_csv(file_name)
+        return result
+
+    def iter_stats(self, match_format=11, data_type='allround', view='innings', concurrency=4):
+
+        """Stream Player statistics row by row across every page of a view
+
+        Arguements:
+            match_format {int}: Match format (default is 11) (1-Test), (2-Odi) (3-T20I), (11-All International), (20-Youth Tests), (21-Youth ODI)
+            data_type {string}: Data type (default is allround) (allround, batting, bowling, fielding)
+            view {string}: View type (default is innings) (match, innings, cumulative, reverse_cumulative, series, tour, ground)
+            concurrency {int}: Maximum number of pages fetched ahead (default is 4)
+
+        Return:
+            Iterator of typed rows
+        """
+        return stats.iter_rows(self.player_id, match_format, data_type, view, concurrency=concurrency)
+
     def get_career_averages(self, file_name=None, match_format=11, data_type='allround') :
 
         """Get Player career averages
@@ -141,7 +317,7 @@ class Player(object):
             data_type {string}: Data type (default is allround) (allround, batting, bowling, fielding)
         
         Return:
-            Data in csv file
+            StatsTable of typed rows, also written to the csv file
         """
         self.match_format = match_format
         self.data_type = data_type
@@ -150,22 +326,11 @@ class Player(object):
         if self.file_name is None:
             self.file_name = f"{self.player_id}_{self.match_format}_{self.data_type}_career_averages.csv"
 
-        self.url=f"https://stats.espncricinfo.com/ci/engine/player/{self.player_id}.html?class={self.match_format};template=results;type={self.data_type}"
-        html_doc = requests.get(self.url, headers=self.headers)
-        soup = BeautifulSoup(html_doc.text, 'html.parser')
-        tables = soup.find_all("table")[2]
-        table_rows = tables.find_all("tr")
-        scores =[]
-        for tr in table_rows:
-            scores.append(tr.text)
-        with open(self.file_name, "w") as csv_file:
-            writer = csv.writer(csv_file, delimiter=',')
-            for row in scores:
-                    writer.writerow(row.splitlines()) 
+        return self.get_stats(self.match_format, self.data_type, table='averages', file_name=self.file_name)
     
     def get_career_summary(self, file_name=None, match_format=11, data_type='allround'):
         
-        """Get Player data match by match sorted by date
+        """Get Player career summary
 
         Arguements:
             file_name {string}: File name to save data
@@ -173,7 +338,7 @@ class Player(object):
             data_type {string}: Data type (default is allround) (allround, batting, bowling, fielding)
         
         Return:
-            Data in csv file
+            StatsTable of typed rows, also written to the csv file
         """
         self.match_format = match_format
         self.data_type = data_type
@@ -182,18 +347,7 @@ class Player(object):
         if self.file_name is None:
             self.file_name = f"{self.player_id}_{self.match_format}_{self.data_type}_career_summary.csv"
 
-        self.url=f"https://stats.espncricinfo.com/ci/engine/player/{self.player_id}.html?class={self.match_format};template=results;type={self.data_type}"
-        html_doc = requests.get(self.url, headers=self.headers)
-        soup = BeautifulSoup(html_doc.text, 'html.parser')
-        tables = soup.find_all("table")[3]
-        table_rows = tables.find_all("tr")
-        scores =[]
-        for tr in table_rows:
-            scores.append(tr.text)
-        with open(self.file_name, "w") as csv_file:
-            writer = csv.writer(csv_file, delimiter=',')
-            for row in scores:
-                    writer.writerow(row.splitlines())
+        return self.get_stats(self.match_format, self.data_type, table='results', file_name=self.file_name)
 
     def get_data(self, file_name=None, match_format=11, data_type='allround', view='match'):
 
@@ -206,7 +360,7 @@ class Player(object):
             view {string}: View type (default is match) (match, innings, cumulative, reverse_cumulative, series, tour, ground)
         
         Return:
-            Data in csv file
+            StatsTable of typed rows, also written to the csv file
         """
         self.match_format = match_format
         self.data_type = data_type
@@ -216,15 +370,4 @@ class Player(object):
         if self.file_name is None:
             self.file_name = f"{self.player_id}_{self.match_format}_{self.data_type}_{self.view}.csv"
 
-        self.url=f"https://stats.espncricinfo.com/ci/engine/player/{self.player_id}.html?class={self.match_format};template=results;type={self.data_type};view={self.view}"
-        html_doc = requests.get(self.url, headers=self.headers())
-        soup = BeautifulSoup(html_doc.text, 'html.parser')
-        tables = soup.find_all("table")[3]
-        table_rows = tables.find_all("tr")
-        scores =[]
-        for tr in table_rows:
-            scores.append(tr.text)
-        with open(self.file_name, "w") as csv_file:
-            writer = csv.writer(csv_file, delimiter=',')
-            for row in scores:
-                    writer.writerow(row.splitlines())
\ No newline at end of file
+        return self.get_stats(self.match_format, self.data_type, self.view, table='results', file_name=self.file_name)
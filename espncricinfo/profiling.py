@@ -0,0 +1,142 @@
+"""
+Memory profiling for :class:`~espncricinfo.match.Match` objects.
+
+:func:`match_memory` walks a match and reports how many bytes each part
+of it holds: the raw ``_content`` and ``_match`` documents kept from
+``__NEXT_DATA__``, the normalised ``innings`` and ``team`` lists, the rest
+of ``json`` and the attributes derived from it. An object reachable from
+several parts is counted once, under the first part listed in
+:data:`MATCH_COMPONENTS`, so the parts add up to the whole.
+
+:func:`profile_match` also builds the match under :mod:`tracemalloc` and
+reports the memory still allocated once it exists (everything the page
+fetch allocated that the match keeps alive) and the peak reached while
+building it.
+
+Example::
+
+    from espncricinfo import profiling
+    from espncricinfo.match import Match
+
+    report = profiling.profile_match(lambda: Match(1478914, 1478874))
+    print(report.format())
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+# Keys of Match.json reported on their own, in attribution order.
+MATCH_COMPONENTS = ("_content", "_match", "innings", "team")
+
+
+@dataclass
+class MemoryReport:
+    """
+    Bytes held by a match, per component (``components``), plus, when
+    measured with :func:`profile_match`, the ``retained`` and ``peak``
+    bytes traced by :mod:`tracemalloc`.
+    """
+
+    components: dict = field(default_factory=dict)
+    retained: int = None
+    peak: int = None
+
+    @property
+    def total(self):
+        return sum(self.components.values())
+
+    def as_dict(self):
+        return {
+            "components": dict(self.components),
+            "total": self.total,
+            "retained": self.retained,
+            "peak": self.peak,
+        }
+
+    def format(self):
+        lines = [f"{name:<12}{size / 1024:>12,.1f} KiB" for name, size in self.components.items()]
+        lines.append(f"{'total':<12}{self.total / 1024:>12,.1f} KiB")
+        if self.retained is not None:
+            lines.append(f"{'retained':<12}{self.retained / 1024:>12,.1f} KiB (tracemalloc)")
+        if self.peak is not None:
+            lines.append(f"{'peak':<12}{self.peak / 1024:>12,.1f} KiB (tracemalloc)")
+        return "\n".join(lines)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Return the bytes used by ``obj`` and everything reachable from it
+    through containers and instance attributes, skipping objects whose id
+    is in ``seen`` (which is updated). Classes, functions and modules are
+    not followed.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, type(sys), type(deep_sizeof))):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float, bool)):
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return size
+
+
+def match_memory(match):
+    """Return a :class:`MemoryReport` of the bytes held by each part of ``match``."""
+    seen = set()
+    # The containers themselves are accounted to the match, not a component.
+    seen.update((id(match), id(match.__dict__), id(match.json)))
+    components = {}
+    for key in MATCH_COMPONENTS:
+        components[key] = deep_sizeof(match.json.get(key), seen)
+    rest = {k: v for k, v in match.json.items() if k not in MATCH_COMPONENTS}
+    components["json (other)"] = deep_sizeof(rest, seen) - sys.getsizeof(rest)
+    derived = {k: v for k, v in match.__dict__.items() if k != "json"}
+    components["derived"] = (
+        deep_sizeof(derived, seen) - sys.getsizeof(derived)
+        + sys.getsizeof(match) + sys.getsizeof(match.__dict__) + sys.getsizeof(match.json)
+    )
+    return MemoryReport(components=components)
+
+
+def profile_match(factory):
+    """
+    Build a match by calling ``factory()`` under :mod:`tracemalloc` and
+    return its :class:`MemoryReport`, with ``retained`` and ``peak``
+    filled in.
+
+    ``retained`` is the memory allocated during the call that is still in
+    use afterwards; to be meaningful the factory must fetch (or copy) the
+    page data itself rather than reuse data allocated beforehand.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        match = factory()
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    report = match_memory(match)
+    report.retained = after - before
+    report.peak = peak - before
+    return report
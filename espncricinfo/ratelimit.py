@@ -0,0 +1,200 @@
+"""
+Rate limiting and adaptive concurrency for python-espncricinfo's fetches.
+
+A :class:`TokenBucket` spaces requests out to a steady rate with bursts of
+up to ``burst`` requests. It is shared by every thread of the process, and
+by every process using the same ``path``: the bucket's state then lives in
+that file, guarded by an exclusive file lock.
+
+An :class:`AdaptiveLimiter` bounds the number of fetches in flight and
+looks for the highest concurrency the site tolerates by additive increase,
+multiplicative decrease (AIMD): each successful fetch raises the limit by
+``1 / limit`` (about one per round of requests), while a throttling
+response (403 or 429), a timeout or a response slower than ``slow`` seconds
+cuts it by ``backoff``.
+
+Both are used for every HTTP request and Playwright page load once they are
+enabled with :func:`espncricinfo.transport.configure`::
+
+    from espncricinfo import transport
+
+    transport.configure(rate=2, burst=4, rate_file="/tmp/espncricinfo.rate")
+    transport.configure(adaptive=True, max_concurrency=16, slow_response=10)
+"""
+import os
+import struct
+import threading
+import time
+
+from espncricinfo.exceptions import DeadlineExceededError
+
+# Outcomes of a fetch, as seen by AdaptiveLimiter
+OK = "ok"
+THROTTLED = "throttled"
+ERROR = "error"
+
+# Responses Akamai and the API send when a client is going too fast.
+THROTTLE_STATUSES = (403, 429)
+
+_STATE = struct.Struct("<dd")
+
+
+def is_timeout(exc):
+    """Return True if ``exc`` is a timeout of any of the fetch backends."""
+    # requests.Timeout, urllib3 and Playwright's TimeoutError, socket.timeout
+    return isinstance(exc, TimeoutError) or "Timeout" in type(exc).__name__
+
+
+def classify(status=None, exc=None):
+    """
+    Return the outcome (OK, THROTTLED or ERROR) of a fetch that returned
+    ``status`` and/or raised ``exc``.
+    """
+    if isinstance(exc, DeadlineExceededError):
+        # Our own budget ran out; says nothing about the site.
+        return ERROR
+    if status in THROTTLE_STATUSES:
+        return THROTTLED
+    if exc is not None:
+        if is_timeout(exc):
+            return THROTTLED
+        return ERROR
+    return OK
+
+
+class TokenBucket(object):
+    """
+    Allows ``rate`` requests per second on average, and up to ``burst``
+    (default: ``max(1, rate)``) at once after a quiet period.
+
+    With ``path`` the bucket is kept in that file and shared with every
+    process that opens the same path (POSIX only).
+    """
+
+    def __init__(self, rate, burst=None, path=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, self.rate))
+        self.path = os.path.expanduser(path) if path else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(rate={self.rate!r}, burst={self.burst!r}, path={self.path!r})"
+
+    def acquire(self, tokens=1, timeout=None):
+        """
+        Take ``tokens``, sleeping until the bucket has refilled enough to
+        cover them.
+
+        Return:
+            The seconds slept, or None (taking nothing) if the wait would
+            be longer than ``timeout``.
+        """
+        wait = self.reserve(tokens, timeout)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self, tokens=1, timeout=None):
+        """
+        Take ``tokens`` without sleeping, for callers that wait in their
+        own way (e.g. ``await asyncio.sleep``).
+
+        Return:
+            The seconds to wait before using the tokens, or None (taking
+            nothing) if that would be longer than ``timeout``.
+        """
+        if self.path:
+            return self._reserve_shared(tokens, timeout)
+        with self._lock:
+            self._tokens, self._updated, wait = self._reserve(
+                self._tokens, self._updated, time.monotonic(), tokens, timeout
+            )
+        return wait
+
+    def _reserve(self, level, updated, now, tokens, timeout):
+        # Tokens are taken at once and the level may go negative: callers
+        # queue up behind each other by sleeping off the deficit.
+        level = min(self.burst, level + max(0.0, now - updated) * self.rate)
+        wait = max(0.0, (tokens - level) / self.rate)
+        if timeout is not None and wait > timeout:
+            return level, now, None
+        return level - tokens, now, wait
+
+    def _reserve_shared(self, tokens, timeout):
+        # Imported here: fcntl only exists on POSIX systems.
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                level, updated = _STATE.unpack(os.pread(fd, _STATE.size, 0))
+            except struct.error:
+                level, updated = self.burst, now
+            level, updated, wait = self._reserve(level, updated, now, tokens, timeout)
+            os.pwrite(fd, _STATE.pack(level, updated), 0)
+        finally:
+            os.close(fd)
+        return wait
+
+
+class Slot(object):
+    """A fetch admitted by :func:`espncricinfo.transport.limited`; set ``status`` to the response status."""
+
+    __slots__ = ("started", "status")
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.status = None
+
+
+class AdaptiveLimiter(object):
+    """
+    Lets at most ``limit`` fetches run at once, adjusting ``limit`` between
+    ``minimum`` and ``maximum`` from the outcome of each fetch (see the
+    module docstring). Only one decrease is applied per round of requests:
+    fetches that started before the last decrease do not cut the limit
+    again.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, backoff=0.5, slow=None):
+        if not 1 <= minimum <= maximum:
+            raise ValueError("need 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.slow = slow
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._decreased = float("-inf")
+        self._cond = threading.Condition()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(limit={self.limit:.2f}, in_flight={self.in_flight})"
+
+    def acquire(self, timeout=None):
+        """Wait until fewer than ``limit`` fetches are running; return False on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, slot, outcome):
+        """Finish the fetch admitted as ``slot`` with ``outcome`` and adjust the limit."""
+        now = time.monotonic()
+        with self._cond:
+            self.in_flight -= 1
+            slow = self.slow is not None and now - slot.started > self.slow
+            if outcome == THROTTLED or (outcome == OK and slow):
+                if slot.started >= self._decreased:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._decreased = now
+            elif outcome == OK:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
@@ -0,0 +1,196 @@
+"""
+Record the requests made by python-espncricinfo and replay them in-process.
+
+While :func:`record` is active every HTTP response and every page loaded
+with Playwright (match pages, the results page, player, series and
+statistics documents) is captured; on exit they are written to an archive
+file. :func:`replay` serves an archive back without network access or a
+browser, so a real workload can be re-run reproducibly, for example to
+benchmark it. Replayed responses still go through the library's parsing,
+timing and metrics.
+
+Archives are JSON Lines files, gzip-compressed when the name ends in
+``.gz``. A URL requested several times is stored once, with its last
+response.
+
+Example::
+
+    from espncricinfo import replay
+    from espncricinfo.match import Match
+
+    with replay.record("workload.jsonl.gz"):
+        Match(1478914, 1478874)
+
+    with replay.replay("workload.jsonl.gz"):
+        Match(1478914, 1478874)     # no network, no browser
+"""
+import base64
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from espncricinfo import metrics
+from espncricinfo import transport
+from espncricinfo.exceptions import MatchNotFoundError, ReplayMissError
+
+# Kinds of recorded exchange
+HTTP = "http"
+PAGE = "page"
+
+
+def _open(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Archive(object):
+    """Recorded responses keyed by ``(kind, url)``."""
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, kind, url, status, body, headers=None):
+        """Store a response; ``body`` is text, or bytes that are kept base64 encoded if not UTF-8."""
+        entry = {"kind": kind, "url": url, "status": status, "headers": dict(headers or {})}
+        if isinstance(body, bytes):
+            try:
+                entry["text"] = body.decode("utf-8")
+            except UnicodeDecodeError:
+                entry["base64"] = base64.b64encode(body).decode("ascii")
+        else:
+            entry["text"] = body
+        with self._lock:
+            self.entries[(kind, url)] = entry
+
+    def get(self, kind, url):
+        """Return the entry recorded for ``url``; raises ReplayMissError if there is none."""
+        try:
+            return self.entries[(kind, url)]
+        except KeyError:
+            raise ReplayMissError(f"No recorded {kind} response for {url}") from None
+
+    @staticmethod
+    def body(entry):
+        """Return the bytes of a recorded response."""
+        if "base64" in entry:
+            return base64.b64decode(entry["base64"])
+        return entry["text"].encode("utf-8")
+
+    def save(self, path):
+        with _open(path, "w") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        entries = {}
+        with _open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[(entry["kind"], entry["url"])] = entry
+        return cls(entries)
+
+
+class Recorder(object):
+    """A transport backend that fetches for real and stores what it gets in ``archive``."""
+
+    def __init__(self, archive=None):
+        self.archive = archive if archive is not None else Archive()
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        r = transport.session_get(url, headers=headers, timeout=timeout, **kwargs)
+        content_type = r.headers.get("Content-Type")
+        self.archive.add(HTTP, url, r.status_code, r.content,
+                         {"Content-Type": content_type} if content_type else None)
+        return r
+
+    def load_page(self, url, stats, load):
+        try:
+            content = load(url, stats)
+        except MatchNotFoundError:
+            self.archive.add(PAGE, url, 404, "")
+            raise
+        self.archive.add(PAGE, url, 200, content)
+        return content
+
+
+class Replayer(object):
+    """A transport backend answering every request from ``archive``."""
+
+    def __init__(self, archive):
+        self.archive = archive
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        # requests is imported here, like in transport, to keep imports fast.
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        entry = self.archive.get(HTTP, url)
+        r = requests.Response()
+        r.status_code = entry["status"]
+        r.headers = CaseInsensitiveDict(entry["headers"])
+        r._content = Archive.body(entry)
+        r.encoding = "utf-8"
+        r.url = url
+        return r
+
+    def load_page(self, url, stats, load):
+        entry = self.archive.get(PAGE, url)
+        with stats.span("goto", url) as span:
+            span.status = entry["status"]
+        if entry["status"] == 404:
+            raise metrics.record_error(MatchNotFoundError(f"Match not found at {url}"))
+        with stats.span("content", url) as span:
+            content = entry["text"]
+            span.bytes = len(content.encode("utf-8"))
+        return content
+
+
+@contextmanager
+def _installed(backend):
+    previous = transport.set_backend(backend)
+    try:
+        yield backend
+    finally:
+        transport.set_backend(previous)
+
+
+@contextmanager
+def record(path=None, append=False):
+    """
+    Record every request made in the block; yields the :class:`Recorder`.
+
+    The archive is written to ``path`` (if given) on exit, adding to the
+    responses already in it with ``append``.
+    """
+    archive = Archive.load(path) if append and path and os.path.exists(path) else Archive()
+    with _installed(Recorder(archive)) as recorder:
+        try:
+            yield recorder
+        finally:
+            if path:
+                archive.save(path)
+
+
+@contextmanager
+def replay(archive):
+    """
+    Answer every request made in the block from ``archive`` (an
+    :class:`Archive` or a path); yields the :class:`Replayer`. Requests
+    missing from the archive raise ReplayMissError.
+    """
+    if not isinstance(archive, Archive):
+        archive = Archive.load(archive)
+    with _installed(Replayer(archive)) as replayer:
+        yield replayer
@@ -1,18 +1,59 @@
-import requests
-from bs4 import BeautifulSoup
+import re
+from concurrent.futures import ThreadPoolExecutor
+from espncricinfo import cache as _cache
+from espncricinfo import hedging
+from espncricinfo import metrics
+from espncricinfo import transport
 from espncricinfo.exceptions import MatchNotFoundError, NoSeriesError
+from espncricinfo.match_ref import MatchRef
+from espncricinfo.timing import FetchStats
+
+_EVENT_REF_RE = re.compile(r"/leagues/(\d+)/events/(\d+)")
+
 
 class Series(object):
+    """
+    An ESPN Cricinfo series (league) from core.espnuk.org.
+
+    Only the league document is fetched on construction. ``seasons``,
+    ``years``, ``events_json``, ``event_refs`` and ``events`` are loaded
+    on first access, following every page of the core.espnuk.org listing.
+    To stream a large competition with bounded memory use
+    :meth:`iter_events` and :meth:`iter_seasons`, which fetch one page at a
+    time and prefetch the next page while the current one is consumed.
+
+    ``events`` holds the full JSON of every event in the series. The event
+    documents are fetched concurrently with up to ``max_workers`` requests
+    in flight, keeping the order of the series' event list. Pass
+    ``expand_events=False`` to skip those requests; ``events`` then holds
+    the same :class:`~espncricinfo.match_ref.MatchRef` objects as
+    ``event_refs``.
+
+    The timing of every request made for the series is kept in
+    ``fetch_stats`` (see :mod:`espncricinfo.timing`).
+
+    Example::
+
+        from espncricinfo.series import Series
+
+        s = Series(1478874, expand_events=False)
+        for ref in s.event_refs:
+            print(ref.match_id)
 
-    def __init__(self, series_id):
+        for event in Series(8048).iter_events():
+            print(event["name"])
+    """
+
+    def __init__(self, series_id, expand_events=True, max_workers=8):
         self.series_id = series_id
+        self.expand_events = expand_events
+        self.max_workers = max_workers
         self.json_url = "http://core.espnuk.org/v2/sports/cricket/leagues/{0}/".format(str(series_id))
         self.events_url = "http://core.espnuk.org/v2/sports/cricket/leagues/{0}/events".format(str(series_id))
         self.seasons_url = "http://core.espnuk.org/v2/sports/cricket/leagues/{0}/seasons".format(str(series_id))
         self.headers = {'user-agent': 'Mozilla/5.0'}
+        self.fetch_stats = FetchStats()
         self.json = self.get_json(self.json_url)
-        self.seasons = self._get_seasons()
-        self.years = self._get_years_from_seasons()
         if self.json:
             self.name = self.json['name']
             self.short_name = self.json['shortName']
@@ -20,15 +61,14 @@ class Series(object):
             self.slug = self.json['slug']
             self.is_tournament = self.json['isTournament']
             self.url = self.json['links'][0]['href']
-            self.events_json = self._get_events()
-
-        if self.events_json:
-            self.events = self._build_events()
 
     def get_json(self, url):
-        r = requests.get(url,headers=self.headers)
+        if _cache.is_not_found(url):
+            raise metrics.record_error(NoSeriesError("Series not found"))
+        r = transport.get(url,headers=self.headers, stats=self.fetch_stats)
         if r.status_code == 404:
-            raise NoSeriesError("Series not found")
+            _cache.mark_not_found(url)
+            raise metrics.record_error(NoSeriesError("Series not found"))
         else:
             return r.json()
 
@@ -38,25 +78,121 @@ class Series(object):
     def __unicode__(self):
         return self.name
 
+    # ------------------------------------------------------------------
+    # Lazily loaded listings
+    # ------------------------------------------------------------------
+
+    # Kept in the instance __dict__ rather than through
+    # functools.cached_property, whose lock (before Python 3.12) is shared
+    # by every Series and would make concurrent loads run one at a time.
+
+    @property
+    def seasons(self):
+        return self._lazy('seasons', self._get_seasons)
+
+    @property
+    def years(self):
+        return self._lazy('years', self._get_years_from_seasons)
+
+    @property
+    def events_json(self):
+        return self._lazy('events_json', self._get_events)
+
+    @property
+    def event_refs(self):
+        return self._lazy('event_refs', self._event_refs)
+
+    @property
+    def events(self):
+        if self.expand_events:
+            return self._lazy('events', self._build_events)
+        return self.event_refs
+
+    def _lazy(self, attr, load):
+        try:
+            return self.__dict__[attr]
+        except KeyError:
+            value = self.__dict__[attr] = load()
+            return value
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def iter_seasons(self):
+        """Yield the ``$ref`` URL of each season, one listing page at a time."""
+        for item in self._iter_items(self.seasons_url):
+            yield item['$ref']
+
+    def iter_events(self, expand=None):
+        """
+        Yield the events of the series in listing order, one page at a time.
+
+        With ``expand`` (defaulting to ``expand_events``) each event's full
+        JSON is yielded, the events of a page being fetched concurrently;
+        otherwise :class:`~espncricinfo.match_ref.MatchRef` objects are
+        yielded without further requests.
+        """
+        if expand is None:
+            expand = self.expand_events
+        for page in self._iter_pages(self.events_url):
+            items = page.get('items', [])
+            if expand:
+                yield from self._build_events(items)
+            else:
+                yield from self._event_refs(items)
+
+    def _iter_pages(self, url):
+        """
+        Yield each page of a core.espnuk.org listing, following
+        ``pageIndex``/``pageCount``. The next page is requested in the
+        background while the caller consumes the current one.
+        """
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            page = self.get_json(url)
+            while page:
+                index = page.get('pageIndex', 1)
+                count = page.get('pageCount', 1)
+                upcoming = None
+                if index < count:
+                    upcoming = hedging.submit(pool, self.get_json, _page_url(url, index + 1))
+                yield page
+                page = upcoming.result() if upcoming else None
+
+    def _iter_items(self, url):
+        for page in self._iter_pages(url):
+            yield from page.get('items', [])
+
     def _get_seasons(self):
-        season_json = self.get_json(self.seasons_url)
-        if season_json:
-            return [x['$ref'] for x in season_json['items']]
-        else:
-            return None
+        return list(self.iter_seasons())
 
     def _get_years_from_seasons(self):
         return [x.split('/')[9] for x in self.seasons]
 
     def _get_events(self):
-        events_json = self.get_json(self.events_url)
-        if events_json:
-            return [x for x in events_json['items']]
-        else:
-            return None
+        return list(self._iter_items(self.events_url))
+
+    def _event_refs(self, events_json=None):
+        if events_json is None:
+            events_json = self.events_json
+        refs = []
+        for event in events_json or []:
+            m = _EVENT_REF_RE.search(event['$ref'])
+            if m:
+                refs.append(MatchRef(series_id=m.group(1), match_id=m.group(2)))
+        return refs
+
+    def _build_events(self, events_json=None):
+        if events_json is None:
+            events_json = self.events_json
+        urls = [event['$ref'] for event in events_json or []]
+        if len(urls) <= 1 or self.max_workers <= 1:
+            return [self.get_json(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            futures = [hedging.submit(pool, self.get_json, url) for url in urls]
+            return [future.result() for future in futures]
+
 
-    def _build_events(self):
-        events = []
-        for event in self.events_json:
-            events.append(self.get_json(event['$ref']))
-        return events
+def _page_url(url, page):
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}page={page}"
@@ -0,0 +1,357 @@
+"""
+Player career statistics from the stats.espncricinfo.com engine pages.
+
+A (format, type, view) page is downloaded once and its tables parsed once
+with lxml into :class:`StatsTable` objects holding typed rows. Parsed
+tables are kept in the shared ``"stats"`` cache (see
+:mod:`espncricinfo.cache`), so the career averages and career summary of a
+player come from a single request.
+
+Example::
+
+    from espncricinfo import stats
+
+    tables = stats.get_tables(253802, match_format=1, data_type="batting")
+    for row in tables["averages"]:
+        print(row["Runs"], row["Ave"])
+    tables["results"].to_csv("kohli_tests.csv")
+
+Views that span several pages (match, innings, series, ground... lists for
+long careers) can be streamed row by row with :func:`iter_rows`, and
+:func:`export` writes the same table for many players into one file.
+
+Parsing is CPU-bound and holds the GIL, so fetching on more threads stops
+helping once responses arrive. The functions above accept an ``executor``
+(typically a :class:`concurrent.futures.ProcessPoolExecutor`) to run the
+parsing in other processes; :func:`export` can create one with
+``processes=N``.
+"""
+import csv
+import json
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from espncricinfo import cache as _cache
+from espncricinfo import hedging
+from espncricinfo import metrics
+from espncricinfo import transport
+from espncricinfo.exceptions import PlayerNotFoundError
+
+# Position of each table among the <table> elements of an engine page.
+# "results" is the career summary, or one row per match, innings, series...
+# when a view is requested.
+TABLES = {
+    "averages": 2,
+    "results": 3,
+}
+
+# "Page 1 of 12", possibly with the numbers wrapped in tags
+_PAGE_COUNT_RE = re.compile(
+    r"Page\s*(?:<[^>]+>\s*)*(\d+)\s*(?:<[^>]+>\s*)*of\s*(?:<[^>]+>\s*)*(\d+)"
+)
+_INT_RE = re.compile(r"^-?\d+$")
+_FLOAT_RE = re.compile(r"^-?\d*\.\d+$")
+
+
+@dataclass
+class StatsTable:
+    """
+    One parsed statistics table.
+
+    ``columns`` are the header labels (blank headers become ``column_<n>``,
+    repeated ones get a ``_<n>`` suffix) and ``rows`` a list of dicts keyed
+    by them. Whole numbers are ints, decimals floats, ``-`` is None and
+    anything else (``183*``, ``2008-2024``) stays a string.
+    """
+
+    columns: list = field(default_factory=list)
+    rows: list = field(default_factory=list)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def to_dict(self):
+        return {"columns": list(self.columns), "rows": [dict(r) for r in self.rows]}
+
+    @classmethod
+    def from_dict(cls, d):
+        # Rows are copied so that a table from the in-memory cache can be
+        # changed without changing the cached entry.
+        return cls(columns=list(d["columns"]), rows=[dict(r) for r in d["rows"]])
+
+    def to_csv(self, file_name):
+        """Write the table, with a header row, to ``file_name``."""
+        with open(file_name, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=self.columns, delimiter=',')
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+
+def stats_url(player_id, match_format=11, data_type="allround", view=None, page=1):
+    """Return the engine page URL for a player, format, data type, optional view and page."""
+    url = (
+        f"https://stats.espncricinfo.com/ci/engine/player/{player_id}.html"
+        f"?class={match_format};template=results;type={data_type}"
+    )
+    if view:
+        url += f";view={view}"
+    if page > 1:
+        url += f";page={page}"
+    return url
+
+
+def page_count(html):
+    """Return the number of pages an engine listing spans (1 if it is not paginated)."""
+    m = _PAGE_COUNT_RE.search(html)
+    return int(m.group(2)) if m else 1
+
+
+def fetch_page(url):
+    """Download an engine page over the shared session; raises PlayerNotFoundError on 404."""
+    r = transport.get(url, headers=transport.DEFAULT_HEADERS)
+    if r.status_code == 404:
+        raise metrics.record_error(PlayerNotFoundError())
+    return r.text
+
+
+def _convert(text):
+    if text in ("", "-"):
+        return None
+    if _INT_RE.match(text):
+        return int(text)
+    if _FLOAT_RE.match(text):
+        return float(text)
+    return text
+
+
+def _cell_text(cell):
+    return " ".join(cell.text_content().split())
+
+
+def _columns(header_cells):
+    columns = []
+    for i, cell in enumerate(header_cells):
+        name = _cell_text(cell) or f"column_{i}"
+        if name in columns:
+            n = 2
+            while f"{name}_{n}" in columns:
+                n += 1
+            name = f"{name}_{n}"
+        columns.append(name)
+    return columns
+
+
+def _parse_table(table):
+    columns = []
+    rows = []
+    for tr in table.iterfind(".//tr"):
+        cells = tr.xpath("./th|./td")
+        if not cells:
+            continue
+        if not columns and tr.find("td") is None:
+            columns = _columns(cells)
+            continue
+        if not columns:
+            columns = [f"column_{i}" for i in range(len(cells))]
+        rows.append({
+            name: _convert(_cell_text(cell)) for name, cell in zip(columns, cells)
+        })
+    return StatsTable(columns=columns, rows=rows)
+
+
+def parse_tables(html, tables=None):
+    """
+    Parse the named tables of an engine page.
+
+    ``tables`` maps names to table positions and defaults to :data:`TABLES`.
+    Tables missing from the page are returned empty.
+    """
+    if tables is None:
+        tables = TABLES
+    import lxml.html
+
+    doc = lxml.html.document_fromstring(html)
+    elements = doc.xpath("//table")
+    return {
+        name: _parse_table(elements[index]) if index < len(elements) else StatsTable()
+        for name, index in tables.items()
+    }
+
+
+def _parse_page(html, tables):
+    """Parse ``tables`` and the page count; a top-level function so it can run in a worker process."""
+    return parse_tables(html, tables), page_count(html)
+
+
+def _parse(html, tables, executor=None):
+    if executor is None:
+        return _parse_page(html, tables)
+    return executor.submit(_parse_page, html, tables).result()
+
+
+def get_tables(player_id, match_format=11, data_type="allround", view=None, cache=None, executor=None):
+    """
+    Return the parsed tables of a player's engine page as ``{name: StatsTable}``.
+
+    The page is fetched over the shared session unless already in ``cache``
+    (defaulting to the shared ``"stats"`` cache), and parsed in ``executor``
+    if one is given. Raises PlayerNotFoundError on 404.
+    """
+    if cache is None:
+        cache = _cache.get_cache("stats")
+    url = stats_url(player_id, match_format, data_type, view)
+    cached = cache.get(url)
+    if cached is not None:
+        return {name: StatsTable.from_dict(t) for name, t in cached.items()}
+    tables, _ = _parse(fetch_page(url), TABLES, executor)
+    cache.set(url, {name: t.to_dict() for name, t in tables.items()})
+    return tables
+
+
+def get_table(player_id, table="results", match_format=11, data_type="allround", view=None, cache=None, executor=None):
+    """Return a single named table; see :func:`get_tables`."""
+    if table not in TABLES:
+        raise ValueError(f"Unknown stats table {table!r}; expected one of {', '.join(TABLES)}")
+    return get_tables(player_id, match_format, data_type, view, cache, executor)[table]
+
+
+def _fetch_table(url, table, executor=None):
+    tables, pages = _parse(fetch_page(url), {table: TABLES[table]}, executor)
+    return tables[table], pages
+
+
+def iter_rows(player_id, match_format=11, data_type="allround", view="innings", table="results",
+              concurrency=4, executor=None):
+    """
+    Yield the rows of a possibly paginated engine listing in page order.
+
+    The first page tells how many pages there are; the rest are fetched and
+    parsed concurrently, at most ``concurrency`` pages ahead of the rows
+    being consumed, so only a bounded number of pages is held in memory.
+    Pages are not cached. Parsing runs in ``executor`` if one is given.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown stats table {table!r}; expected one of {', '.join(TABLES)}")
+    first, pages = _fetch_table(stats_url(player_id, match_format, data_type, view), table, executor)
+    yield from first.rows
+    if pages <= 1:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        upcoming = deque()
+        next_page = 2
+
+        def submit():
+            nonlocal next_page
+            url = stats_url(player_id, match_format, data_type, view, next_page)
+            upcoming.append(hedging.submit(pool, _fetch_table, url, table, executor))
+            next_page += 1
+
+        while next_page <= pages and len(upcoming) < max(1, concurrency):
+            submit()
+        while upcoming:
+            result, _ = upcoming.popleft().result()
+            if next_page <= pages:
+                submit()
+            yield from result.rows
+
+
+def _player_rows(player_id, table, match_format, data_type, view, executor=None):
+    if view:
+        return list(iter_rows(player_id, match_format, data_type, view, table, concurrency=1, executor=executor))
+    return get_table(player_id, table, match_format, data_type, executor=executor).rows
+
+
+class _CSVSink(object):
+    """Write rows as CSV; the header is fixed by the first row written."""
+
+    def __init__(self, f):
+        self.f = f
+        self.writer = None
+
+    def write(self, row):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.f, fieldnames=list(row), extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+
+class _JSONLinesSink(object):
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, row):
+        self.f.write(json.dumps(row) + "\n")
+
+
+def export(player_ids, file_name, table="averages", match_format=11, data_type="allround", view=None,
+           workers=8, processes=None):
+    """
+    Write one statistics table for many players into a single file.
+
+    Players are fetched by a pool of ``workers`` threads and each player's
+    rows are written as soon as they arrive, prefixed with a ``player_id``
+    column; at most ``2 * workers`` players are in flight at once. With a
+    ``view`` every page of the listing is included.
+
+    Files ending in ``.jsonl`` are written as JSON Lines, anything else as
+    CSV. CSV columns are fixed by the first row written, so mixing tables
+    with different columns in one CSV drops the extra ones.
+
+    With ``processes`` the pages are parsed by a pool of that many worker
+    processes while the ``workers`` threads keep fetching.
+
+    Return:
+        dict with the number of ``players`` and ``rows`` written and the
+        ``missing`` player ids that raised PlayerNotFoundError
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown stats table {table!r}; expected one of {', '.join(TABLES)}")
+    player_ids = list(dict.fromkeys(player_ids))
+    summary = {"players": 0, "rows": 0, "missing": []}
+    executor = None
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=processes)
+    try:
+        _export(player_ids, file_name, table, match_format, data_type, view, workers, executor, summary)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return summary
+
+
+def _export(player_ids, file_name, table, match_format, data_type, view, workers, executor, summary):
+    with open(file_name, "w", newline="") as f:
+        sink = _JSONLinesSink(f) if str(file_name).endswith(".jsonl") else _CSVSink(f)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            remaining = iter(player_ids)
+            in_flight = {}
+
+            def submit():
+                for pid in remaining:
+                    future = hedging.submit(pool, _player_rows, pid, table, match_format, data_type, view, executor)
+                    in_flight[future] = pid
+                    return
+
+            for _ in range(2 * max(1, workers)):
+                submit()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pid = in_flight.pop(future)
+                    submit()
+                    try:
+                        rows = future.result()
+                    except PlayerNotFoundError:
+                        summary["missing"].append(pid)
+                        continue
+                    for row in rows:
+                        sink.write({"player_id": pid, **row})
+                    summary["players"] += 1
+                    summary["rows"] += len(rows)
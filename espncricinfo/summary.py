@@ -3,12 +3,16 @@ from espncricinfo.match import Match
 
 class Summary:
     """
-    Provides a list of recent matches as :class:`~espncricinfo.match_ref.MatchRef` objects.
+    Provides a list of recent matches as :class:`~espncricinfo.match_ref.MatchSummary` objects.
 
     Uses Match.get_recent_matches() which scrapes the ESPN Cricinfo
     results page via Playwright. Pass an optional date string (YYYY-MM-DD
     or DD-MM-YYYY) to get matches for a specific day; defaults to today.
 
+    Each entry is a :class:`~espncricinfo.match_ref.MatchRef` carrying the
+    status, class, teams and start time shown on the results page, so the
+    list can be narrowed down before any full Match is fetched.
+
     Example::
 
         from espncricinfo.summary import Summary
@@ -20,7 +24,32 @@ class Summary:
         # Tuple unpacking also works:
         for series_id, match_id in Summary().matches:
             print(series_id, match_id)
+
+        # Only completed ODIs:
+        for ref in Summary().filter(status="result", match_class="ODI"):
+            print(ref.title, ref.status_text)
     """
 
     def __init__(self, date=None):
         self.matches = Match.get_recent_matches(date)
+
+    def filter(self, status=None, match_class=None):
+        """
+        Return the matches whose ``status`` and ``match_class`` match.
+
+        Each argument may be a single value or a collection of values and is
+        compared case-insensitively; ``None`` accepts anything. Plain
+        MatchRef entries, which carry no metadata, never match a criterion.
+        """
+        def wanted(value, accepted):
+            if accepted is None:
+                return True
+            if isinstance(accepted, str):
+                accepted = [accepted]
+            return value is not None and value.lower() in {a.lower() for a in accepted}
+
+        return [
+            m for m in self.matches
+            if wanted(getattr(m, "status", None), status)
+            and wanted(getattr(m, "match_class", None), match_class)
+        ]
@@ -0,0 +1,124 @@
+"""
+Timing spans for the phases of every fetch made by python-espncricinfo.
+
+A :class:`FetchStats` collects one :class:`Span` per phase (browser
+launch, ``page.goto``, ``page.content()``, ``__NEXT_DATA__`` extraction,
+JSON decoding, normalisation, plain HTTP requests), with the bytes
+transferred where known. Objects built from fetched data expose theirs as
+``fetch_stats``; functions registered with :func:`add_hook` are called
+with every finished span, whichever object it belongs to.
+
+Example::
+
+    from espncricinfo import timing
+    from espncricinfo.match import Match
+
+    m = Match(1478914, 1478874)
+    for span in m.fetch_stats.spans:
+        print(span.name, f"{span.duration:.3f}s", span.bytes)
+
+    timing.add_hook(lambda span: print(span.name, span.duration))
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+_log = logging.getLogger(__name__)
+
+_hooks = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook):
+    """Call ``hook(span)`` each time a span finishes. Exceptions raised by hooks are logged."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Stop calling ``hook``; does nothing if it was not registered."""
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def _emit(span):
+    for hook in list(_hooks):
+        try:
+            hook(span)
+        except Exception:
+            # A broken hook must not fail the fetch it is observing.
+            _log.exception("Timing hook %r failed", hook)
+
+
+class Span(object):
+    """
+    One timed phase of a fetch.
+
+    ``duration`` is in seconds, ``bytes`` the payload size when known and
+    ``error`` the name of the exception that ended the phase, if any.
+    """
+
+    __slots__ = ("name", "url", "start", "duration", "bytes", "status", "error")
+
+    def __init__(self, name, url=None):
+        self.name = name
+        self.url = url
+        self.start = time.time()
+        self.duration = None
+        self.bytes = None
+        self.status = None
+        self.error = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, duration={self.duration!r}, bytes={self.bytes!r})"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FetchStats(object):
+    """The spans recorded while fetching the data behind one object."""
+
+    def __init__(self):
+        self.spans = []
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(total={self.total:.3f}, bytes={self.bytes}, spans={len(self.spans)})"
+
+    @contextmanager
+    def span(self, name, url=None):
+        """Time the enclosed block as phase ``name``; yields the :class:`Span` so it can be annotated."""
+        span = Span(name, url)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = type(exc).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            self.spans.append(span)
+            _emit(span)
+
+    @property
+    def total(self):
+        """Sum of all span durations in seconds."""
+        return sum(s.duration or 0 for s in self.spans)
+
+    @property
+    def bytes(self):
+        """Sum of the bytes recorded by all spans."""
+        return sum(s.bytes or 0 for s in self.spans)
+
+    def phase(self, name):
+        """Total seconds spent in spans called ``name``."""
+        return sum(s.duration or 0 for s in self.spans if s.name == name)
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "bytes": self.bytes,
+            "spans": [s.as_dict() for s in self.spans],
+        }
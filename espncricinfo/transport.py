@@ -0,0 +1,368 @@
+"""
+Shared HTTP session used for every plain HTTP request made by
+python-espncricinfo (Player, Series and the career statistics pages).
+
+A single :class:`requests.Session` keeps connections alive between calls,
+so repeated requests to the same host reuse one TCP/TLS connection instead
+of paying a handshake each time. Pool size, timeout and retry behaviour can
+be changed with :func:`configure`.
+
+Example::
+
+    from espncricinfo import transport
+
+    transport.configure(pool_maxsize=32, timeout=10, retries=5)
+
+Concurrent identical GET requests (and Playwright page loads) are
+coalesced: while one is in flight, other threads asking for the same URL
+wait for its result instead of fetching it again. Pass ``coalesce=False``
+to :func:`configure` to turn this off.
+
+Requests (and Playwright page loads) for a host can be sent elsewhere, for
+example to a local stand-in server or a caching proxy, with ``hosts``::
+
+    transport.configure(hosts={"www.espncricinfo.com": "http://127.0.0.1:8765"})
+
+Every request and page load can be rate limited (``rate``, ``burst`` and,
+to share the limit between processes, ``rate_file``) and run under an
+adaptive concurrency limit (``adaptive``); see :mod:`espncricinfo.ratelimit`.
+"""
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from espncricinfo.hedging import current_deadline, deadline_error, time_left
+from espncricinfo.ratelimit import ERROR, AdaptiveLimiter, Slot, TokenBucket, classify
+from espncricinfo.timing import FetchStats
+
+DEFAULT_HEADERS = {'user-agent': 'Mozilla/5.0'}
+
+_DEFAULTS = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "timeout": 30,
+    "retries": 3,
+    "backoff_factor": 0.5,
+    "status_forcelist": (500, 502, 503, 504),
+    "hosts": {},
+    "coalesce": True,
+    "rate": None,
+    "burst": None,
+    "rate_file": None,
+    "adaptive": False,
+    "max_concurrency": 16,
+    "slow_response": None,
+}
+
+_lock = threading.Lock()
+_config = dict(_DEFAULTS)
+_session = None
+_backend = None
+_limits = None
+
+
+def configure(**options):
+    """
+    Change the shared session settings and discard the current session.
+
+    Keyword arguments:
+        pool_connections {int}: Number of host connection pools to keep
+        pool_maxsize {int}: Maximum keep-alive connections per host
+        timeout {float}: Default request timeout in seconds
+        retries {int}: Retries for connection errors and ``status_forcelist`` responses
+        backoff_factor {float}: Exponential backoff factor between retries
+        status_forcelist {tuple}: HTTP status codes that are retried
+        hosts {dict}: Host name -> base URL that replaces the scheme and host of its URLs
+        coalesce {bool}: Share one in-flight result between concurrent identical fetches
+        rate {float}: Requests and page loads per second (None for no limit)
+        burst {int}: Requests allowed at once after a quiet period (default: ``max(1, rate)``)
+        rate_file {string}: File holding the rate limit shared by every process using it
+        adaptive {bool}: Adjust the number of fetches in flight to the site's responses (AIMD)
+        max_concurrency {int}: Upper bound for the adaptive concurrency limit
+        slow_response {float}: Seconds after which a response counts against the adaptive limit
+
+    Options not passed keep their current value. The rate and concurrency
+    limiters start afresh.
+    """
+    unknown = set(options) - set(_DEFAULTS)
+    if unknown:
+        raise TypeError(f"Unknown transport option(s): {', '.join(sorted(unknown))}")
+    global _session, _limits
+    with _lock:
+        _config.update(options)
+        old, _session = _session, None
+        _limits = None
+    if old is not None:
+        old.close()
+
+
+def reset():
+    """Restore the default settings and discard the current session."""
+    configure(**_DEFAULTS)
+
+
+def _build_session():
+    # requests is imported on first use to keep ``import espncricinfo`` fast.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class DeadlineRetry(Retry):
+        # urllib3 retries inside session.get, after time_left() capped the
+        # timeout: stop once the current Deadline leaves no time for another attempt.
+        def increment(self, *args, **kwargs):
+            retry = super().increment(*args, **kwargs)
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() <= retry.get_backoff_time():
+                return self.new(total=0).increment(*args, **kwargs)
+            return retry
+
+    retry = DeadlineRetry(
+        total=_config["retries"],
+        backoff_factor=_config["backoff_factor"],
+        status_forcelist=_config["status_forcelist"],
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_config["pool_connections"],
+        pool_maxsize=_config["pool_maxsize"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared :class:`requests.Session`, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _build_limits():
+    bucket = None
+    if _config["rate"]:
+        bucket = TokenBucket(_config["rate"], _config["burst"], _config["rate_file"])
+    limiter = None
+    if _config["adaptive"]:
+        limiter = AdaptiveLimiter(maximum=_config["max_concurrency"], slow=_config["slow_response"])
+    return bucket, limiter
+
+
+def get_limits():
+    """
+    Return the ``(TokenBucket, AdaptiveLimiter)`` applied to fetches, either
+    None when not configured, creating them on first use.
+    """
+    global _limits
+    limits = _limits
+    if limits is None:
+        with _lock:
+            if _limits is None:
+                _limits = _build_limits()
+            limits = _limits
+    return limits
+
+
+@contextmanager
+def limited(stats=None, url=None):
+    """
+    Hold the enclosed fetch until the adaptive concurrency limit and the
+    rate limit admit it; yields a :class:`~espncricinfo.ratelimit.Slot`
+    whose ``status`` the caller sets to the response status. Time spent
+    waiting is recorded in ``stats`` as a ``throttle_wait`` span.
+    """
+    bucket, limiter = get_limits()
+    if bucket is None and limiter is None:
+        yield Slot()
+        return
+    if stats is None:
+        stats = FetchStats()
+    with stats.span("throttle_wait", url):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            if bucket is not None:
+                bucket.acquire()
+        except BaseException:
+            if limiter is not None:
+                limiter.release(Slot(), ERROR)
+            raise
+    slot = Slot()
+    try:
+        yield slot
+    except BaseException as exc:
+        if limiter is not None:
+            limiter.release(slot, classify(slot.status, exc))
+        raise
+    if limiter is not None:
+        limiter.release(slot, classify(status=slot.status))
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Runs at most one call per key at a time. Callers arriving while a call
+    with the same key is running wait for it and get its result (or its
+    exception) instead of making their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self):
+        """Return the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn, stats=None, url=None):
+        """
+        Return ``fn()``, or the result of the call already running for
+        ``key``. Time spent waiting on another call is recorded in
+        ``stats`` as a ``coalesced`` span.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if stats is None:
+                stats = FetchStats()
+            with stats.span("coalesced", url):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_flights = SingleFlight()
+
+
+def coalesce(key, fn, stats=None, url=None):
+    """Run ``fn()`` through the shared :class:`SingleFlight` unless coalescing is turned off."""
+    if not _config["coalesce"]:
+        return fn()
+    return _flights.do(key, fn, stats, url)
+
+
+def resolve(url):
+    """Return ``url`` with its scheme and host replaced if ``hosts`` maps the host elsewhere."""
+    hosts = _config["hosts"]
+    if not hosts:
+        return url
+    parts = urlsplit(url)
+    base = hosts.get(parts.hostname)
+    if base is None:
+        return url
+    return base.rstrip("/") + url[len(f"{parts.scheme}://{parts.netloc}"):]
+
+
+def set_backend(backend):
+    """
+    Send requests through ``backend`` instead of the shared session (None
+    restores the session) and return the previous backend.
+
+    A backend provides ``get(url, headers=None, timeout=None, **kwargs)``
+    returning a response, and ``load_page(url, stats, load)`` returning the
+    HTML of a page normally loaded in the browser by ``load(url, stats)``.
+    Both receive URLs before :func:`resolve`; see :mod:`espncricinfo.replay`.
+    """
+    global _backend
+    with _lock:
+        previous, _backend = _backend, backend
+    return previous
+
+
+def get_backend():
+    """Return the installed backend, or None when requests use the shared session."""
+    return _backend
+
+
+def session_get(url, headers=None, timeout=None, **kwargs):
+    """GET ``url`` (after :func:`resolve`) over the shared session, bypassing any backend."""
+    if timeout is None:
+        timeout = _config["timeout"]
+    return get_session().get(resolve(url), headers=headers, timeout=timeout, **kwargs)
+
+
+def get(url, headers=None, timeout=None, stats=None, **kwargs):
+    """
+    Issue a GET request over the shared session.
+
+    ``url`` is passed through :func:`resolve` and ``timeout`` defaults to
+    the configured value. The request is timed as
+    an ``http_get`` span, added to ``stats`` (a
+    :class:`~espncricinfo.timing.FetchStats`) when given. Other keyword
+    arguments are passed to :meth:`requests.Session.get`, or to the
+    backend installed with :func:`set_backend`.
+
+    Without extra keyword arguments, a request for the same URL and
+    headers as one already in flight waits for that one and returns the
+    same response object.
+
+    Inside a :class:`~espncricinfo.hedging.Deadline` the timeout is cut to
+    the time left, and DeadlineExceededError is raised once none is.
+    """
+    if timeout is None:
+        timeout = _config["timeout"]
+    capped = time_left(timeout, url)
+    if stats is None:
+        stats = FetchStats()
+    if kwargs:
+        return _get(url, headers, capped, stats, kwargs, capped != timeout)
+    key = ("GET", url, tuple(sorted((headers or {}).items())))
+    return coalesce(key, lambda: _get(url, headers, capped, stats, kwargs, capped != timeout), stats, url)
+
+
+def _get(url, headers, timeout, stats, kwargs, capped=False):
+    with limited(stats, url) as slot, stats.span("http_get", url) as span:
+        try:
+            if _backend is not None:
+                r = _backend.get(url, headers=headers, timeout=timeout, **kwargs)
+            else:
+                r = get_session().get(resolve(url), headers=headers, timeout=timeout, **kwargs)
+        except Exception as exc:
+            # The http_get span counts the error as it ends.
+            error = deadline_error(exc, url, capped, record=False)
+            if error is exc:
+                raise
+            raise error from exc
+        slot.status = span.status = r.status_code
+        span.bytes = len(r.content)
+    return r
+
+
+def close():
+    """Close the shared session; a new one is created on the next request."""
+    global _session
+    with _lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
@@ -6,20 +6,30 @@ ESPN's API endpoints (matches/engine, hs-consumer-api) are blocked by Akamai
 for scripted requests. We use Playwright (WebKit) to load match pages and extract
 the __NEXT_DATA__ JSON embedded by Next.js.
 
+With --record, the fixtures are left alone and a workload (the match,
+the recent results page, the player with both profile documents and
+career statistics, and the series with its events) is run through the
+library while every request and page load is captured into an archive
+(see espncricinfo.replay). Replaying the archive re-runs the workload
+without network access, e.g. ``benchmarks/loadtest.py --replay``.
+
 Usage:
     uv run python scripts/refresh_fixtures.py
+    uv run python scripts/refresh_fixtures.py --record workload.jsonl.gz
 
 Requirements:
     uv add --dev playwright
     uv run playwright install webkit
 """
+import argparse
 import asyncio
 import json
 import re
 import sys
 from pathlib import Path
 
-FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = ROOT / "tests" / "fixtures"
 
 # AUS Women vs IND Women 3rd T20I 2025-26 — completed match with full scorecard
 MATCH_ID = 1478914
@@ -120,10 +130,52 @@ def fetch_player():
         print(f"  (keeping existing {new_path.name})")
 
 
-if __name__ == "__main__":
+def record(path, append=False):
+    """Run the fixture workload through the library, recording every request into ``path``."""
+    sys.path.insert(0, str(ROOT))
+    from espncricinfo import cache, replay
+    from espncricinfo.match import Match
+    from espncricinfo.player import Player
+    from espncricinfo.series import Series
+
+    # Nothing may be answered from a cache, or it would be missing from the archive.
+    cache.configure()
+    steps = [
+        ("match", lambda: Match(MATCH_ID, SERIES_ID)),
+        ("recent matches", Match.get_recent_matches),
+        ("player", lambda: Player(PLAYER_ID, preload=("html", "new_json")).get_stats(1, "batting")),
+        ("series", lambda: Series(SERIES_ID).events),
+    ]
+    with replay.record(path, append=append) as recorder:
+        for name, step in steps:
+            print(f"  Recording {name}...")
+            try:
+                step()
+            except Exception as e:
+                print(f"  {name} failed: {type(e).__name__}: {e}")
+    print(f"  Saved {len(recorder.archive)} responses to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--record", metavar="ARCHIVE", help="record a replay archive instead of refreshing fixtures")
+    parser.add_argument("--append", action="store_true", help="add to an existing archive")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        print(f"Recording workload into {args.record}...")
+        record(args.record, append=args.append)
+        print("Done.")
+        return 0
+
     FIXTURES.mkdir(exist_ok=True)
     print("Fetching match fixtures via Playwright (WebKit)...")
     fetch_match()
     print("Fetching player fixtures...")
     fetch_player()
     print("Done.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,12 @@ setup(name="python-espncricinfo",
       version="0.6.1",
       description="ESPNCricInfo API client",
       license="MIT",
-      install_requires=["requests", "bs4", "dateparser", "lxml"],
+      install_requires=["requests", "bs4", "lxml"],
       author="Derek Willis",
       author_email="dwillis@gmail.com",
       url="http://github.com/dwillis/python-espncricinfo",
       packages = find_packages(),
+      entry_points={"console_scripts": ["espncricinfo = espncricinfo.cli:main"]},
       keywords= "espncricinfo cricket t20 odi",
       classifiers=['Development Status :: 4 - Beta'],
       zip_safe = True)
@@ -2,6 +2,7 @@ import json
 import os
 import pytest
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 FIXTURE_DIR = Path(__file__).parent / "fixtures"
 
@@ -16,6 +17,40 @@ def load_fixture_text(name):
         return f.read()
 
 
+def fake_playwright(content, status=200, state=None):
+    """
+    Return ``(async_playwright stand-in, pw)`` where every page serves
+    ``content`` with ``status`` and every context reports ``state`` as its
+    storage state. The stand-in works with both ``async with`` and
+    ``.start()``; each ``pw.webkit.launch`` makes a new browser, appended to
+    ``pw.browsers``.
+    """
+    def new_browser(**kwargs):
+        page = MagicMock()
+        page.goto = AsyncMock(return_value=MagicMock(status=status))
+        page.content = AsyncMock(return_value=content)
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        context.storage_state = AsyncMock(return_value=state)
+        context.close = AsyncMock()
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.new_context = AsyncMock(return_value=context)
+        browser.close = AsyncMock()
+        pw.browsers.append(browser)
+        return browser
+
+    pw = MagicMock()
+    pw.browsers = []
+    pw.webkit.launch = AsyncMock(side_effect=new_browser)
+    pw.stop = AsyncMock()
+    manager = MagicMock()
+    manager.__aenter__ = AsyncMock(return_value=pw)
+    manager.__aexit__ = AsyncMock(return_value=False)
+    manager.start = AsyncMock(return_value=pw)
+    return MagicMock(return_value=manager), pw
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--live",
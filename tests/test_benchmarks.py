@@ -0,0 +1,45 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+RUN_PY = Path(__file__).parent.parent / "benchmarks" / "run.py"
+
+
+def _load_benchmarks():
+    spec = importlib.util.spec_from_file_location("benchmarks_run", RUN_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bench = _load_benchmarks()
+
+    def test_every_case_runs_offline(self):
+        results = self.bench.run_suite(only=list(self.bench.cases()), repeat=1, number=1)
+        self.assertEqual(set(results), set(self.bench.cases()))
+        for result in results.values():
+            self.assertGreater(result["time"], 0)
+            self.assertGreater(result["peak_memory"], 0)
+
+    def test_baseline_covers_every_case(self):
+        import json
+
+        with open(self.bench.BASELINE) as f:
+            baseline = json.load(f)["results"]
+        self.assertTrue(set(self.bench.cases()) <= set(baseline))
+
+    def test_compare_flags_regressions_over_threshold(self):
+        baseline = {"a": {"time": 1.0, "peak_memory": 100}}
+        self.assertEqual(self.bench.compare({"a": {"time": 1.4, "peak_memory": 100}}, baseline, 1.5), [])
+        regressions = self.bench.compare({"a": {"time": 1.0, "peak_memory": 200}}, baseline, 1.5)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("peak_memory", regressions[0])
+
+    def test_fixture_match_within_memory_budget(self):
+        report = self.bench.match_memory()
+        self.assertEqual(self.bench.check_match_memory(report), [])
+        self.assertEqual(len(self.bench.check_match_memory(report, budget=1)), 1)
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from espncricinfo import browser_state
+from espncricinfo.match import _browser_load_page
+from espncricinfo.timing import FetchStats
+from tests.conftest import fake_playwright
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+STATE = {"cookies": [{"name": "ak_bmsc", "value": "abc", "domain": ".espncricinfo.com"}], "origins": []}
+URL = "https://www.espncricinfo.com/series/x-1478874/x-1478914/full-scorecard"
+
+
+class StateFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "state.json")
+        browser_state.configure(path=self.path, max_age=100)
+
+    def tearDown(self):
+        browser_state.configure()
+        self._dir.cleanup()
+
+    def age(self, seconds):
+        then = time.time() - seconds
+        os.utime(self.path, (then, then))
+
+
+class TestStateFile(StateFileTestCase):
+
+    def test_not_persisted_by_default(self):
+        browser_state.configure()
+        self.assertIsNone(browser_state.get_path())
+        browser_state.save(STATE)
+        self.assertIsNone(browser_state.load())
+        self.assertFalse(browser_state.needs_save())
+
+    def test_save_and_load(self):
+        self.assertIsNone(browser_state.load())
+        self.assertTrue(browser_state.needs_save())
+        browser_state.save(STATE)
+        self.assertEqual(browser_state.load(), STATE)
+        self.assertFalse(browser_state.needs_save())
+        self.assertEqual(os.listdir(self._dir.name), ["state.json"])
+
+    def test_directory_created(self):
+        path = os.path.join(self._dir.name, "cache", "state.json")
+        browser_state.configure(path=path)
+        browser_state.save(STATE)
+        self.assertEqual(browser_state.load(), STATE)
+
+    def test_failed_save_is_logged_and_cleaned_up(self):
+        with self.assertLogs("espncricinfo.browser_state", "WARNING"):
+            browser_state.save({"cookies": [object()]})
+        self.assertEqual(os.listdir(self._dir.name), [])
+        with patch("espncricinfo.browser_state.os.replace", side_effect=PermissionError("read-only")):
+            with self.assertLogs("espncricinfo.browser_state", "WARNING"):
+                browser_state.save(STATE)
+        self.assertEqual(os.listdir(self._dir.name), [])
+
+    def test_renewed_after_half_its_life(self):
+        browser_state.save(STATE)
+        self.age(60)
+        self.assertEqual(browser_state.load(), STATE)
+        self.assertTrue(browser_state.needs_save())
+
+    def test_stale_state_is_not_used(self):
+        browser_state.save(STATE)
+        self.age(101)
+        self.assertIsNone(browser_state.load())
+
+    def test_corrupt_state_is_not_used(self):
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertIsNone(browser_state.load())
+
+    def test_discard(self):
+        browser_state.save(STATE)
+        browser_state.discard()
+        browser_state.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestPageLoads(StateFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.html = (FIXTURE_DIR / "match_1478914.html").read_text()
+
+    def load(self, status=200):
+        fake, pw = fake_playwright(self.html, status, STATE)
+        with patch("playwright.async_api.async_playwright", fake):
+            _browser_load_page(URL, FetchStats())
+        return pw.browsers[-1]
+
+    def test_first_load_saves_state(self):
+        browser = self.load()
+        self.assertIsNone(browser.new_context.call_args.kwargs["storage_state"])
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), STATE)
+
+    def test_saved_state_restored(self):
+        browser_state.save(STATE)
+        browser = self.load()
+        self.assertEqual(browser.new_context.call_args.kwargs["storage_state"], STATE)
+        context = browser.new_context.return_value
+        context.storage_state.assert_not_awaited()
+
+    def test_blocked_load_discards_state(self):
+        browser_state.save(STATE)
+        self.load(status=403)
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from espncricinfo import cache, metrics
+from espncricinfo.cache import Cache
+
+
+class CacheBehaviour(object):
+    """
+    Tests shared by the in-memory and SQLite caches. Subclasses set
+    ``path``: None for the in-memory cache, or the SQLite file to use.
+    """
+
+    def make_cache(self, **kwargs):
+        c = Cache(self.path, **kwargs)
+        self.addCleanup(c.close)
+        return c
+
+    def test_get_missing_returns_default(self):
+        c = self.make_cache()
+        self.assertIsNone(c.get("missing"))
+        self.assertEqual(c.get("missing", 1), 1)
+
+    def test_set_and_get(self):
+        c = self.make_cache()
+        c.set("k", {"name": "V Kohli", "teams": [1, 2]})
+        self.assertEqual(c.get("k"), {"name": "V Kohli", "teams": [1, 2]})
+        self.assertIn("k", c)
+        self.assertEqual(len(c), 1)
+
+    def test_entries_expire(self):
+        c = self.make_cache(ttl=10)
+        with patch("espncricinfo.cache.time.time", return_value=1000.0):
+            c.set("k", "v")
+        with patch("espncricinfo.cache.time.time", return_value=1009.0):
+            self.assertEqual(c.get("k"), "v")
+        with patch("espncricinfo.cache.time.time", return_value=1010.0):
+            self.assertIsNone(c.get("k"))
+
+    def test_per_entry_ttl_overrides_default(self):
+        c = self.make_cache(ttl=10)
+        with patch("espncricinfo.cache.time.time", return_value=1000.0):
+            c.set("k", "v", ttl=None)
+        with patch("espncricinfo.cache.time.time", return_value=10 ** 9):
+            self.assertEqual(c.get("k"), "v")
+
+    def test_maxsize_evicts_oldest(self):
+        c = self.make_cache(maxsize=2)
+        with patch("espncricinfo.cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+            c.set("a", 1)
+            c.set("b", 2)
+            c.set("c", 3)
+        self.assertNotIn("a", c)
+        self.assertEqual(len(c), 2)
+
+    def test_delete_and_clear(self):
+        c = self.make_cache()
+        c.set("a", 1)
+        c.set("b", 2)
+        c.delete("a")
+        self.assertNotIn("a", c)
+        c.clear()
+        self.assertEqual(len(c), 0)
+
+
+class TestMemoryCache(CacheBehaviour, unittest.TestCase):
+
+    path = None
+
+
+class TestSQLiteCache(CacheBehaviour, unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_persist_across_instances(self):
+        self.make_cache(namespace="players").set("k", "v")
+        self.assertEqual(self.make_cache(namespace="players").get("k"), "v")
+
+    def test_namespaces_are_separate(self):
+        self.make_cache(namespace="players").set("k", "v")
+        self.assertIsNone(self.make_cache(namespace="stats").get("k"))
+
+
+class TestSharedCaches(unittest.TestCase):
+
+    def tearDown(self):
+        cache.configure()
+
+    def test_get_cache_is_shared(self):
+        self.assertIs(cache.get_cache("players"), cache.get_cache("players"))
+
+    def test_players_cache_has_long_ttl(self):
+        self.assertEqual(cache.get_cache("players").ttl, cache.PLAYER_TTL)
+
+    def test_configure_sets_path_and_ttls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            cache.configure(path=path, ttls={"players": 60})
+            c = cache.get_cache("players")
+            self.assertEqual(c.path, path)
+            self.assertEqual(c.ttl, 60)
+            cache.configure()
+
+
+class TestNegativeCache(unittest.TestCase):
+
+    def setUp(self):
+        cache.configure(remember_not_found=True)
+
+    def tearDown(self):
+        cache.configure()
+
+    def test_off_by_default(self):
+        cache.configure()
+        cache.mark_not_found("http://core.espnuk.org/v2/")
+        self.assertFalse(cache.is_not_found("http://core.espnuk.org/v2/"))
+        self.assertEqual(len(cache.get_cache(cache.NOT_FOUND)), 0)
+
+    def test_lookups_not_counted(self):
+        before = metrics.CACHE_MISSES.value(namespace=cache.NOT_FOUND)
+        cache.is_not_found("http://core.espnuk.org/v2/")
+        self.assertEqual(metrics.CACHE_MISSES.value(namespace=cache.NOT_FOUND), before)
+
+    def test_mark_and_forget(self):
+        url = "http://core.espnuk.org/v2/sports/cricket/athletes/404"
+        self.assertFalse(cache.is_not_found(url))
+        cache.mark_not_found(url)
+        self.assertTrue(cache.is_not_found(url))
+        cache.forget_not_found(url)
+        self.assertFalse(cache.is_not_found(url))
+
+    def test_entries_expire_after_ttl(self):
+        url = "http://core.espnuk.org/v2/"
+        with patch("espncricinfo.cache.time.time", return_value=1000.0):
+            cache.mark_not_found(url)
+        with patch("espncricinfo.cache.time.time", return_value=1000.0 + cache.NOT_FOUND_TTL):
+            self.assertFalse(cache.is_not_found(url))
+
+    def test_zero_ttl_disables(self):
+        cache.configure(ttls={"not_found": 0}, remember_not_found=True)
+        cache.mark_not_found("http://core.espnuk.org/v2/")
+        self.assertEqual(len(cache.get_cache(cache.NOT_FOUND)), 0)
+
+    def test_persisted_with_positive_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            cache.configure(path=path, remember_not_found=True)
+            cache.mark_not_found("http://core.espnuk.org/v2/")
+            cache.configure(path=path, remember_not_found=True)
+            self.assertTrue(cache.is_not_found("http://core.espnuk.org/v2/"))
+            cache.configure()
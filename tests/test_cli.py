@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import cache, cli, replay, transport
+from espncricinfo.daemon import FetchDaemon
+from espncricinfo.match_ref import MatchRef
+from espncricinfo.replay import Archive
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MATCH_URL = "https://www.espncricinfo.com/series/x-1478874/x-1478914/full-scorecard"
+RESULTS_URL = "https://www.espncricinfo.com/live-cricket-match-results?date={0}"
+
+
+def _archive():
+    """Replay archive with the fixture match page and a results page listing it on 2026-02-06."""
+    archive = Archive()
+    with open(FIXTURE_DIR / "match_1478914.html") as f:
+        archive.add(replay.PAGE, MATCH_URL, 200, f.read())
+    with open(FIXTURE_DIR / "match_1478914_next_data.json") as f:
+        match = json.load(f)["props"]["appPageProps"]["data"]["match"]
+    next_data = {"props": {"appPageProps": {"data": {"data": {"content": {"matches": [match, match]}}}}}}
+    archive.add(replay.PAGE, RESULTS_URL.format("2026-02-06"), 200,
+                '<script id="__NEXT_DATA__" type="application/json">' + json.dumps(next_data) + "</script>")
+    archive.add(replay.PAGE, RESULTS_URL.format("2026-02-07"), 200, "<html></html>")
+    return archive
+
+
+def _player_response(url, headers=None, **kwargs):
+    from unittest.mock import MagicMock
+
+    mock = MagicMock()
+    if "/athletes/404" in url:
+        mock.status_code = 404
+        return mock
+    mock.status_code = 200
+    with open(FIXTURE_DIR / ("player_253802_new.json" if "hs-consumer-api" in url else "player_253802.json")) as f:
+        mock.json.return_value = json.load(f)
+    return mock
+
+
+class CLITestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+        self.out = os.path.join(self.dir, "out")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def main(self, *argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            code = cli.main(["--quiet", *argv])
+        return code, json.loads(stdout.getvalue())
+
+
+class TestReadInput(CLITestCase):
+
+    def test_read_refs_skips_header_and_duplicates(self):
+        path = self.write("refs.csv", "series_id,match_id\n1478874,1478914\n\n1478874,1478914\n1,2\n")
+        self.assertEqual(cli.read_refs(path), [MatchRef(1478874, 1478914), MatchRef(1, 2)])
+
+    def test_read_ids(self):
+        path = self.write("ids.txt", "player_id\n253802\n\n253802\n7\n")
+        self.assertEqual(cli.read_ids(path), [253802, 7])
+
+
+class TestFetchMatches(CLITestCase):
+
+    def test_fetch_and_resume(self):
+        refs = self.write("refs.csv", "1478874,1478914\n1478874,1\n")
+        with replay.replay(_archive()):
+            code, summary = self.main("fetch-matches", "--refs", refs, "--workers", "2", "--out", self.out)
+        self.assertEqual(code, 1)
+        self.assertEqual((summary["ok"], summary["failed"], summary["skipped"]), (1, 1, 0))
+        with open(os.path.join(self.out, "1478874_1478914.json")) as f:
+            self.assertIn("innings", json.load(f))
+        with open(os.path.join(self.out, "failed.csv")) as f:
+            failed = list(csv.reader(f))
+        self.assertEqual(failed[1][:2], ["1478874", "1"])
+        self.assertIn("ReplayMissError", failed[1][2])
+        self.assertFalse([name for name in os.listdir(self.out) if name.endswith(".tmp")])
+
+        # The completed match is skipped on the next run
+        with replay.replay(_archive()):
+            code, summary = self.main("fetch-matches", "--refs", refs, "--out", self.out)
+        self.assertEqual((summary["ok"], summary["failed"], summary["skipped"]), (0, 1, 1))
+
+
+    def test_deadline_leaves_matches_for_next_run(self):
+        refs = self.write("refs.csv", "1478874,1478914\n")
+        with replay.replay(_archive()):
+            code, summary = self.main("fetch-matches", "--refs", refs, "--out", self.out, "--deadline", "0")
+        self.assertEqual((code, summary["failed"]), (1, 1))
+        with open(os.path.join(self.out, "failed.csv")) as f:
+            self.assertIn("DeadlineExceededError", f.read())
+
+
+    def test_pages_loaded_through_daemon(self):
+        refs = self.write("refs.csv", "1478874,1478914\n")
+        html = (FIXTURE_DIR / "match_1478914.html").read_text()
+        pool = MagicMock(browsers=1, contexts=1, in_use=0, loads=0)
+        pool.load.return_value = (200, html)
+        with FetchDaemon(port=0, pool=pool) as server, \
+                patch("espncricinfo.match._browser_load_page") as browser:
+            code, summary = self.main("fetch-matches", "--refs", refs, "--out", self.out,
+                                      "--daemon", server.address)
+        self.assertEqual((code, summary["ok"]), (0, 1))
+        browser.assert_not_called()
+        self.assertEqual(pool.load.call_args.args[0], MATCH_URL)
+        self.assertIsNone(transport.get_backend())
+
+
+class TestSync(CLITestCase):
+
+    def test_sync_lists_days_and_fetches_new_matches(self):
+        with replay.replay(_archive()):
+            code, summary = self.main("sync", "--from", "2026-02-06", "--to", "2026-02-07", "--out", self.out)
+        self.assertEqual(code, 0)
+        self.assertEqual((summary["total"], summary["ok"]), (1, 1))
+        self.assertEqual(cli.read_refs(os.path.join(self.out, "refs.csv")), [MatchRef(1478874, 1478914)])
+        self.assertTrue(os.path.exists(os.path.join(self.out, "1478874_1478914.json")))
+
+    def test_sync_rejects_reversed_range(self):
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()), \
+                patch("sys.stderr", io.StringIO()):
+            cli.main(["sync", "--from", "2026-02-07", "--to", "2026-02-06", "--out", self.out])
+
+    def test_sync_reports_failed_days(self):
+        stream = io.StringIO()
+        with replay.replay(Archive()):
+            summary = cli.sync(date(2026, 2, 6), date(2026, 2, 6), self.out, stream=stream)
+        self.assertEqual(summary["total"], 0)
+        self.assertIn("2026-02-06: ReplayMissError", stream.getvalue())
+
+
+class TestPlayers(CLITestCase):
+
+    def test_players_written_with_teams(self):
+        # Fresh in-memory caches, so no profile is served from an earlier test
+        cache.configure()
+        self.addCleanup(cache.configure)
+        ids = self.write("ids.txt", "253802\n404\n")
+        with patch("espncricinfo.transport.get", side_effect=_player_response):
+            code, summary = self.main("players", "--ids", ids, "--out", self.out, "--with-teams")
+        self.assertEqual(code, 1)
+        self.assertEqual((summary["ok"], summary["failed"]), (1, 1))
+        with open(os.path.join(self.out, "253802.json")) as f:
+            data = json.load(f)
+        self.assertIn("new_json", data)
+        self.assertEqual(data["json"]["id"], "253802")
+
+
+class TestProgress(unittest.TestCase):
+
+    def test_reports_counts_and_rate(self):
+        stream = io.StringIO()
+        progress = cli.Progress(3, "items", stream, interval=0)
+        progress.update(ok=1)
+        progress.update(failed=1, skipped=1)
+        progress.close()
+        self.assertIn("items: 3/3 (ok 1, failed 1, skipped 1)", stream.getvalue())
+        self.assertTrue(stream.getvalue().endswith("\n"))
+        self.assertEqual(progress.summary()["total"], 3)
+
+    def test_silent_without_stream(self):
+        progress = cli.Progress(1, "items")
+        progress.update(ok=1)
+        progress.close()
+        self.assertEqual(progress.summary()["ok"], 1)
@@ -0,0 +1,292 @@
+import asyncio
+import concurrent.futures
+import os
+import socket
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from urllib.parse import urlencode
+
+from espncricinfo import daemon, hedging, transport
+from espncricinfo.daemon import BrowserPool, DaemonClient, FetchDaemon
+from espncricinfo.exceptions import DeadlineExceededError, FetchDaemonError, MatchNotFoundError
+from espncricinfo.match import Match
+from espncricinfo.timing import FetchStats
+from tests.conftest import fake_playwright
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+MATCH_URL = "https://www.espncricinfo.com/series/x-1478874/x-1478914/full-scorecard"
+NOT_FOUND_URL = "https://www.espncricinfo.com/series/x-1/x-404/full-scorecard"
+CRASH_URL = "https://www.espncricinfo.com/series/x-1/x-2/full-scorecard"
+SLOW_URL = "https://www.espncricinfo.com/series/x-1/x-3/full-scorecard"
+PLAIN_URL = "https://www.espncricinfo.com/plain"
+BLOCKED_URL = "https://www.espncricinfo.com/series/x-1478874/x-1478915/full-scorecard"
+
+
+class FakePool(object):
+    """
+    Stands in for BrowserPool, answering loads from ``pages`` (url -> html,
+    ``(status, html)`` or exception).
+    """
+
+    browsers = 1
+    contexts = 2
+    in_use = 0
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.loads = 0
+        self.timeouts = []
+        self.started = self.stopped = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def load(self, url, timeout=daemon.PAGE_TIMEOUT):
+        self.timeouts.append(timeout)
+        page = self.pages[url]
+        if isinstance(page, BaseException):
+            raise page
+        self.loads += 1
+        return page if isinstance(page, tuple) else (200, page)
+
+
+class DaemonTestCase(unittest.TestCase):
+
+    socket = False
+
+    def setUp(self):
+        self.html = (FIXTURE_DIR / "match_1478914.html").read_text()
+        self.pool = FakePool({
+            MATCH_URL: self.html,
+            NOT_FOUND_URL: MatchNotFoundError(f"Match not found at {NOT_FOUND_URL}"),
+            CRASH_URL: RuntimeError("browser crashed"),
+            SLOW_URL: TimeoutError("page.goto timed out"),
+            PLAIN_URL: "<html><body>Access denied</body></html>",
+            BLOCKED_URL: (403, "<html><body>Access denied</body></html>"),
+        })
+        if self.socket:
+            self._dir = tempfile.TemporaryDirectory()
+            self.addCleanup(self._dir.cleanup)
+            self.daemon = FetchDaemon(os.path.join(self._dir.name, "fetch.sock"), pool=self.pool)
+        else:
+            self.daemon = FetchDaemon(port=0, pool=self.pool)
+        self.daemon.start()
+        self.addCleanup(self.daemon.stop)
+        self.client = DaemonClient(self.daemon.address)
+
+    def load(self, url):
+        return self.client.load_page(url, FetchStats(), load=None)
+
+
+class TestDaemonOverTCP(DaemonTestCase):
+
+    def test_serves_next_data_only(self):
+        body = self.load(MATCH_URL)
+        self.assertTrue(body.startswith('<script id="__NEXT_DATA__"'))
+        self.assertLess(len(body), len(self.html))
+        self.assertTrue(self.pool.started)
+
+    def test_match_loaded_through_daemon(self):
+        with patch("espncricinfo.match._browser_load_page") as browser:
+            with daemon.connect(self.daemon.address):
+                m = Match(1478914, 1478874)
+        browser.assert_not_called()
+        self.assertIsNone(transport.get_backend())
+        self.assertEqual(m.match_id, 1478914)
+        self.assertEqual([s.name for s in m.fetch_stats.spans][:2], ["goto", "content"])
+        self.assertEqual(self.pool.loads, 1)
+
+    def test_not_found(self):
+        with self.assertRaises(MatchNotFoundError):
+            self.load(NOT_FOUND_URL)
+
+    def test_failed_load(self):
+        with self.assertRaisesRegex(FetchDaemonError, "browser crashed"):
+            self.load(CRASH_URL)
+
+    def test_timed_out_load(self):
+        with self.assertRaises(TimeoutError):
+            self.load(SLOW_URL)
+
+    def test_other_sites_refused(self):
+        for url in ("https://intranet.example/admin", "http://www.espncricinfo.com/x",
+                    "file:///etc/passwd", "https://user@www.espncricinfo.com/x"):
+            with self.assertRaisesRegex(FetchDaemonError, "Not an ESPN Cricinfo page"):
+                self.load(url)
+        self.assertEqual(self.pool.timeouts, [])
+
+    def test_page_without_next_data_not_returned(self):
+        with self.assertRaisesRegex(FetchDaemonError, "No __NEXT_DATA__") as ctx:
+            self.load(PLAIN_URL)
+        self.assertNotIn("Access denied", str(ctx.exception))
+
+    def test_upstream_status_passed_back(self):
+        stats = FetchStats()
+        self.client.load_page(MATCH_URL, stats, None)
+        self.assertEqual(stats.spans[0].status, 200)
+        stats = FetchStats()
+        with self.assertRaises(FetchDaemonError):
+            self.client.load_page(BLOCKED_URL, stats, None)
+        self.assertEqual(stats.spans[0].status, 403)
+
+    def test_blocked_page_cuts_concurrency(self):
+        transport.configure(adaptive=True)
+        self.addCleanup(transport.reset)
+        _, limiter = transport.get_limits()
+        before = limiter.limit
+        with daemon.connect(self.daemon.address):
+            with self.assertRaises(FetchDaemonError):
+                Match(1478915, 1478874)
+        self.assertEqual(limiter.limit, before / 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_slow_load_hedged(self):
+        hedging.configure(hedge=True, delay=0.05, min_delay=0)
+        self.addCleanup(hedging.reset)
+        calls = []
+
+        def load(url, timeout=daemon.PAGE_TIMEOUT):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(2)
+            return 200, self.html
+
+        with patch.object(self.pool, "load", side_effect=load):
+            started = time.monotonic()
+            self.assertIn("__NEXT_DATA__", self.load(MATCH_URL))
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_load_retried(self):
+        hedging.configure(retries=1, backoff=0)
+        self.addCleanup(hedging.reset)
+        with patch.object(self.pool, "load", side_effect=[RuntimeError("browser crashed"), (200, self.html)]):
+            self.assertIn("__NEXT_DATA__", self.load(MATCH_URL))
+
+    def test_load_bounded_by_deadline(self):
+        with hedging.Deadline(5):
+            self.load(MATCH_URL)
+        self.assertLessEqual(self.pool.timeouts[0], 5000)
+        with hedging.Deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceededError):
+                self.load(MATCH_URL)
+        self.assertEqual(len(self.pool.timeouts), 1)
+
+    def test_bad_timeout_rejected(self):
+        for timeout in ("soon", "0", "-5"):
+            query = urlencode({"url": MATCH_URL, "timeout": timeout})
+            status, _, body = self.client._request(f"/page?{query}", 10)
+            self.assertEqual(status, 400, timeout)
+        self.assertEqual(self.pool.timeouts, [])
+
+    def test_health_and_metrics(self):
+        self.load(MATCH_URL)
+        self.assertEqual(self.client.health(), {"browsers": 1, "contexts": 2, "in_use": 0, "loads": 1})
+        status, _, body = self.client._request("/metrics", 10)
+        self.assertEqual(status, 200)
+        self.assertIn("espncricinfo_errors_total", body)
+
+    def test_unreachable_daemon(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        with self.assertRaises(FetchDaemonError):
+            DaemonClient(f"http://127.0.0.1:{port}").load_page(MATCH_URL, FetchStats(), None)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestDaemonOverUnixSocket(DaemonTestCase):
+
+    socket = True
+
+    def test_serves_pages(self):
+        self.assertIn("__NEXT_DATA__", self.load(MATCH_URL))
+        with self.assertRaises(MatchNotFoundError):
+            self.load(NOT_FOUND_URL)
+
+    def test_socket_removed_on_stop(self):
+        path = self.daemon.address
+        self.assertTrue(os.path.exists(path))
+        self.daemon.stop()
+        self.assertFalse(os.path.exists(path))
+        self.daemon.stop = lambda: None
+
+    def test_running_daemon_not_replaced(self):
+        with self.assertRaisesRegex(FetchDaemonError, "already listening"):
+            FetchDaemon(self.daemon.address, pool=FakePool({}))
+        self.assertIn("__NEXT_DATA__", self.load(MATCH_URL))
+
+    def test_stale_socket_replaced(self):
+        path = os.path.join(self._dir.name, "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        with FetchDaemon(path, pool=FakePool({MATCH_URL: self.html})) as other:
+            self.assertIn("__NEXT_DATA__", DaemonClient(other.address).load_page(MATCH_URL, FetchStats(), None))
+
+    def test_other_files_left_alone(self):
+        path = os.path.join(self._dir.name, "notes.txt")
+        with open(path, "w") as f:
+            f.write("keep me")
+        with self.assertRaises(OSError):
+            FetchDaemon(path, pool=FakePool({}))
+        with open(path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        fake, self.pw = fake_playwright("<html>page</html>")
+        patcher = patch("playwright.async_api.async_playwright", fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = BrowserPool(browsers=2, contexts=3).start()
+        self.addCleanup(self.pool.stop)
+
+    def test_browsers_launched_once(self):
+        for _ in range(5):
+            self.assertEqual(self.pool.load("https://x/1"), (200, "<html>page</html>"))
+        self.assertEqual(self.pw.webkit.launch.await_count, 2)
+        self.assertEqual((self.pool.loads, self.pool.in_use), (5, 0))
+
+    def test_contexts_closed(self):
+        self.pool.load("https://x/1")
+        context = self.pool._browsers[0].new_context.return_value
+        context.close.assert_awaited_once()
+
+    def test_timed_out_load_cancelled(self):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        pages = [b.new_context.return_value.new_page.return_value for b in self.pool._browsers]
+        for page in pages:
+            page.goto = AsyncMock(side_effect=hang)
+        with self.assertRaises(concurrent.futures.TimeoutError):
+            self.pool._call(self.pool._load("https://x/1", 60000), 0.05)
+        for _ in range(100):
+            if self.pool.in_use == 0:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.pool.in_use, 0)
+        contexts = [b.new_context.return_value for b in self.pool._browsers]
+        self.assertEqual(sum(c.close.await_count for c in contexts), 1)
+
+    def test_crashed_browser_relaunched(self):
+        self.pool._browsers[0].is_connected.return_value = False
+        self.pool.load("https://x/1")
+        self.assertEqual(self.pw.webkit.launch.await_count, 3)
+
+    def test_stop_closes_browsers(self):
+        browsers = list(self.pool._browsers)
+        self.pool.stop()
+        for browser in browsers:
+            browser.close.assert_awaited_once()
+        self.pw.stop.assert_awaited_once()
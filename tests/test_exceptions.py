@@ -49,7 +49,7 @@ class TestPlayerExceptions(unittest.TestCase):
 
     def test_player_not_found(self):
         mock_404 = _mock_player_response(status_code=404)
-        with patch("espncricinfo.player.requests.get", return_value=mock_404):
+        with patch("espncricinfo.transport.get", return_value=mock_404):
             with self.assertRaises(PlayerNotFoundError):
                 Player(999999)
 
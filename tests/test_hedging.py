@@ -0,0 +1,342 @@
+import asyncio
+import json
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from espncricinfo import hedging, transport
+from espncricinfo.exceptions import DeadlineExceededError, MatchNotFoundError
+from espncricinfo.hedging import Deadline, LatencyWindow
+from espncricinfo.match import Match
+from espncricinfo.timing import FetchStats
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+class FakeAttempts(object):
+    """An attempt coroutine function playing back one behaviour per call."""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = []
+        self.cancelled = []
+
+    async def __call__(self, url, stats, timeout=60000):
+        n = len(self.calls)
+        self.calls.append(timeout)
+        delay, result = self.behaviours[n]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+def _async_load(attempt):
+    return hedging.load("https://www.espncricinfo.com/x", FetchStats(), attempt)
+
+
+def _load(attempt):
+    return asyncio.run(_async_load(attempt))
+
+
+class TestLatencyWindow(unittest.TestCase):
+
+    def test_percentile(self):
+        window = LatencyWindow()
+        self.assertIsNone(window.percentile(95))
+        for n in range(1, 101):
+            window.add(n / 10)
+        self.assertEqual(window.percentile(50), 5.0)
+        self.assertEqual(window.percentile(95), 9.5)
+        self.assertEqual(window.percentile(100), 10.0)
+
+    def test_keeps_recent_samples(self):
+        window = LatencyWindow(size=3)
+        for n in range(10):
+            window.add(n)
+        self.assertEqual(len(window), 3)
+        self.assertEqual(window.percentile(0), 7)
+
+
+class TestHedgeDelay(unittest.TestCase):
+
+    def tearDown(self):
+        hedging.reset()
+
+    def test_off_by_default(self):
+        self.assertIsNone(hedging.hedge_delay())
+
+    def test_fixed_delay_until_enough_samples(self):
+        hedging.configure(hedge=True, delay=5, min_samples=3, min_delay=0.5)
+        hedging.LATENCIES.add(1)
+        self.assertEqual(hedging.hedge_delay(), 5)
+        hedging.LATENCIES.add(2)
+        hedging.LATENCIES.add(3)
+        self.assertEqual(hedging.hedge_delay(), 3)
+        hedging.configure(percentile=50)
+        self.assertEqual(hedging.hedge_delay(), 2)
+        hedging.configure(min_delay=2.5)
+        self.assertEqual(hedging.hedge_delay(), 2.5)
+
+    def test_configure_rejects_unknown_option(self):
+        with self.assertRaises(TypeError):
+            hedging.configure(hedges=True)
+
+
+class TestLoad(unittest.TestCase):
+
+    def tearDown(self):
+        hedging.reset()
+
+    def test_single_attempt_by_default(self):
+        attempt = FakeAttempts((0, "<html>"))
+        self.assertEqual(_load(attempt), "<html>")
+        self.assertEqual(attempt.calls, [60000])
+        self.assertEqual(len(hedging.LATENCIES), 1)
+
+    def test_slow_attempt_is_hedged(self):
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        before = hedging.HEDGES.value(winner="hedge")
+        attempt = FakeAttempts((5, "first"), (0, "second"))
+        self.assertEqual(_load(attempt), "second")
+        self.assertEqual(attempt.cancelled, [0])
+        self.assertEqual(hedging.HEDGES.value(winner="hedge"), before + 1)
+
+    def test_first_attempt_can_still_win(self):
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        attempt = FakeAttempts((0.05, "first"), (5, "second"))
+        self.assertEqual(_load(attempt), "first")
+        self.assertEqual(attempt.cancelled, [1])
+
+    def test_fast_attempt_is_not_hedged(self):
+        hedging.configure(hedge=True, delay=1, min_delay=0)
+        attempt = FakeAttempts((0, "first"))
+        self.assertEqual(_load(attempt), "first")
+        self.assertEqual(len(attempt.calls), 1)
+
+    def test_failed_attempt_waits_for_hedge(self):
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        attempt = FakeAttempts((0.05, RuntimeError("crashed")), (0.1, "second"))
+        self.assertEqual(_load(attempt), "second")
+
+    def test_retries_with_backoff(self):
+        hedging.configure(retries=2, backoff=0.001)
+        before = hedging.RETRIES.value()
+        attempt = FakeAttempts((0, RuntimeError("1")), (0, RuntimeError("2")), (0, "third"))
+        self.assertEqual(_load(attempt), "third")
+        self.assertEqual(hedging.RETRIES.value(), before + 2)
+
+    def test_gives_up_after_retries(self):
+        hedging.configure(retries=1, backoff=0)
+        attempt = FakeAttempts((0, RuntimeError("1")), (0, RuntimeError("2")))
+        with self.assertRaisesRegex(RuntimeError, "2"):
+            _load(attempt)
+
+    def test_hedge_takes_its_own_slot(self):
+        transport.configure(adaptive=True, max_concurrency=8)
+        self.addCleanup(transport.reset)
+        _, limiter = transport.get_limits()
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        attempt = FakeAttempts((5, "first"), (0.05, "second"))
+        seen = []
+        asyncio.run(self._watch(_async_load(attempt), limiter, seen))
+        self.assertEqual(max(seen), 1)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def _watch(self, coro, limiter, seen):
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            seen.append(limiter.in_flight)
+            await asyncio.sleep(0.01)
+        return await task
+
+    def test_hedge_slot_released_when_deadline_passes(self):
+        transport.configure(adaptive=True, max_concurrency=8)
+        self.addCleanup(transport.reset)
+        _, limiter = transport.get_limits()
+        hedging.configure(hedge=True, delay=0.05, min_delay=0)
+        attempt = FakeAttempts((5, "first"), (0, "second"))
+        with Deadline(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                _load(attempt)
+        self.assertEqual(len(attempt.calls), 1)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_no_hedge_without_room(self):
+        transport.configure(adaptive=True, max_concurrency=1)
+        self.addCleanup(transport.reset)
+        _, limiter = transport.get_limits()
+        limiter.acquire()  # held by the first attempt's caller
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        attempt = FakeAttempts((0.1, "first"), (0, "second"))
+        self.assertEqual(_load(attempt), "first")
+        self.assertEqual(len(attempt.calls), 1)
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_no_hedge_without_rate_token(self):
+        transport.configure(rate=1, burst=1)
+        self.addCleanup(transport.reset)
+        bucket, _ = transport.get_limits()
+        bucket.acquire()
+        hedging.configure(hedge=True, delay=0.02, min_delay=0)
+        attempt = FakeAttempts((0.1, "first"), (0, "second"))
+        self.assertEqual(_load(attempt), "first")
+        self.assertEqual(len(attempt.calls), 1)
+
+    def test_retry_takes_rate_token(self):
+        transport.configure(rate=0.001, burst=10)
+        self.addCleanup(transport.reset)
+        bucket, _ = transport.get_limits()
+        hedging.configure(retries=1, backoff=0)
+        attempt = FakeAttempts((0, RuntimeError("1")), (0, "second"))
+        self.assertEqual(_load(attempt), "second")
+        self.assertAlmostEqual(bucket._tokens, 9, places=2)
+
+    def test_404_is_not_retried(self):
+        hedging.configure(retries=3, backoff=0)
+        attempt = FakeAttempts((0, MatchNotFoundError("gone")))
+        with self.assertRaises(MatchNotFoundError):
+            _load(attempt)
+        self.assertEqual(len(attempt.calls), 1)
+
+
+class TestDeadline(unittest.TestCase):
+
+    def tearDown(self):
+        hedging.reset()
+        transport.reset()
+
+    def test_scoped_to_thread_and_block(self):
+        self.assertIsNone(hedging.current_deadline())
+        outer, inner = Deadline(60), Deadline(30)
+        with outer:
+            with inner:
+                self.assertIs(hedging.current_deadline(), inner)
+            self.assertIs(hedging.current_deadline(), outer)
+        self.assertIsNone(hedging.current_deadline())
+
+    def test_caps_attempt_timeout(self):
+        attempt = FakeAttempts((0, "<html>"))
+        with Deadline(5):
+            _load(attempt)
+        self.assertLessEqual(attempt.calls[0], 5000)
+
+    def test_stuck_attempt_hits_deadline(self):
+        attempt = FakeAttempts((5, "late"))
+        started = time.monotonic()
+        with Deadline(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                _load(attempt)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(attempt.cancelled, [0])
+
+    def test_timeout_cut_by_deadline_is_deadline_exceeded(self):
+        class PageTimeoutError(Exception):
+            pass
+
+        hedging.configure(retries=2)
+        attempt = FakeAttempts((0.02, PageTimeoutError("Timeout 50ms exceeded")), (0, "<html>"))
+        with Deadline(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                _load(attempt)
+        self.assertEqual(len(attempt.calls), 1)
+
+    def test_http_timeout_cut_by_deadline_is_deadline_exceeded(self):
+        transport.configure(adaptive=True)
+        _, limiter = transport.get_limits()
+        before = limiter.limit
+        session = MagicMock()
+        session.get.side_effect = requests.ReadTimeout("read timed out")
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with Deadline(2):
+                with self.assertRaises(DeadlineExceededError):
+                    transport.get("http://core.espnuk.org/v2/")
+            with self.assertRaises(requests.ReadTimeout):
+                transport.get("http://core.espnuk.org/v2/")
+        self.assertEqual(limiter.limit, before / 2)
+
+    def test_http_deadline_error_counted_once(self):
+        from espncricinfo import metrics
+
+        before = metrics.ERRORS.value(type="DeadlineExceededError")
+        session = MagicMock()
+        session.get.side_effect = requests.ReadTimeout("read timed out")
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with Deadline(2):
+                with self.assertRaises(DeadlineExceededError):
+                    transport.get("http://core.espnuk.org/v2/")
+        self.assertEqual(metrics.ERRORS.value(type="DeadlineExceededError"), before + 1)
+
+    def test_expired_deadline_fails_before_fetching(self):
+        session = MagicMock()
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with Deadline(0):
+                with self.assertRaises(DeadlineExceededError):
+                    transport.get("http://core.espnuk.org/v2/")
+        session.get.assert_not_called()
+
+    def test_http_timeout_capped(self):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, content=b"")
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with Deadline(2):
+                transport.get("http://core.espnuk.org/v2/")
+        self.assertLessEqual(session.get.call_args.kwargs["timeout"], 2)
+
+    def test_urllib3_stops_retrying_at_deadline(self):
+        from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+        transport.reset()
+        retry = transport.get_session().get_adapter("http://x/").max_retries
+        error = ReadTimeoutError(None, "/", "read timed out")
+        self.assertGreater(retry.total, 0)
+        retry.increment("GET", "/", error=error)
+        with Deadline(30):
+            retry.increment("GET", "/", error=error)
+        with Deadline(0):
+            with self.assertRaises(MaxRetryError):
+                retry.increment("GET", "/", error=error)
+
+    def test_submit_runs_under_deadline(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        budget = Deadline(30)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self.assertIsNone(hedging.submit(pool, hedging.current_deadline).result())
+            with budget:
+                self.assertIs(hedging.submit(pool, hedging.current_deadline).result(), budget)
+
+    def test_player_sources_loaded_under_deadline(self):
+        from espncricinfo.player import Player
+
+        data = json.loads((FIXTURE_DIR / "player_253802.json").read_text())
+        seen = []
+
+        def get(url, headers=None, timeout=None):
+            seen.append(hedging.current_deadline())
+            return MagicMock(status_code=200, content=b"{}", text="<html></html>",
+                             json=MagicMock(return_value=data))
+
+        session = MagicMock()
+        session.get.side_effect = get
+        budget = Deadline(30)
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with budget:
+                Player(253802, preload=("new_json", "html"))
+        self.assertEqual(seen, [budget] * 3)
+
+    def test_match_page_load_uses_hedging(self):
+        html = (FIXTURE_DIR / "match_1478914.html").read_text()
+        attempt = FakeAttempts((0, html))
+        with patch("espncricinfo.match._async_load_page", new=attempt):
+            with Deadline(30):
+                m = Match(1478914, 1478874)
+        self.assertEqual(m.match_id, 1478914)
+        self.assertLessEqual(attempt.calls[0], 30000)
@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ("playwright", "bs4", "dateparser", "requests", "lxml", "multiprocessing", "asyncio")
+
+# Generous upper bound for importing every public module (~40ms locally);
+# importing the heavy dependencies eagerly took ~400ms.
+IMPORT_BUDGET_SECONDS = 0.25
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import espncricinfo.match, espncricinfo.player, espncricinfo.series, espncricinfo.summary
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(%r))
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+
+def _probe():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out)
+
+
+class TestImportTime(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = _probe()
+
+    def test_heavy_dependencies_not_imported(self):
+        self.assertEqual(self.result["heavy"], [])
+
+    def test_import_within_budget(self):
+        self.assertLess(self.result["elapsed"], IMPORT_BUDGET_SECONDS)
@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
+from espncricinfo import cache
 from espncricinfo.exceptions import MatchNotFoundError, NoScorecardError
 from espncricinfo.match import Match, _normalise
 
@@ -258,6 +259,18 @@ class TestMatchExceptions(unittest.TestCase):
             with self.assertRaises(MatchNotFoundError):
                 Match(9999999, 9999999)
 
+    def test_known_404_page_is_not_loaded_again(self):
+        cache.configure(remember_not_found=True)
+        self.addCleanup(cache.configure)
+        with patch(
+            "espncricinfo.match._browser_load_page",
+            side_effect=MatchNotFoundError("Match not found"),
+        ) as load:
+            for _ in range(2):
+                with self.assertRaises(MatchNotFoundError):
+                    Match(9999999, 9999999)
+        self.assertEqual(load.call_count, 1)
+
     def test_no_scorecard_error_on_bad_structure(self):
         bad_next_data = {"props": {"appPageProps": {"data": {}}}}
         with patch(
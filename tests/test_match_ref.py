@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import patch
-from espncricinfo.match_ref import MatchRef
+from espncricinfo.match_ref import MatchRef, MatchRefSet, MatchSummary
 
 
 class TestMatchRefFields(unittest.TestCase):
@@ -167,3 +167,205 @@ class TestGetRecentMatchesReturnsMatchRef(unittest.TestCase):
         for r in results:
             self.assertIsInstance(r, MatchRef)
             self.assertNotIsInstance(r, tuple)
+
+
+def _results_next_data():
+    """Wrap the fixture match object in the results page __NEXT_DATA__ shape."""
+    import json
+    from pathlib import Path
+
+    fixture_path = Path(__file__).parent / "fixtures" / "match_1478914_match.json"
+    match = json.load(open(fixture_path))
+    return {"props": {"appPageProps": {"data": {"data": {"content": {"matches": [
+        match,
+        {"objectId": 1},  # no series: skipped
+    ]}}}}}}
+
+
+class TestGetRecentMatchesReturnsMatchSummary(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from espncricinfo.match import Match
+
+        with patch("espncricinfo.match._playwright_fetch", return_value=_results_next_data()):
+            cls.results = Match.get_recent_matches("2026-02-21")
+
+    def test_malformed_entries_skipped(self):
+        self.assertEqual(len(self.results), 1)
+
+    def test_items_are_match_summaries_and_refs(self):
+        from espncricinfo.match_ref import MatchSummary
+
+        self.assertIsInstance(self.results[0], MatchSummary)
+        self.assertIsInstance(self.results[0], MatchRef)
+
+    def test_ids(self):
+        series_id, match_id = self.results[0]
+        self.assertEqual(series_id, 1478874)
+        self.assertEqual(match_id, 1478914)
+
+    def test_metadata(self):
+        s = self.results[0]
+        self.assertEqual(s.status, "result")
+        self.assertEqual(s.match_class, "WT20I")
+        self.assertEqual(s.status_text, "IND Women won by 17 runs")
+        self.assertEqual(s.start_date, "2026-02-21")
+        self.assertEqual(s.series_name, "India Women in Australia")
+        self.assertEqual(s.ground_name, "Adelaide Oval")
+        self.assertEqual(s.teams, ("IND Women", "AUS Women"))
+
+
+class TestMatchSummary(unittest.TestCase):
+
+    def setUp(self):
+        from espncricinfo.match_ref import MatchSummary
+
+        self.summary = MatchSummary(
+            series_id="1478874", match_id="1478914",
+            status="result", match_class="ODI", teams=["A", "B"],
+        )
+
+    def test_to_ref_returns_plain_match_ref(self):
+        ref = self.summary.to_ref()
+        self.assertIs(type(ref), MatchRef)
+        self.assertEqual(ref, MatchRef(series_id=1478874, match_id=1478914))
+
+    def test_teams_stored_as_tuple(self):
+        self.assertEqual(self.summary.teams, ("A", "B"))
+        hash(self.summary)
+
+    def test_equality_ignores_metadata(self):
+        from espncricinfo.match_ref import MatchSummary
+
+        other = MatchSummary(series_id=1478874, match_id=1478914, status="live")
+        self.assertEqual(self.summary, other)
+
+    def test_equals_match_ref_with_same_ids(self):
+        ref = MatchRef(series_id=1478874, match_id=1478914)
+        self.assertEqual(self.summary, ref)
+        self.assertEqual(ref, self.summary)
+        self.assertNotEqual(self.summary, MatchRef(series_id=1478874, match_id=1478913))
+        self.assertIn(self.summary, {ref})
+        self.assertIn(ref, {self.summary})
+
+    def test_dict_round_trip(self):
+        from espncricinfo.match_ref import MatchSummary
+
+        d = self.summary.to_dict()
+        self.assertEqual(d["teams"], ["A", "B"])
+        restored = MatchSummary.from_dict(d)
+        self.assertEqual(restored.match_class, "ODI")
+        self.assertEqual(restored.teams, ("A", "B"))
+
+    def test_csv_row_is_ref_compatible(self):
+        self.assertEqual(MatchRef.from_csv_row(self.summary.to_csv_row()), self.summary.to_ref())
+
+
+class TestMatchRefSet(unittest.TestCase):
+
+    def setUp(self):
+        self.refs = [MatchRef(1478874, 1478914), MatchRef(8048, 1144483), MatchRef(1478874, 1478913)]
+
+    def test_membership_and_dedup(self):
+        s = MatchRefSet(self.refs + self.refs)
+        self.assertEqual(len(s), 3)
+        self.assertIn(MatchRef(8048, 1144483), s)
+        self.assertIn((8048, 1144483), s)
+        self.assertNotIn(MatchRef(8048, 1478914), s)
+        self.assertNotIn("junk", s)
+        self.assertTrue(s.add(MatchRef(1, 2)))
+        self.assertFalse(s.add(MatchRef(1, 2)))
+
+    def test_iterates_match_refs_in_insertion_order(self):
+        self.assertEqual(list(MatchRefSet(self.refs)), self.refs)
+
+    def test_accepts_match_summaries(self):
+        s = MatchRefSet([MatchSummary(series_id=1, match_id=2, title="A v B")])
+        self.assertEqual(list(s), [MatchRef(1, 2)])
+
+    def test_grows_past_initial_table(self):
+        s = MatchRefSet((i // 10, i) for i in range(5000))
+        self.assertEqual(len(s), 5000)
+        self.assertTrue(all((i // 10, i) in s for i in range(5000)))
+        self.assertNotIn((0, 5000), s)
+
+    def test_sort(self):
+        s = MatchRefSet(self.refs)
+        s.sort()
+        self.assertEqual(list(s.match_ids), [1144483, 1478913, 1478914])
+        s.sort("series_id", reverse=True)
+        self.assertEqual(list(s)[0], MatchRef(1478874, 1478914))
+        self.assertIn(MatchRef(8048, 1144483), s)
+        with self.assertRaises(ValueError):
+            s.sort("date")
+
+    def test_set_operations(self):
+        seen = MatchRefSet(self.refs[:2])
+        listing = MatchRefSet(self.refs[1:])
+        self.assertEqual(list(listing - seen), [self.refs[2]])
+        self.assertEqual(list(seen & listing), [self.refs[1]])
+        self.assertEqual(len(seen | listing), 3)
+        self.assertEqual(seen ^ listing, MatchRefSet([self.refs[0], self.refs[2]]))
+        self.assertEqual(list(seen.difference(self.refs[1:])), [self.refs[0]])
+        seen |= listing
+        self.assertEqual(len(seen), 3)
+
+    def test_copy_is_independent(self):
+        s = MatchRefSet(self.refs)
+        c = s.copy()
+        c.add(MatchRef(1, 2))
+        self.assertEqual(len(s), 3)
+        self.assertNotIn(MatchRef(1, 2), s)
+
+    def test_ids_out_of_range(self):
+        with self.assertRaises(ValueError):
+            MatchRefSet([(1, 2 ** 32)])
+        with self.assertRaises(ValueError):
+            MatchRefSet([(-1, 2)])
+
+    def test_csv_round_trip_matches_match_ref_rows(self):
+        import csv
+        import os
+        import tempfile
+
+        s = MatchRefSet(self.refs)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "refs.csv")
+            s.to_csv(path, header=True)
+            with open(path, newline="") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[1:], [ref.to_csv_row() for ref in self.refs])
+            self.assertEqual([MatchRef.from_csv_row(r) for r in rows[1:]], self.refs)
+            self.assertEqual(list(MatchRefSet.from_csv(path)), self.refs)
+
+    def test_binary_round_trip(self):
+        import os
+        import tempfile
+
+        s = MatchRefSet(self.refs)
+        data = s.to_bytes()
+        self.assertEqual(len(data), 4 + 16 + 8 * 3 + 8 * 8)
+        loaded = MatchRefSet.from_bytes(data)
+        self.assertEqual(list(loaded), self.refs)
+        self.assertIn(self.refs[1], loaded)
+        self.assertTrue(loaded.add(MatchRef(1, 2)))
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "seen.bin")
+            s.save(path)
+            self.assertEqual(MatchRefSet.load(path), s)
+        with self.assertRaises(ValueError):
+            MatchRefSet.from_bytes(b"nope")
+        with self.assertRaises(ValueError):
+            MatchRefSet.from_bytes(data[:-4])
+        with self.assertRaises(ValueError):
+            MatchRefSet.from_bytes(data[:20] + data[20:44] + bytes(64))
+
+    def test_binary_version_1_still_read(self):
+        import struct
+
+        keys = [(r.series_id << 32) | r.match_id for r in self.refs]
+        data = b"MRS1" + struct.pack("<q", 3) + struct.pack("<3q", *keys)
+        s = MatchRefSet.from_bytes(data)
+        self.assertEqual(list(s), self.refs)
+        self.assertIn(self.refs[2], s)
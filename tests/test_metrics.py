@@ -0,0 +1,137 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import metrics
+from espncricinfo.cache import Cache
+from espncricinfo.exceptions import NoSeriesError, PlayerNotFoundError
+from espncricinfo.metrics import Counter, Histogram, Registry
+from espncricinfo.series import Series
+from espncricinfo.timing import FetchStats
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry()
+        self.requests = self.registry.counter("requests_total", "Requests.", ("endpoint",))
+        self.latency = self.registry.histogram("latency_seconds", "Latency.", (), buckets=(0.1, 1))
+
+    def test_counter(self):
+        self.requests.inc(endpoint="a")
+        self.requests.inc(2, endpoint="a")
+        self.requests.inc(endpoint="b")
+        self.assertEqual(self.requests.value(endpoint="a"), 3)
+        self.assertEqual(
+            self.registry.snapshot()["requests_total"],
+            [{"labels": {"endpoint": "a"}, "value": 3}, {"labels": {"endpoint": "b"}, "value": 1}],
+        )
+
+    def test_counter_rejects_wrong_labels(self):
+        with self.assertRaises(ValueError):
+            self.requests.inc(host="a")
+
+    def test_histogram_buckets_are_cumulative(self):
+        for value in (0.05, 0.5, 5):
+            self.latency.observe(value)
+        sample = self.registry.snapshot()["latency_seconds"][0]
+        self.assertEqual(sample["buckets"], {"0.1": 1, "1": 2, "+Inf": 3})
+        self.assertEqual(sample["count"], 3)
+        self.assertAlmostEqual(sample["sum"], 5.55)
+
+    def test_prometheus_text(self):
+        self.requests.inc(endpoint='x"y')
+        self.latency.observe(0.5)
+        text = self.registry.to_prometheus()
+        self.assertIn("# TYPE requests_total counter\n", text)
+        self.assertIn('requests_total{endpoint="x\\"y"} 1\n', text)
+        self.assertIn("# TYPE latency_seconds histogram\n", text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 0\n', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("latency_seconds_count 1\n", text)
+
+    def test_duplicate_names_rejected(self):
+        with self.assertRaises(ValueError):
+            self.registry.counter("requests_total", "Again.")
+
+    def test_reset(self):
+        self.requests.inc(endpoint="a")
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot()["requests_total"], [])
+
+    def test_histogram_has_no_inc(self):
+        with self.assertRaises(TypeError):
+            Histogram("h", "H.").inc()
+        self.assertIsInstance(Histogram("h", "H."), Counter)
+
+
+class TestLibraryMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.reset()
+
+    def test_error_types_exported_at_zero(self):
+        for name in ("MatchNotFoundError", "NoScorecardError", "NoSeriesError", "PlayerNotFoundError"):
+            self.assertEqual(metrics.ERRORS.value(type=name), 0)
+        self.assertIn('espncricinfo_errors_total{type="NoSeriesError"} 0', metrics.to_prometheus())
+
+    def test_spans_feed_fetch_and_phase_metrics(self):
+        stats = FetchStats()
+        with stats.span("http_get", "http://core.espnuk.org/v2/x") as span:
+            span.bytes = 100
+        with stats.span("goto", "https://www.espncricinfo.com/m"):
+            pass
+        with stats.span("content", "https://www.espncricinfo.com/m") as span:
+            span.bytes = 50
+        self.assertEqual(metrics.FETCHES.value(endpoint="core.espnuk.org"), 1)
+        self.assertEqual(metrics.FETCHES.value(endpoint="www.espncricinfo.com"), 1)
+        self.assertEqual(metrics.FETCH_SECONDS.value(endpoint="core.espnuk.org")["count"], 1)
+        self.assertEqual(metrics.BYTES.value(endpoint="core.espnuk.org"), 100)
+        self.assertEqual(metrics.BYTES.value(endpoint="www.espncricinfo.com"), 50)
+        self.assertEqual(metrics.PHASE_SECONDS.value(phase="content")["count"], 1)
+
+    def test_span_errors_counted(self):
+        with self.assertRaises(TimeoutError):
+            with FetchStats().span("goto", "https://www.espncricinfo.com/m"):
+                raise TimeoutError
+        self.assertEqual(metrics.ERRORS.value(type="TimeoutError"), 1)
+
+    def test_series_404_counted(self):
+        response = MagicMock(status_code=404, content=b"")
+        with patch("espncricinfo.transport.get_session") as session:
+            session.return_value.get.return_value = response
+            with self.assertRaises(NoSeriesError):
+                Series(1)
+        self.assertEqual(metrics.ERRORS.value(type="NoSeriesError"), 1)
+        self.assertEqual(metrics.FETCHES.value(endpoint="core.espnuk.org"), 1)
+
+    def test_record_error_returns_exception(self):
+        exc = PlayerNotFoundError()
+        self.assertIs(metrics.record_error(exc), exc)
+        self.assertEqual(metrics.ERRORS.value(type="PlayerNotFoundError"), 1)
+
+    def test_cache_hits_misses_and_evictions(self):
+        c = Cache(namespace="metrics-test", maxsize=1, ttl=10)
+        c.get("a")
+        c.set("a", 1)
+        c.get("a")
+        c.set("b", 2)
+        with patch("espncricinfo.cache.time.time", return_value=1e12):
+            c.get("b")
+        self.assertEqual(metrics.CACHE_HITS.value(namespace="metrics-test"), 1)
+        self.assertEqual(metrics.CACHE_MISSES.value(namespace="metrics-test"), 2)
+        self.assertEqual(metrics.CACHE_EVICTIONS.value(namespace="metrics-test"), 2)
+
+    def test_sqlite_cache_evictions(self):
+        c = Cache(":memory:", namespace="metrics-sqlite", maxsize=1)
+        c.set("a", 1)
+        c.set("b", 2)
+        self.assertEqual(metrics.CACHE_EVICTIONS.value(namespace="metrics-sqlite"), 1)
+        self.assertFalse("a" in c)
+        self.assertEqual(metrics.CACHE_MISSES.value(namespace="metrics-sqlite"), 0)
+
+    def test_endpoint(self):
+        self.assertEqual(metrics.endpoint("https://stats.espncricinfo.com/ci/x"), "stats.espncricinfo.com")
+        self.assertEqual(metrics.endpoint(None), "unknown")
@@ -1,4 +1,5 @@
 import json
+import threading
 import unittest
 import warnings
 from pathlib import Path
@@ -6,6 +7,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from espncricinfo import cache
 from espncricinfo.exceptions import PlayerNotFoundError
 from espncricinfo.player import Player
 
@@ -29,11 +31,13 @@ def _mock_response(json_data=None, text=None, status_code=200):
     return mock
 
 
-def _make_player():
+def _side_effect(calls=None):
     json_data = _load("player_253802.json")
     new_json = _load("player_253802_new.json")
 
-    def side_effect(url, headers=None):
+    def side_effect(url, headers=None, **kwargs):
+        if calls is not None:
+            calls.append(url)
         if "hs-consumer-api" in url:
             return _mock_response(json_data=new_json)
         elif "espnuk.org" in url:
@@ -41,8 +45,12 @@ def _make_player():
         else:
             return _mock_response(text="<html><body></body></html>")
 
-    with patch("espncricinfo.player.requests.get", side_effect=side_effect):
-        return Player(253802)
+    return side_effect
+
+
+def _make_player():
+    with patch("espncricinfo.transport.get", side_effect=_side_effect()):
+        return Player(253802, preload=("new_json",))
 
 
 class TestPlayerAttributes(unittest.TestCase):
@@ -97,9 +105,179 @@ class TestPlayerErrors(unittest.TestCase):
 
     def test_404_raises_player_not_found(self):
         mock_404 = _mock_response(status_code=404)
-        with patch("espncricinfo.player.requests.get", return_value=mock_404):
+        with patch("espncricinfo.transport.get", return_value=mock_404):
+            with self.assertRaises(PlayerNotFoundError):
+                Player(999999)
+
+    def test_known_404_fails_without_request(self):
+        cache.configure(remember_not_found=True)
+        self.addCleanup(cache.configure)
+        mock_404 = _mock_response(status_code=404)
+        with patch("espncricinfo.transport.get", return_value=mock_404) as get:
+            with self.assertRaises(PlayerNotFoundError):
+                Player(999999)
             with self.assertRaises(PlayerNotFoundError):
                 Player(999999)
+        self.assertEqual(get.call_count, 1)
+
+
+class TestPlayerLazyLoading(unittest.TestCase):
+
+    def test_construction_fetches_only_core_json(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            player = Player(253802)
+        self.assertEqual(calls, [player.json_url])
+
+    def test_major_teams_fetches_new_json_on_first_access(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            player = Player(253802)
+            player.major_teams
+            player.major_teams
+        self.assertEqual(calls, [player.json_url, player.new_json_url])
+
+    def test_html_fetched_on_access(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            player = Player(253802)
+            self.assertIsNotNone(player.parsed_html)
+        self.assertIn(player.url, calls)
+
+    def test_preload_fetches_all_sources(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            player = Player(253802, preload=("html", "new_json"))
+        self.assertEqual(
+            sorted(calls), sorted([player.url, player.json_url, player.new_json_url])
+        )
+
+    def test_load_skips_loaded_sources(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            player = Player(253802)
+            player.load("json", "new_json")
+        self.assertEqual(calls, [player.json_url, player.new_json_url])
+
+    def test_players_load_concurrently(self):
+        with patch("espncricinfo.transport.get", side_effect=_side_effect()):
+            players = [Player(253802), Player(253802)]
+            both_loading = threading.Barrier(2, timeout=5)
+            errors = []
+
+            def get_new_json(player):
+                # Only returns once the other player is loading too.
+                both_loading.wait()
+                return {}
+
+            def load(player):
+                try:
+                    player.major_teams
+                except Exception as exc:
+                    errors.append(exc)
+
+            with patch.object(Player, "get_new_json", autospec=True,
+                              side_effect=get_new_json):
+                with patch.object(Player, "_major_teams", autospec=True,
+                                  side_effect=lambda player: player.new_json):
+                    threads = [threading.Thread(target=load, args=(p,)) for p in players]
+                    for t in threads:
+                        t.start()
+                    for t in threads:
+                        t.join()
+        self.assertEqual(errors, [])
+
+    def test_load_rejects_unknown_source(self):
+        with patch("espncricinfo.transport.get", side_effect=_side_effect()):
+            player = Player(253802)
+        with self.assertRaises(ValueError):
+            player.load("stats")
+
+    def test_preload_404_raises_player_not_found(self):
+        def side_effect(url, headers=None, **kwargs):
+            if "hs-consumer-api" in url:
+                return _mock_response(status_code=404)
+            return _side_effect()(url, headers)
+
+        with patch("espncricinfo.transport.get", side_effect=side_effect):
+            with self.assertRaises(PlayerNotFoundError):
+                Player(253802, preload=("new_json",))
+
+
+class TestPlayerFetchMany(unittest.TestCase):
+
+    def test_fetch_many_returns_players_in_order(self):
+        from espncricinfo.cache import Cache
+
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            players = Player.fetch_many([253802, "253802"], concurrency=2, cache=Cache())
+        self.assertEqual(len(players), 2)
+        self.assertIs(players[0], players[1])
+        self.assertEqual(players[0].cricinfo_id, "253802")
+        self.assertEqual(len(calls), 1)
+
+    def test_fetch_many_uses_cache(self):
+        from espncricinfo.cache import Cache
+
+        profiles = Cache()
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_side_effect(calls)):
+            Player.fetch_many([253802], cache=profiles, preload=("new_json",))
+            players = Player.fetch_many([253802], cache=profiles, preload=("new_json",))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(players[0].major_teams, ["India", "Royal Challengers Bangalore"])
+
+    def test_fetch_many_missing_player_is_none(self):
+        from espncricinfo.cache import Cache
+
+        def side_effect(url, headers=None, **kwargs):
+            if "999999" in url:
+                return _mock_response(status_code=404)
+            return _side_effect()(url, headers)
+
+        with patch("espncricinfo.transport.get", side_effect=side_effect):
+            players = Player.fetch_many([999999, 253802], cache=Cache())
+        self.assertIsNone(players[0])
+        self.assertIsInstance(players[1], Player)
+
+
+class TestPlayerCareerStats(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.player = _make_player()
+
+    def setUp(self):
+        from espncricinfo import cache
+
+        cache.get_cache("stats").clear()
+        self.stats_page = _mock_response(text=_load("player_253802_stats.html"))
+
+    def test_averages_and_summary_share_one_download(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("espncricinfo.transport.get", return_value=self.stats_page) as get:
+                averages = self.player.get_career_averages(os.path.join(tmp, "a.csv"), 1, "batting")
+                summary = self.player.get_career_summary(os.path.join(tmp, "s.csv"), 1, "batting")
+            self.assertTrue(os.path.exists(os.path.join(tmp, "a.csv")))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "s.csv")))
+        get.assert_called_once()
+        self.assertEqual(averages.rows[0]["Runs"], 9230)
+        self.assertEqual(len(summary), 3)
+
+    def test_get_stats_without_file_returns_rows(self):
+        with patch("espncricinfo.transport.get", return_value=self.stats_page):
+            table = self.player.get_stats(1, "batting", view="innings")
+        self.assertIn(";view=innings", self.player.stats_url)
+        self.assertEqual(table.rows[0]["column_0"], "v Australia")
+
+    def test_iter_stats_streams_rows(self):
+        with patch("espncricinfo.transport.get", return_value=self.stats_page):
+            rows = list(self.player.iter_stats(1, "batting"))
+        self.assertEqual(len(rows), 3)
 
 
 class TestPlayerIntegration:
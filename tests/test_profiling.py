@@ -0,0 +1,72 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from espncricinfo import profiling
+from espncricinfo.match import Match
+from espncricinfo.profiling import MATCH_COMPONENTS, MemoryReport, deep_sizeof
+
+FIXTURE = Path(__file__).parent / "fixtures" / "match_1478914_next_data.json"
+
+
+def _make_match(next_data):
+    with patch("espncricinfo.match._playwright_fetch", return_value=next_data):
+        return Match(1478914, 1478874)
+
+
+class TestDeepSizeof(unittest.TestCase):
+
+    def test_counts_nested_containers(self):
+        inner = ["x" * 100]
+        obj = {"a": inner}
+        self.assertGreaterEqual(deep_sizeof(obj), sys.getsizeof(obj) + sys.getsizeof(inner) + 100)
+
+    def test_shared_objects_counted_once(self):
+        shared = "y" * 1000
+        seen = set()
+        first = deep_sizeof([shared], seen)
+        second = deep_sizeof([shared], seen)
+        self.assertGreater(first, 1000)
+        self.assertLess(second, 1000)
+
+    def test_follows_instance_attributes(self):
+        class Holder(object):
+            def __init__(self):
+                self.payload = "z" * 1000
+
+        self.assertGreater(deep_sizeof(Holder()), 1000)
+
+
+class TestMatchMemory(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE) as f:
+            cls.raw = f.read()
+
+    def test_breakdown_by_component(self):
+        report = profiling.match_memory(_make_match(json.loads(self.raw)))
+        for name in MATCH_COMPONENTS + ("json (other)", "derived"):
+            self.assertIn(name, report.components)
+            self.assertGreater(report.components[name], 0)
+        self.assertEqual(report.total, sum(report.components.values()))
+        # The raw commentary/scorecard document dominates
+        self.assertEqual(max(report.components, key=report.components.get), "_content")
+        self.assertIsNone(report.retained)
+
+    def test_profile_match_traces_retained_and_peak(self):
+        report = profiling.profile_match(lambda: _make_match(json.loads(self.raw)))
+        self.assertGreater(report.retained, 0)
+        self.assertGreaterEqual(report.peak, report.retained)
+        # The decoded page is kept alive by the match, so tracemalloc and
+        # the object walk should roughly agree.
+        self.assertAlmostEqual(report.retained / report.total, 1, delta=0.25)
+
+    def test_report_format_and_dict(self):
+        report = MemoryReport(components={"_content": 2048}, retained=1024, peak=4096)
+        text = report.format()
+        self.assertIn("_content", text)
+        self.assertIn("retained", text)
+        self.assertEqual(report.as_dict()["total"], 2048)
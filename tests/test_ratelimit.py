@@ -0,0 +1,205 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import ratelimit, transport
+from espncricinfo.match import Match
+from espncricinfo.ratelimit import AdaptiveLimiter, Slot, TokenBucket
+from espncricinfo.timing import FetchStats
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+class FakeClock(object):
+    """Stands in for time.monotonic/time.time and time.sleep, advancing on sleep."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        for name, fn in (("monotonic", self.clock.time), ("time", self.clock.time),
+                         ("sleep", self.clock.sleep)):
+            patcher = patch(f"espncricinfo.ratelimit.time.{name}", side_effect=fn)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+
+    def test_refills_while_idle(self):
+        bucket = TokenBucket(rate=1, burst=2)
+        bucket.acquire(2)
+        self.clock.now += 10
+        self.assertEqual([bucket.acquire(), bucket.acquire()], [0.0, 0.0])
+
+    def test_timeout_takes_nothing(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.acquire()
+        self.assertIsNone(bucket.acquire(timeout=0.5))
+        self.assertAlmostEqual(bucket.acquire(timeout=1), 1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    @unittest.skipUnless(hasattr(os, "pread"), "needs a POSIX file lock")
+    def test_file_shared_between_buckets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rate")
+            first = TokenBucket(rate=1, burst=2, path=path)
+            second = TokenBucket(rate=1, burst=2, path=path)
+            self.assertEqual(first.acquire(), 0.0)
+            self.assertEqual(second.acquire(), 0.0)
+            self.assertAlmostEqual(first.acquire(), 1.0)
+
+
+class TestClassify(unittest.TestCase):
+
+    def test_outcomes(self):
+        self.assertEqual(ratelimit.classify(status=200), ratelimit.OK)
+        self.assertEqual(ratelimit.classify(status=404), ratelimit.OK)
+        self.assertEqual(ratelimit.classify(status=429), ratelimit.THROTTLED)
+        self.assertEqual(ratelimit.classify(status=403), ratelimit.THROTTLED)
+        self.assertEqual(ratelimit.classify(exc=TimeoutError()), ratelimit.THROTTLED)
+        ReadTimeout = type("ReadTimeout", (IOError,), {})
+        self.assertEqual(ratelimit.classify(exc=ReadTimeout()), ratelimit.THROTTLED)
+        self.assertEqual(ratelimit.classify(exc=ValueError()), ratelimit.ERROR)
+
+    def test_is_timeout(self):
+        import requests
+
+        for exc in (TimeoutError(), requests.ReadTimeout(), requests.ConnectTimeout()):
+            self.assertTrue(ratelimit.is_timeout(exc), exc)
+        self.assertFalse(ratelimit.is_timeout(requests.ConnectionError()))
+        self.assertFalse(ratelimit.is_timeout(None))
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+
+    def finish(self, limiter, outcome, started=None):
+        limiter.acquire()
+        slot = Slot()
+        if started is not None:
+            slot.started = started
+        limiter.release(slot, outcome)
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(initial=2, maximum=3)
+        self.finish(limiter, ratelimit.OK)
+        self.assertAlmostEqual(limiter.limit, 2.5)
+        for _ in range(10):
+            self.finish(limiter, ratelimit.OK)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_multiplicative_decrease(self):
+        limiter = AdaptiveLimiter(initial=8, minimum=2)
+        self.finish(limiter, ratelimit.THROTTLED)
+        self.assertEqual(limiter.limit, 4)
+        self.finish(limiter, ratelimit.THROTTLED)
+        self.finish(limiter, ratelimit.THROTTLED)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_one_decrease_per_round(self):
+        limiter = AdaptiveLimiter(initial=8)
+        slots = []
+        for _ in range(3):
+            limiter.acquire()
+            slots.append(Slot())
+        for slot in slots:
+            limiter.release(slot, ratelimit.THROTTLED)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_slow_response_decreases(self):
+        limiter = AdaptiveLimiter(initial=8, slow=5)
+        self.finish(limiter, ratelimit.OK, started=ratelimit.time.monotonic() - 10)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_errors_leave_limit(self):
+        limiter = AdaptiveLimiter(initial=4)
+        self.finish(limiter, ratelimit.ERROR)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        limiter = AdaptiveLimiter(initial=1)
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        threading.Timer(0.02, limiter.release, (Slot(), ratelimit.ERROR)).start()
+        self.assertTrue(limiter.acquire(timeout=5))
+
+
+class TestTransportLimits(unittest.TestCase):
+
+    def tearDown(self):
+        transport.reset()
+
+    def get(self, status=200, stats=None):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=status, content=b"")
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            return transport.get("http://core.espnuk.org/v2/", stats=stats)
+
+    def test_no_limits_by_default(self):
+        self.assertEqual(transport.get_limits(), (None, None))
+        stats = FetchStats()
+        self.get(stats=stats)
+        self.assertEqual([s.name for s in stats.spans], ["http_get"])
+
+    def test_rate_limit_recorded_as_span(self):
+        transport.configure(rate=100, burst=1)
+        bucket, _ = transport.get_limits()
+        self.assertEqual((bucket.rate, bucket.burst), (100, 1))
+        stats = FetchStats()
+        self.get(stats=stats)
+        self.assertEqual([s.name for s in stats.spans], ["throttle_wait", "http_get"])
+
+    def test_throttled_response_cuts_concurrency(self):
+        transport.configure(adaptive=True, max_concurrency=8)
+        _, limiter = transport.get_limits()
+        before = limiter.limit
+        self.get(status=429)
+        self.assertEqual(limiter.limit, before / 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_timeout_cuts_concurrency(self):
+        transport.configure(adaptive=True)
+        _, limiter = transport.get_limits()
+        before = limiter.limit
+        session = MagicMock()
+        session.get.side_effect = TimeoutError("read timed out")
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            with self.assertRaises(TimeoutError):
+                transport.get("http://core.espnuk.org/v2/")
+        self.assertEqual(limiter.limit, before / 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_configure_starts_limits_afresh(self):
+        transport.configure(adaptive=True)
+        first = transport.get_limits()[1]
+        transport.configure(adaptive=True)
+        self.assertIsNot(first, transport.get_limits()[1])
+
+    def test_page_loads_are_limited(self):
+        transport.configure(rate=100, adaptive=True)
+        html = (FIXTURE_DIR / "match_1478914.html").read_text()
+        with patch("espncricinfo.match._browser_load_page", return_value=html):
+            m = Match(1478914, 1478874)
+        self.assertEqual(m.fetch_stats.spans[0].name, "throttle_wait")
+        self.assertEqual(transport.get_limits()[1].in_flight, 0)
@@ -0,0 +1,151 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from espncricinfo import replay, transport
+from espncricinfo.cache import Cache
+from espncricinfo.exceptions import MatchNotFoundError, PlayerNotFoundError, ReplayMissError
+from espncricinfo.match import Match
+from espncricinfo.player import Player
+from espncricinfo.replay import Archive
+from espncricinfo.series import Series
+from espncricinfo import stats
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+BENCHMARKS = Path(__file__).parent.parent / "benchmarks"
+MATCH_URL = "https://www.espncricinfo.com/series/x-1478874/x-1478914/full-scorecard"
+
+
+def _load(name):
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, BENCHMARKS / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def _match_archive():
+    archive = Archive()
+    with open(FIXTURE_DIR / "match_1478914.html") as f:
+        archive.add(replay.PAGE, MATCH_URL, 200, f.read())
+    return archive
+
+
+class TestArchive(unittest.TestCase):
+
+    def test_round_trip(self):
+        archive = Archive()
+        archive.add(replay.HTTP, "http://a/", 200, b'{"x": 1}', {"Content-Type": "application/json"})
+        archive.add(replay.HTTP, "http://b/", 200, b"\xff\xfe")
+        archive.add(replay.PAGE, "http://c/", 404, "")
+        with tempfile.TemporaryDirectory() as d:
+            for name in ("a.jsonl", "a.jsonl.gz"):
+                path = os.path.join(d, name)
+                archive.save(path)
+                loaded = Archive.load(path)
+                self.assertEqual(len(loaded), 3)
+                self.assertEqual(Archive.body(loaded.get(replay.HTTP, "http://b/")), b"\xff\xfe")
+                self.assertEqual(loaded.get(replay.PAGE, "http://c/")["status"], 404)
+
+    def test_missing_entry(self):
+        with self.assertRaises(ReplayMissError):
+            Archive().get(replay.HTTP, "http://a/")
+
+    def test_later_response_replaces_earlier(self):
+        archive = Archive()
+        archive.add(replay.HTTP, "http://a/", 500, "")
+        archive.add(replay.HTTP, "http://a/", 200, "ok")
+        self.assertEqual(archive.get(replay.HTTP, "http://a/")["status"], 200)
+
+
+class TestReplayPages(unittest.TestCase):
+
+    def test_match_replayed_without_browser(self):
+        with replay.replay(_match_archive()):
+            m = Match(1478914, 1478874)
+        self.assertEqual(m.match_id, 1478914)
+        self.assertEqual(
+            [s.name for s in m.fetch_stats.spans],
+            ["goto", "content", "extract", "json_decode", "normalise"],
+        )
+        self.assertIsNone(transport.get_backend())
+
+    def test_recorded_404(self):
+        archive = Archive()
+        archive.add(replay.PAGE, MATCH_URL, 404, "")
+        with replay.replay(archive):
+            with self.assertRaises(MatchNotFoundError):
+                Match(1478914, 1478874)
+
+    def test_unrecorded_page(self):
+        with replay.replay(Archive()):
+            with self.assertRaises(ReplayMissError):
+                Match(1478914, 1478874)
+
+    def test_recorder_stores_pages_and_404s(self):
+        recorder = replay.Recorder()
+        self.assertEqual(recorder.load_page("http://a/", None, lambda url, stats: "<html/>"), "<html/>")
+
+        def not_found(url, stats):
+            raise MatchNotFoundError
+
+        with self.assertRaises(MatchNotFoundError):
+            recorder.load_page("http://b/", None, not_found)
+        self.assertEqual(recorder.archive.get(replay.PAGE, "http://a/")["text"], "<html/>")
+        self.assertEqual(recorder.archive.get(replay.PAGE, "http://b/")["status"], 404)
+
+
+class TestRecordAndReplayHTTP(unittest.TestCase):
+    """Record a workload against the stand-in server, then replay it with the server gone."""
+
+    def test_round_trip(self):
+        standin = _load("standin")
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "workload.jsonl.gz")
+            with standin.StandinServer() as server:
+                transport.configure(hosts=server.hosts(), retries=0)
+                try:
+                    with replay.record(path) as recorder:
+                        recorded_player = Player(253802, preload=("new_json",))
+                        recorded_events = Series(1478874).events
+                        recorded_stats = stats.get_tables(253802, 1, "batting", cache=Cache())
+                        with self.assertRaises(PlayerNotFoundError):
+                            Player(1)
+                finally:
+                    transport.reset()
+            self.assertEqual(len(recorder.archive), 7)
+
+            with replay.replay(path):
+                player = Player(253802, preload=("new_json",))
+                events = Series(1478874).events
+                tables = stats.get_tables(253802, 1, "batting", cache=Cache())
+                with self.assertRaises(PlayerNotFoundError):
+                    Player(1)
+                with self.assertRaises(ReplayMissError):
+                    Player(2)
+        self.assertEqual(player.json, recorded_player.json)
+        self.assertEqual(player.major_teams, recorded_player.major_teams)
+        self.assertEqual(events, recorded_events)
+        self.assertEqual(tables["averages"].rows, recorded_stats["averages"].rows)
+        self.assertEqual(player.fetch_stats.spans[0].name, "http_get")
+
+    def test_append(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "a.jsonl")
+            _match_archive().save(path)
+            with replay.record(path, append=True) as recorder:
+                recorder.archive.add(replay.HTTP, "http://a/", 200, "")
+            self.assertEqual(len(Archive.load(path)), 2)
+
+
+class TestLoadTestReplay(unittest.TestCase):
+
+    def test_run_replay(self):
+        loadtest = _load("loadtest")
+        results = loadtest.run_replay(_match_archive(), ["match"], [2], 4)
+        self.assertEqual(results[0]["errors"], {})
+        self.assertEqual(results[0]["workload"], "match")
@@ -1,6 +1,8 @@
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
+from espncricinfo import cache
 from espncricinfo.exceptions import NoSeriesError
 from espncricinfo.series import Series
 
@@ -15,11 +17,21 @@ def _mock_response(status_code=200, json_data=None):
 class TestSeriesNotFound(unittest.TestCase):
 
     def test_series_not_found_raises_no_series_error(self):
-        with patch("espncricinfo.series.requests.get",
+        with patch("espncricinfo.transport.get",
                    return_value=_mock_response(status_code=404)):
             with self.assertRaises(NoSeriesError):
                 Series(9999999)
 
+    def test_known_404_fails_without_request(self):
+        cache.configure(remember_not_found=True)
+        self.addCleanup(cache.configure)
+        with patch("espncricinfo.transport.get",
+                   return_value=_mock_response(status_code=404)) as get:
+            for _ in range(2):
+                with self.assertRaises(NoSeriesError):
+                    Series(9999999)
+        self.assertEqual(get.call_count, 1)
+
 
 def _mock_series_response():
     """A minimal valid series JSON."""
@@ -46,7 +58,7 @@ def _mock_events_response():
 class TestSeriesHappyPath(unittest.TestCase):
 
     def test_series_name_populated(self):
-        def side_effect(url, headers=None):
+        def side_effect(url, headers=None, **kwargs):
             if url.endswith("/seasons"):
                 return _mock_seasons_response()
             elif url.endswith("/events"):
@@ -54,8 +66,158 @@ class TestSeriesHappyPath(unittest.TestCase):
             else:
                 return _mock_series_response()
 
-        with patch("espncricinfo.series.requests.get", side_effect=side_effect):
+        with patch("espncricinfo.transport.get", side_effect=side_effect):
             s = Series(1478874)
             self.assertEqual(s.name, "India Women in Australia")
             self.assertEqual(s.short_name, "IND-W in AUS")
             self.assertFalse(s.is_tournament)
+
+
+EVENT_REFS = [
+    "http://core.espnuk.org/v2/sports/cricket/leagues/1478874/events/{0}".format(i)
+    for i in (1478912, 1478913, 1478914)
+]
+
+
+def _events_side_effect(calls):
+    def side_effect(url, headers=None, **kwargs):
+        calls.append(url)
+        if url.endswith("/seasons"):
+            return _mock_seasons_response()
+        elif url.endswith("/events"):
+            return _mock_response(json_data={"items": [{"$ref": u} for u in EVENT_REFS]})
+        elif "/events/" in url:
+            # Later events answer first to exercise ordering
+            import time
+            event_id = int(url.rsplit("/", 1)[1])
+            time.sleep((1478914 - event_id) * 0.01)
+            return _mock_response(json_data={"id": str(event_id)})
+        else:
+            return _mock_series_response()
+    return side_effect
+
+
+class TestSeriesEvents(unittest.TestCase):
+
+    def test_events_expanded_in_order(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_events_side_effect(calls)):
+            s = Series(1478874, max_workers=3)
+            events = s.events
+        self.assertEqual([e["id"] for e in events], ["1478912", "1478913", "1478914"])
+
+    def test_event_refs_are_match_refs(self):
+        from espncricinfo.match_ref import MatchRef
+
+        with patch("espncricinfo.transport.get", side_effect=_events_side_effect([])):
+            s = Series(1478874)
+            refs = s.event_refs
+        self.assertEqual(refs[0], MatchRef(series_id=1478874, match_id=1478912))
+        self.assertEqual(len(refs), 3)
+
+    def test_expand_events_false_skips_event_requests(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_events_side_effect(calls)):
+            s = Series(1478874, expand_events=False)
+            events = s.events
+        self.assertFalse([u for u in calls if "/events/" in u])
+        self.assertEqual(events, s.event_refs)
+
+    def test_series_load_events_concurrently(self):
+        with patch("espncricinfo.transport.get", side_effect=_events_side_effect([])):
+            series = [Series(1478874), Series(1478874)]
+        both_loading = threading.Barrier(2, timeout=5)
+        errors = []
+
+        def get_events(s):
+            # Only returns once the other series is loading too.
+            both_loading.wait()
+            return []
+
+        def load(s):
+            try:
+                s.events
+            except Exception as exc:
+                errors.append(exc)
+
+        with patch.object(Series, "_get_events", autospec=True, side_effect=get_events):
+            threads = [threading.Thread(target=load, args=(s,)) for s in series]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(errors, [])
+
+    def test_event_error_propagates(self):
+        def side_effect(url, headers=None, **kwargs):
+            if "/events/" in url:
+                return _mock_response(status_code=404)
+            return _events_side_effect([])(url, headers)
+
+        with patch("espncricinfo.transport.get", side_effect=side_effect):
+            s = Series(1478874)
+            with self.assertRaises(NoSeriesError):
+                s.events
+
+
+SEASONS_BASE = "http://core.espnuk.org/v2/sports/cricket/leagues/8048/seasons"
+
+
+def _paged_side_effect(calls, page_count=3):
+    """Serve seasons and events listings split over ``page_count`` pages."""
+    def side_effect(url, headers=None, **kwargs):
+        calls.append(url)
+        page = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+        if "/seasons" in url:
+            items = [{"$ref": f"{SEASONS_BASE}/{2007 + page}"}]
+        elif "/events/" in url:
+            return _mock_response(json_data={"id": url.rsplit("/", 1)[1]})
+        elif "/events" in url:
+            items = [
+                {"$ref": f"http://core.espnuk.org/v2/sports/cricket/leagues/8048/events/{page}0{i}"}
+                for i in range(2)
+            ]
+        else:
+            return _mock_series_response()
+        return _mock_response(json_data={
+            "count": page_count * len(items), "pageIndex": page,
+            "pageSize": len(items), "pageCount": page_count, "items": items,
+        })
+    return side_effect
+
+
+class TestSeriesPagination(unittest.TestCase):
+
+    def test_constructor_fetches_only_league(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect(calls)):
+            Series(8048)
+        self.assertEqual(calls, ["http://core.espnuk.org/v2/sports/cricket/leagues/8048/"])
+
+    def test_iter_seasons_follows_pages(self):
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect([])):
+            s = Series(8048)
+            seasons = list(s.iter_seasons())
+            years = s.years
+        self.assertEqual(len(seasons), 3)
+        self.assertEqual(years, ["2008", "2009", "2010"])
+
+    def test_iter_events_refs_across_pages(self):
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect([])):
+            refs = list(Series(8048).iter_events(expand=False))
+        self.assertEqual([r.match_id for r in refs], [100, 101, 200, 201, 300, 301])
+
+    def test_iter_events_expanded_across_pages(self):
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect([])):
+            events = list(Series(8048).iter_events())
+        self.assertEqual([e["id"] for e in events], ["100", "101", "200", "201", "300", "301"])
+
+    def test_iter_events_is_lazy(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect(calls)):
+            it = Series(8048).iter_events(expand=False)
+            next(it)
+            it.close()
+        listing_pages = [u for u in calls if "/events" in u and "/events/" not in u]
+        # first page plus at most the prefetched second page
+        self.assertLessEqual(len(listing_pages), 2)
@@ -0,0 +1,120 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+from espncricinfo import stats, transport
+from espncricinfo.cache import Cache
+from espncricinfo.exceptions import NoSeriesError, PlayerNotFoundError
+from espncricinfo.match import _extract_next_data, _normalise
+from espncricinfo.player import Player
+from espncricinfo.series import Series
+
+BENCHMARKS = Path(__file__).parent.parent / "benchmarks"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, BENCHMARKS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+standin = _load("standin")
+loadtest = _load("loadtest")
+
+
+class StandinTestCase(unittest.TestCase):
+
+    server_options = {}
+
+    def setUp(self):
+        self.server = standin.StandinServer(seed=0, **self.server_options).start()
+        transport.configure(hosts=self.server.hosts(), retries=0)
+
+    def tearDown(self):
+        transport.reset()
+        self.server.stop()
+
+
+class TestStandinServer(StandinTestCase):
+
+    def test_player_from_stand_in(self):
+        p = Player(253802, preload=("new_json",))
+        self.assertEqual(p.player_id, 253802)
+        self.assertTrue(p.major_teams is not None)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_unknown_player_404(self):
+        with self.assertRaises(PlayerNotFoundError):
+            Player(1)
+
+    def test_series_events_from_match_fixtures(self):
+        s = Series(1478874, expand_events=False)
+        self.assertEqual(s.name, "India Women tour of Australia")
+        self.assertEqual([ref.match_id for ref in s.event_refs], [1478914])
+        self.assertEqual(s.years, ["2025"])
+        self.assertEqual(Series(1478874).events[0]["id"], "1478914")
+
+    def test_unknown_series_404(self):
+        with self.assertRaises(NoSeriesError):
+            Series(1)
+
+    def test_stats_page(self):
+        tables = stats.get_tables(253802, 1, "batting", cache=Cache())
+        self.assertGreater(len(tables["averages"]), 0)
+
+    def test_match_page_serves_next_data(self):
+        url = "https://www.espncricinfo.com/series/x-1478874/x-1478914/full-scorecard"
+        r = transport.get(url)
+        self.assertEqual(r.status_code, 200)
+        data = _normalise(_extract_next_data(r.text), 1478914, 1478874)
+        self.assertEqual(len(data["team"]), 2)
+        self.assertEqual(transport.get(url.replace("1478914", "1")).status_code, 404)
+
+    def test_results_page_lists_fixture_matches(self):
+        r = transport.get("https://www.espncricinfo.com/live-cricket-match-results?date=2026-02-06")
+        matches = _extract_next_data(r.text)["props"]["appPageProps"]["data"]["data"]["content"]["matches"]
+        self.assertEqual([m["objectId"] for m in matches], [1478914])
+
+
+class TestStandinFaults(StandinTestCase):
+
+    server_options = {"throttle_rate": 0.5, "not_found_rate": 0.5}
+
+    def test_faults_replace_responses(self):
+        statuses = {
+            transport.get("http://core.espnuk.org/v2/sports/cricket/athletes/253802").status_code
+            for _ in range(20)
+        }
+        self.assertEqual(statuses, {404, 429})
+
+
+class TestLoadTest(StandinTestCase):
+
+    def test_run_load_reports_latency_percentiles(self):
+        result = loadtest.run_load(lambda: Player(253802), concurrency=4, requests=12)
+        self.assertEqual(result["requests"], 12)
+        self.assertEqual(result["errors"], {})
+        self.assertGreater(result["throughput"], 0)
+        self.assertLessEqual(result["p50"], result["p95"])
+        self.assertLessEqual(result["p95"], result["p99"])
+
+    def test_run_load_counts_errors(self):
+        result = loadtest.run_load(lambda: Player(1), concurrency=2, requests=4)
+        self.assertEqual(result["errors"], {"PlayerNotFoundError": 4})
+
+    def test_run_counts_server_requests_without_coalescing(self):
+        results = loadtest.run(["player"], [4], 8, seed=0)
+        self.assertEqual(results[0]["errors"], {})
+        # Two requests (athlete and hs-consumer JSON) per call, none shared.
+        self.assertEqual(results[0]["server_requests"], 16)
+        self.assertIn("server", loadtest._format(results))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 50), 50)
+        self.assertEqual(loadtest.percentile(values, 99), 99)
+        self.assertEqual(loadtest.percentile([3], 95), 3)
+        self.assertIsNone(loadtest.percentile([], 50))
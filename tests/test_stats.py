@@ -0,0 +1,237 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import stats
+from espncricinfo.cache import Cache
+from espncricinfo.exceptions import PlayerNotFoundError
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+def _stats_html():
+    with open(FIXTURE_DIR / "player_253802_stats.html") as f:
+        return f.read()
+
+
+def _mock_response(text="", status_code=200):
+    mock = MagicMock()
+    mock.status_code = status_code
+    mock.text = text
+    return mock
+
+
+class TestStatsUrl(unittest.TestCase):
+
+    def test_url_without_view(self):
+        self.assertEqual(
+            stats.stats_url(253802, 1, "batting"),
+            "https://stats.espncricinfo.com/ci/engine/player/253802.html"
+            "?class=1;template=results;type=batting",
+        )
+
+    def test_url_with_view(self):
+        self.assertTrue(stats.stats_url(253802, view="innings").endswith(";view=innings"))
+
+
+class TestParseTables(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = stats.parse_tables(_stats_html())
+
+    def test_named_tables(self):
+        self.assertEqual(set(self.tables), {"averages", "results"})
+
+    def test_averages_columns(self):
+        columns = self.tables["averages"].columns
+        self.assertEqual(columns[0], "column_0")
+        self.assertEqual(columns[1:4], ["Span", "Mat", "Inns"])
+
+    def test_averages_values_are_typed(self):
+        row = self.tables["averages"].rows[0]
+        self.assertEqual(row["column_0"], "unfiltered")
+        self.assertEqual(row["Runs"], 9230)
+        self.assertEqual(row["Ave"], 46.85)
+        self.assertEqual(row["HS"], "254*")
+        self.assertEqual(row["Span"], "2011-2025")
+
+    def test_results_rows(self):
+        results = self.tables["results"]
+        self.assertEqual(len(results), 3)
+        self.assertEqual([r["column_0"] for r in results], ["v Australia", "v Bangladesh", "v Zimbabwe"])
+
+    def test_dash_is_none(self):
+        self.assertIsNone(self.tables["results"].rows[2]["Ave"])
+
+    def test_blank_header_columns_are_numbered(self):
+        self.assertEqual(self.tables["results"].columns[-1], "column_13")
+
+    def test_missing_table_is_empty(self):
+        tables = stats.parse_tables(_stats_html(), {"extra": 9})
+        self.assertEqual(len(tables["extra"]), 0)
+
+    def test_dict_round_trip(self):
+        table = self.tables["averages"]
+        self.assertEqual(stats.StatsTable.from_dict(table.to_dict()), table)
+
+    def test_to_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "averages.csv")
+            self.tables["averages"].to_csv(path)
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertTrue(lines[0].startswith("column_0,Span,Mat"))
+        self.assertTrue(lines[1].startswith("unfiltered,2011-2025,123"))
+
+
+class TestGetTables(unittest.TestCase):
+
+    def test_page_fetched_once_for_both_tables(self):
+        cache = Cache()
+        with patch("espncricinfo.transport.get", return_value=_mock_response(_stats_html())) as get:
+            averages = stats.get_table(253802, "averages", 1, "batting", cache=cache)
+            results = stats.get_table(253802, "results", 1, "batting", cache=cache)
+        get.assert_called_once()
+        self.assertEqual(averages.rows[0]["Runs"], 9230)
+        self.assertEqual(len(results), 3)
+
+    def test_returned_rows_do_not_change_the_cache(self):
+        cache = Cache()
+        with patch("espncricinfo.transport.get", return_value=_mock_response(_stats_html())):
+            for _ in range(2):
+                table = stats.get_table(253802, "averages", 1, "batting", cache=cache)
+                self.assertEqual(table.rows[0]["Runs"], 9230)
+                table.rows[0]["Runs"] = 0
+
+    def test_404_raises_player_not_found(self):
+        with patch("espncricinfo.transport.get", return_value=_mock_response(status_code=404)):
+            with self.assertRaises(PlayerNotFoundError):
+                stats.get_tables(999999, cache=Cache())
+
+    def test_unknown_table_raises(self):
+        with self.assertRaises(ValueError):
+            stats.get_table(253802, "bowling")
+
+
+def _paged_side_effect(calls, pages=3):
+    html = _stats_html()
+
+    def side_effect(url, headers=None, **kwargs):
+        calls.append(url)
+        page = int(url.rsplit(";page=", 1)[1]) if ";page=" in url else 1
+        body = html.replace(">v ", f">p{page} v ").replace(
+            "<body>", f"<body><p>Page <b>{page}</b> of <b>{pages}</b></p>"
+        )
+        return _mock_response(body)
+    return side_effect
+
+
+class TestIterRows(unittest.TestCase):
+
+    def test_page_count(self):
+        self.assertEqual(stats.page_count("<td>Page <b>2</b> of <b>17</b></td>"), 17)
+        self.assertEqual(stats.page_count("Page 1 of 4"), 4)
+        self.assertEqual(stats.page_count(_stats_html()), 1)
+
+    def test_page_url(self):
+        self.assertTrue(stats.stats_url(253802, view="innings", page=3).endswith(";view=innings;page=3"))
+
+    def test_single_page(self):
+        with patch("espncricinfo.transport.get", return_value=_mock_response(_stats_html())) as get:
+            rows = list(stats.iter_rows(253802, 1, "batting", "innings"))
+        get.assert_called_once()
+        self.assertEqual(len(rows), 3)
+
+    def test_rows_from_every_page_in_order(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect(calls)):
+            rows = list(stats.iter_rows(253802, 1, "batting", "innings", concurrency=2))
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(
+            [r["column_0"] for r in rows],
+            [f"p{page} v {team}" for page in (1, 2, 3) for team in ("Australia", "Bangladesh", "Zimbabwe")],
+        )
+
+    def test_pages_fetched_on_demand(self):
+        calls = []
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect(calls, pages=4)):
+            it = stats.iter_rows(253802, 1, "batting", "innings", concurrency=1)
+            next(it)
+            # the first page plus one page fetched ahead
+            self.assertLessEqual(len(calls), 2)
+            rest = list(it)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(len(rest), 11)
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _side_effect(self, url, headers=None, **kwargs):
+        if "/999999.html" in url:
+            return _mock_response(status_code=404)
+        return _mock_response(_stats_html())
+
+    def test_export_csv_with_player_id_column(self):
+        import csv
+
+        path = os.path.join(self.tmp.name, "averages.csv")
+        with patch("espncricinfo.transport.get", side_effect=self._side_effect):
+            summary = stats.export([253802, 28081, 999999], path, match_format=1,
+                                   data_type="batting", workers=2)
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(summary["players"], 2)
+        self.assertEqual(summary["rows"], 2)
+        self.assertEqual(summary["missing"], [999999])
+        self.assertEqual(sorted(r["player_id"] for r in rows), ["253802", "28081"])
+        self.assertEqual(rows[0]["Runs"], "9230")
+
+    def test_export_jsonl_with_view(self):
+        import json
+
+        path = os.path.join(self.tmp.name, "innings.jsonl")
+        with patch("espncricinfo.transport.get", side_effect=_paged_side_effect([], pages=2)):
+            summary = stats.export([253802], path, table="results", view="innings")
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(summary["rows"], 6)
+        self.assertEqual(rows[0]["player_id"], 253802)
+        self.assertEqual(rows[0]["Runs"], 2232)
+
+
+class TestProcessPoolParsing(unittest.TestCase):
+
+    def test_parse_page_result_is_picklable(self):
+        import pickle
+
+        tables, pages = stats._parse_page(_stats_html(), stats.TABLES)
+        self.assertEqual(pickle.loads(pickle.dumps(tables)), tables)
+        self.assertEqual(pages, 1)
+
+    def test_get_tables_with_process_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with patch("espncricinfo.transport.get", return_value=_mock_response(_stats_html())):
+                tables = stats.get_tables(253802, 1, "batting", cache=Cache(), executor=executor)
+        self.assertEqual(tables["averages"].rows[0]["Runs"], 9230)
+
+    def test_export_with_processes(self):
+        import json
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "innings.jsonl")
+            with patch("espncricinfo.transport.get", side_effect=_paged_side_effect([], pages=2)):
+                summary = stats.export([253802, 28081], path, table="results", view="innings",
+                                       workers=2, processes=2)
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(summary["rows"], 12)
+        self.assertEqual(len(rows), 12)
@@ -46,3 +46,26 @@ class TestSummary(unittest.TestCase):
             series_id, match_id = s.matches[0]
             self.assertEqual(series_id, 1478874)
             self.assertEqual(match_id, 1478914)
+
+
+class TestSummaryFilter(unittest.TestCase):
+
+    def setUp(self):
+        from espncricinfo.match_ref import MatchSummary
+
+        self.odi = MatchSummary(series_id=1, match_id=10, status="result", match_class="ODI")
+        self.live = MatchSummary(series_id=1, match_id=11, status="live", match_class="ODI")
+        self.test = MatchSummary(series_id=2, match_id=20, status="result", match_class="Test")
+        with patch("espncricinfo.summary.Match.get_recent_matches",
+                   return_value=[self.odi, self.live, self.test, FAKE_MATCHES[0]]):
+            self.summary = Summary()
+
+    def test_filter_by_status_and_class(self):
+        self.assertEqual(self.summary.filter(status="result", match_class="odi"), [self.odi])
+
+    def test_filter_accepts_collections(self):
+        result = self.summary.filter(match_class=["ODI", "Test"])
+        self.assertEqual(result, [self.odi, self.live, self.test])
+
+    def test_filter_without_criteria_returns_everything(self):
+        self.assertEqual(len(self.summary.filter()), 4)
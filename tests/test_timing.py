@@ -0,0 +1,130 @@
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import timing
+from espncricinfo.exceptions import MatchNotFoundError, NoScorecardError
+from espncricinfo.match import Match, _async_playwright_fetch, _extract_next_data, _playwright_fetch
+from espncricinfo.timing import FetchStats
+from tests.conftest import fake_playwright
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+class TestFetchStats(unittest.TestCase):
+
+    def test_span_records_duration_and_bytes(self):
+        stats = FetchStats()
+        with stats.span("goto", "http://x") as span:
+            span.bytes = 10
+        self.assertEqual(len(stats.spans), 1)
+        self.assertEqual(stats.spans[0].name, "goto")
+        self.assertGreaterEqual(stats.spans[0].duration, 0)
+        self.assertEqual(stats.bytes, 10)
+        self.assertEqual(stats.phase("goto"), stats.total)
+
+    def test_span_records_error(self):
+        stats = FetchStats()
+        with self.assertRaises(ValueError):
+            with stats.span("extract"):
+                raise ValueError("boom")
+        self.assertEqual(stats.spans[0].error, "ValueError")
+
+    def test_hooks_receive_spans(self):
+        seen = []
+        timing.add_hook(seen.append)
+        try:
+            with FetchStats().span("normalise"):
+                pass
+        finally:
+            timing.remove_hook(seen.append)
+        with FetchStats().span("normalise"):
+            pass
+        self.assertEqual([s.name for s in seen], ["normalise"])
+
+    def test_failing_hook_is_logged(self):
+        def broken(span):
+            raise RuntimeError("hook bug")
+
+        seen = []
+        timing.add_hook(broken)
+        timing.add_hook(seen.append)
+        try:
+            with self.assertLogs("espncricinfo.timing", "ERROR"):
+                with FetchStats().span("normalise"):
+                    pass
+        finally:
+            timing.remove_hook(broken)
+            timing.remove_hook(seen.append)
+        self.assertEqual([s.name for s in seen], ["normalise"])
+
+    def test_as_dict(self):
+        stats = FetchStats()
+        with stats.span("content"):
+            pass
+        d = stats.as_dict()
+        self.assertEqual(d["spans"][0]["name"], "content")
+        json.dumps(d)
+
+
+class TestFetchPhases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE_DIR / "match_1478914.html") as f:
+            cls.html = f.read()
+
+    def test_extract_records_extract_and_json_spans(self):
+        stats = FetchStats()
+        _extract_next_data(self.html, stats)
+        self.assertEqual([s.name for s in stats.spans], ["extract", "json_decode"])
+        self.assertGreater(stats.spans[0].bytes, 0)
+
+    def test_extract_without_next_data_records_error(self):
+        stats = FetchStats()
+        with self.assertRaises(NoScorecardError):
+            _extract_next_data("<html></html>", stats)
+        self.assertEqual(stats.spans[0].error, "NoScorecardError")
+
+    def test_playwright_fetch_records_every_phase(self):
+        stats = FetchStats()
+        with patch("playwright.async_api.async_playwright", fake_playwright(self.html)[0]):
+            data = _playwright_fetch("https://www.espncricinfo.com/x", stats=stats)
+        self.assertIn("props", data)
+        self.assertEqual(
+            [s.name for s in stats.spans],
+            ["browser_launch", "goto", "content", "extract", "json_decode"],
+        )
+        self.assertEqual(stats.spans[1].status, 200)
+        self.assertEqual(stats.spans[2].bytes, len(self.html.encode("utf-8")))
+
+    def test_playwright_fetch_404(self):
+        stats = FetchStats()
+        with patch("playwright.async_api.async_playwright", fake_playwright("", status=404)[0]):
+            with self.assertRaises(MatchNotFoundError):
+                _playwright_fetch("https://www.espncricinfo.com/x", stats=stats)
+        self.assertEqual([s.name for s in stats.spans], ["browser_launch", "goto"])
+
+
+class TestObjectFetchStats(unittest.TestCase):
+
+    def test_match_fetch_stats(self):
+        next_data = json.load(open(FIXTURE_DIR / "match_1478914_next_data.json"))
+        with patch("espncricinfo.match._playwright_fetch", return_value=next_data) as fetch:
+            m = Match(1478914, 1478874)
+        self.assertIs(fetch.call_args.kwargs["stats"], m.fetch_stats)
+        self.assertEqual(m.fetch_stats.spans[-1].name, "normalise")
+
+    def test_transport_records_http_span(self):
+        from espncricinfo import transport
+
+        response = MagicMock(status_code=200, content=b"{}")
+        session = MagicMock()
+        session.get.return_value = response
+        stats = FetchStats()
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            transport.get("http://core.espnuk.org/", stats=stats)
+        self.assertEqual(stats.spans[0].name, "http_get")
+        self.assertEqual(stats.spans[0].bytes, 2)
+        self.assertEqual(stats.spans[0].status, 200)
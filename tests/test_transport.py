@@ -0,0 +1,203 @@
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from espncricinfo import transport
+from espncricinfo.match import Match
+from espncricinfo.timing import FetchStats
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+
+class TestSharedSession(unittest.TestCase):
+
+    def tearDown(self):
+        transport.reset()
+
+    def test_session_is_reused(self):
+        self.assertIs(transport.get_session(), transport.get_session())
+
+    def test_session_sends_default_user_agent(self):
+        self.assertEqual(transport.get_session().headers["user-agent"], "Mozilla/5.0")
+
+    def test_configure_replaces_session(self):
+        first = transport.get_session()
+        transport.configure(pool_maxsize=32)
+        self.assertIsNot(first, transport.get_session())
+
+    def test_configure_sets_pool_and_retries(self):
+        transport.configure(pool_maxsize=32, retries=5)
+        adapter = transport.get_session().get_adapter("https://core.espnuk.org/")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 5)
+
+    def test_configure_rejects_unknown_option(self):
+        with self.assertRaises(TypeError):
+            transport.configure(pool_size=4)
+
+    def test_get_applies_default_timeout(self):
+        transport.configure(timeout=7)
+        session = MagicMock()
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            transport.get("http://core.espnuk.org/", headers={"a": "b"})
+        session.get.assert_called_once_with(
+            "http://core.espnuk.org/", headers={"a": "b"}, timeout=7
+        )
+
+
+class TestHostRewrite(unittest.TestCase):
+
+    def tearDown(self):
+        transport.reset()
+
+    def test_resolve_unchanged_without_hosts(self):
+        url = "https://www.espncricinfo.com/series/x-1/x-2/full-scorecard"
+        self.assertEqual(transport.resolve(url), url)
+
+    def test_resolve_replaces_scheme_and_host(self):
+        transport.configure(hosts={"core.espnuk.org": "http://127.0.0.1:8765/"})
+        self.assertEqual(
+            transport.resolve("http://core.espnuk.org/v2/sports/cricket/athletes/1?x=1"),
+            "http://127.0.0.1:8765/v2/sports/cricket/athletes/1?x=1",
+        )
+        self.assertEqual(
+            transport.resolve("https://stats.espncricinfo.com/ci/engine/player/1.html"),
+            "https://stats.espncricinfo.com/ci/engine/player/1.html",
+        )
+
+    def test_get_requests_resolved_url(self):
+        transport.configure(hosts={"core.espnuk.org": "http://localhost:1"})
+        session = MagicMock()
+        with patch("espncricinfo.transport.get_session", return_value=session):
+            transport.get("http://core.espnuk.org/v2/")
+        self.assertEqual(session.get.call_args.args[0], "http://localhost:1/v2/")
+
+    def test_reset_clears_hosts(self):
+        transport.configure(hosts={"core.espnuk.org": "http://localhost:1"})
+        transport.reset()
+        self.assertEqual(transport.resolve("http://core.espnuk.org/"), "http://core.espnuk.org/")
+
+
+def _in_threads(*fns):
+    """Start each fn on its own thread, a moment apart, and return the threads' results in order."""
+    results = [None] * len(fns)
+
+    def run(i, fn):
+        try:
+            results[i] = fn()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i, fn)) for i, fn in enumerate(fns)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    return threads, results
+
+
+class TestCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.session = MagicMock()
+
+        def slow_get(url, **kwargs):
+            self.calls += 1
+            self.release.wait(5)
+            return MagicMock(status_code=200, content=b"{}", url=url)
+
+        self.session.get.side_effect = slow_get
+        patcher = patch("espncricinfo.transport.get_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.release.set()
+        transport.reset()
+
+    def _finish(self, threads):
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+    def test_concurrent_gets_share_one_request(self):
+        url = "http://core.espnuk.org/v2/sports/cricket/athletes/1"
+        threads, results = _in_threads(lambda: transport.get(url), lambda: transport.get(url))
+        self._finish(threads)
+        self.assertEqual(self.calls, 1)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(transport._flights.in_flight(), 0)
+
+    def test_follower_records_coalesced_span(self):
+        url = "http://core.espnuk.org/v2/"
+        leader, follower = FetchStats(), FetchStats()
+        threads, _ = _in_threads(lambda: transport.get(url, stats=leader),
+                                 lambda: transport.get(url, stats=follower))
+        self._finish(threads)
+        self.assertEqual([s.name for s in leader.spans], ["http_get"])
+        self.assertEqual([s.name for s in follower.spans], ["coalesced"])
+
+    def test_error_reaches_every_caller(self):
+        def failing_get(url, **kwargs):
+            self.calls += 1
+            self.release.wait(5)
+            raise ConnectionError("reset")
+
+        self.session.get.side_effect = failing_get
+        url = "http://core.espnuk.org/v2/"
+        threads, results = _in_threads(lambda: transport.get(url), lambda: transport.get(url))
+        self._finish(threads)
+        self.assertEqual(self.calls, 1)
+        self.assertIsInstance(results[0], ConnectionError)
+        self.assertIs(results[0], results[1])
+
+    def test_different_headers_are_not_coalesced(self):
+        url = "http://core.espnuk.org/v2/"
+        threads, _ = _in_threads(lambda: transport.get(url, headers={"a": "1"}),
+                                 lambda: transport.get(url, headers={"a": "2"}))
+        self._finish(threads)
+        self.assertEqual(self.calls, 2)
+
+    def test_coalescing_can_be_disabled(self):
+        transport.configure(coalesce=False)
+        url = "http://core.espnuk.org/v2/"
+        threads, _ = _in_threads(lambda: transport.get(url), lambda: transport.get(url))
+        self._finish(threads)
+        self.assertEqual(self.calls, 2)
+
+    def test_sequential_gets_are_not_coalesced(self):
+        self.release.set()
+        transport.get("http://core.espnuk.org/v2/")
+        transport.get("http://core.espnuk.org/v2/")
+        self.assertEqual(self.calls, 2)
+
+
+class TestPageCoalescing(unittest.TestCase):
+
+    def tearDown(self):
+        transport.reset()
+
+    def test_concurrent_matches_load_page_once(self):
+        html = (FIXTURE_DIR / "match_1478914.html").read_text()
+        release = threading.Event()
+        loads = []
+
+        def load(url, stats):
+            loads.append(url)
+            release.wait(5)
+            return html
+
+        with patch("espncricinfo.match._browser_load_page", side_effect=load):
+            threads, results = _in_threads(lambda: Match(1478914, 1478874),
+                                           lambda: Match(1478914, 1478874))
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(len(loads), 1)
+        self.assertIsInstance(results[0], Match)
+        self.assertIsInstance(results[1], Match)
+        self.assertEqual(results[0].description, results[1].description)
+        self.assertIsNot(results[0].json, results[1].json)